@@ -0,0 +1,376 @@
+import asyncio
+import bisect
+import heapq
+import itertools
+import math
+import random
+import selectors
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+ELECTION = "ELECTION"
+OK = "OK"
+COORDINATOR = "COORDINATOR"
+GRANT = "GRANT"          # modified Bully only: initiator hands leadership to the best responder
+MESSAGE_KINDS = (ELECTION, OK, COORDINATOR, GRANT)
+ALGORITHMS = ("classic", "modified")
+
+
+class ElectionResult(NamedTuple):
+    algorithm:      str
+    initiator:      int
+    leader:         Optional[int]    # None if the alive nodes did not agree
+    messages:       Dict[str, int]   # sent messages per kind
+    total_messages: int
+    latency:        float            # seconds until every alive node knew the leader
+    elections:      int              # election rounds started (incl. restarts)
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """
+    Event loop on a simulated clock: instead of sleeping until the next timer it
+    jumps straight to it. Delays and timeouts keep their meaning, but an election
+    over thousands of nodes runs as fast as the CPU allows and its latency does
+    not depend on machine load.
+    """
+
+    def __init__(self):
+        super().__init__(selectors.DefaultSelector())
+        self._now = 0.0
+        real_select = self._selector.select
+
+        def select(timeout=None):
+            if timeout is None:
+                raise RuntimeError("simulation deadlock: nothing scheduled")
+            self._now += timeout
+            return real_select(0)
+
+        self._selector.select = select
+
+    def time(self) -> float:
+        return self._now
+
+
+class BullyNode:
+    """
+    One process in the election. Message handling is synchronous (receive);
+    each election round runs as the node's own coroutine.
+    """
+
+    def __init__(self, node_id: int, network: "BullyNetwork"):
+        self.id = node_id
+        self.network = network
+        self.alive = True
+        self.coordinator: Optional[int] = None
+        self.learned_at: Optional[float] = None
+        self.election: Optional[asyncio.Task] = None
+        self._ok = asyncio.Event()
+        self._announced = asyncio.Event()
+        self._responders: List[int] = []
+
+    def receive(self, kind: str, sender: int) -> None:
+        if not self.alive:
+            return  # failed nodes drop everything
+        net = self.network
+        if kind == ELECTION:
+            net.send(OK, self.id, sender)
+            if net.algorithm == "classic":
+                self.start_election()   # take over the election
+        elif kind == OK:
+            self._responders.append(sender)
+            self._ok.set()
+        elif kind == GRANT:
+            self.become_coordinator()
+        elif kind == COORDINATOR:
+            if net.algorithm == "classic" and sender < self.id:
+                self.start_election()   # a lower node claimed leadership: bully it
+                return
+            self.coordinator = sender
+            self.learned_at = net.loop.time()
+            self._announced.set()
+
+    def start_election(self) -> None:
+        if self.alive and (self.election is None or self.election.done()):
+            run = self._classic if self.network.algorithm == "classic" else self._modified
+            self.election = self.network.spawn(run())
+
+    def become_coordinator(self) -> None:
+        net = self.network
+        self.coordinator = self.id
+        self.learned_at = net.loop.time()
+        for other in net.ids:
+            if other < self.id:
+                net.send(COORDINATOR, self.id, other)
+
+    def _new_round(self) -> List[int]:
+        self.network.elections += 1
+        self._ok.clear()
+        self._announced.clear()
+        self._responders = []
+        higher = self.network.higher(self.id)
+        for other in higher:
+            self.network.send(ELECTION, self.id, other)
+        return higher
+
+    async def _wait(self, event: asyncio.Event, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _classic(self) -> None:
+        """Classic Bully: ELECTION to all higher nodes; any OK hands the election over."""
+        net = self.network
+        while self.alive:
+            higher = self._new_round()
+            if not higher or not await self._wait(self._ok, net.ok_timeout):
+                self.become_coordinator()
+                return
+            if await self._wait(self._announced, net.coordinator_timeout):
+                return
+            # a higher node answered but never announced: start over
+
+    async def _modified(self) -> None:
+        """
+        Modified Bully: higher nodes only answer OK; the initiator waits for all
+        answers, sends GRANT to the highest responder, and that node announces.
+        """
+        net = self.network
+        while self.alive:
+            higher = self._new_round()
+            if higher:
+                # collect answers until everybody replied or the timeout expires
+                deadline = net.loop.time() + net.ok_timeout
+                while len(self._responders) < len(higher) and net.loop.time() < deadline:
+                    self._ok.clear()
+                    await self._wait(self._ok, deadline - net.loop.time())
+            if not self._responders:
+                self.become_coordinator()
+                return
+            for candidate in sorted(self._responders, reverse=True):
+                net.send(GRANT, self.id, candidate)
+                if await self._wait(self._announced, net.coordinator_timeout):
+                    return
+            # every responder failed before announcing: start over
+
+
+class BullyNetwork:
+    """
+    A set of BullyNodes exchanging messages with simulated delay.
+      - delay, jitter: one-way latency is delay + uniform(0, jitter) seconds,
+        rounded up to a multiple of tick so simultaneous messages are delivered together
+      - ok_timeout: how long a node waits for OK (default: 2 x max round trip)
+      - coordinator_timeout: how long it then waits for COORDINATOR
+    """
+
+    def __init__(
+        self,
+        node_ids: List[int],
+        loop: asyncio.AbstractEventLoop,
+        algorithm: str = "classic",
+        delay: float = 0.001,
+        jitter: float = 0.0005,
+        ok_timeout: Optional[float] = None,
+        coordinator_timeout: Optional[float] = None,
+        seed: Optional[int] = None,
+        tick: float = 1e-5
+    ):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"algorithm must be one of {ALGORITHMS}, got {algorithm!r}")
+        self.loop = loop
+        self.algorithm = algorithm
+        self.delay = delay
+        self.jitter = jitter
+        self.tick = tick
+        self.ok_timeout = ok_timeout if ok_timeout is not None else 4 * (delay + jitter)
+        self.coordinator_timeout = (
+            coordinator_timeout if coordinator_timeout is not None else 3 * self.ok_timeout + 4 * (delay + jitter)
+        )
+        self.ids = sorted(node_ids)
+        self.nodes = {i: BullyNode(i, self) for i in self.ids}
+        self.messages = {kind: 0 for kind in MESSAGE_KINDS}
+        self.elections = 0
+        self._rnd = random.Random(seed)
+        # in-flight messages: one heap of (deliver_at, seq, kind, sender, receiver)
+        # drained by a single loop timer, far cheaper than a TimerHandle per message
+        self._in_flight: List = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._armed_at: Optional[float] = None
+        self._tasks: set = set()
+        self._quiet: Optional[asyncio.Event] = None
+
+    def higher(self, node_id: int) -> List[int]:
+        return self.ids[bisect.bisect_right(self.ids, node_id):]
+
+    def send(self, kind: str, sender: int, receiver: int) -> None:
+        if not self.nodes[sender].alive:
+            return  # crashed mid-round: its pending election coroutine must not speak
+        self.messages[kind] += 1
+        deliver_at = self.loop.time() + self.delay + self._rnd.random() * self.jitter
+        deliver_at = math.ceil(deliver_at / self.tick) * self.tick
+        heapq.heappush(self._in_flight, (deliver_at, next(self._seq), kind, sender, receiver))
+        if self._armed_at is None or deliver_at < self._armed_at:
+            self._arm(deliver_at)
+
+    def _arm(self, when: float) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._armed_at = when
+        self._timer = self.loop.call_at(when, self._deliver_due)
+
+    def _deliver_due(self) -> None:
+        due = max(self.loop.time(), self._armed_at)
+        self._timer = self._armed_at = None
+        queue = self._in_flight
+        while queue and queue[0][0] <= due:
+            _, _, kind, sender, receiver = heapq.heappop(queue)
+            self.nodes[receiver].receive(kind, sender)
+        if queue and self._armed_at is None:
+            self._arm(queue[0][0])
+        self._check_quiet()
+
+    def spawn(self, coro) -> asyncio.Task:
+        task = self.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        self._check_quiet()
+
+    def _check_quiet(self) -> None:
+        if self._quiet is not None and not self._in_flight and not self._tasks:
+            self._quiet.set()
+
+    def fail(self, node_id: int) -> None:
+        self.nodes[node_id].alive = False
+
+    def recover(self, node_id: int) -> None:
+        node = self.nodes[node_id]
+        node.alive = True
+        node.coordinator = None
+
+    async def elect(self, initiator: int) -> ElectionResult:
+        """
+        Run one election started by `initiator` until no messages are in flight
+        and no election round is running; returns what happened.
+        """
+        for node in self.nodes.values():
+            node.coordinator = None
+            node.learned_at = None
+        self.messages = {kind: 0 for kind in MESSAGE_KINDS}
+        self.elections = 0
+        self._quiet = asyncio.Event()
+        start = self.loop.time()
+
+        self.nodes[initiator].start_election()
+        await self._quiet.wait()
+
+        alive = [n for n in self.nodes.values() if n.alive]
+        leaders = {n.coordinator for n in alive}
+        leader = leaders.pop() if len(leaders) == 1 else None
+        latency = max((n.learned_at for n in alive), default=start) - start if leader is not None else float("inf")
+        return ElectionResult(
+            algorithm=self.algorithm,
+            initiator=initiator,
+            leader=leader,
+            messages=dict(self.messages),
+            total_messages=sum(self.messages.values()),
+            latency=latency,
+            elections=self.elections,
+        )
+
+
+def run_election(
+    node_ids: List[int],
+    failed: Optional[List[int]] = None,
+    initiator: Optional[int] = None,
+    algorithm: str = "classic",
+    virtual_time: bool = True,
+    **network_kwargs
+) -> ElectionResult:
+    """
+    Build a network over node_ids, fail the `failed` nodes and run one election
+    started by `initiator` (default: the lowest alive node, the classic worst case).
+    virtual_time=False runs on a normal asyncio loop with real sleeps.
+    """
+    failed = set(failed or ())
+    alive = [i for i in sorted(node_ids) if i not in failed]
+    if not alive:
+        raise ValueError("no alive node can start an election")
+    if initiator is None:
+        initiator = alive[0]
+
+    loop = VirtualTimeLoop() if virtual_time else asyncio.new_event_loop()
+    try:
+        network = BullyNetwork(node_ids, loop, algorithm=algorithm, **network_kwargs)
+        for node_id in failed:
+            network.fail(node_id)
+        return loop.run_until_complete(network.elect(initiator))
+    finally:
+        loop.close()
+
+
+def _cluster_ranks(servers: List[Dict], priority: Optional[Callable[[Dict], float]]):
+    order = list(range(len(servers)))
+    if priority is not None:
+        order.sort(key=lambda i: (priority(servers[i]), i))
+    rank = {srv_idx: r + 1 for r, srv_idx in enumerate(order)}    # Bully ids 1..n
+    by_rank = {r: servers[i]["server_id"] for i, r in rank.items()}
+    failed = [rank[i] for i, srv in enumerate(servers) if srv.get("status", "active") == "failed"]
+    return by_rank, failed
+
+
+def elect_cluster_leader(
+    servers: List[Dict],
+    priority: Optional[Callable[[Dict], float]] = None,
+    algorithm: str = "classic",
+    **kwargs
+) -> Dict:
+    """
+    Bully election over one cluster's servers. Servers whose status is 'failed'
+    take no part; the highest-priority alive server wins (default priority: list
+    order, so the last active server). Returns the leader's server_id plus the
+    election's message counts and latency.
+    """
+    by_rank, failed = _cluster_ranks(servers, priority)
+    if len(failed) == len(servers):
+        return {"leader": None, "result": None}
+
+    result = run_election(list(by_rank), failed=failed, algorithm=algorithm, **kwargs)
+    return {"leader": by_rank.get(result.leader), "result": result}
+
+
+async def elect_cluster_leader_async(
+    servers: List[Dict],
+    priority: Optional[Callable[[Dict], float]] = None,
+    algorithm: str = "classic",
+    **network_kwargs
+) -> Dict:
+    """
+    elect_cluster_leader on the running event loop, for callers that are
+    already inside one (e.g. the failure detector's simulation).
+    """
+    by_rank, failed = _cluster_ranks(servers, priority)
+    if len(failed) == len(servers):
+        return {"leader": None, "result": None}
+
+    network = BullyNetwork(list(by_rank), asyncio.get_running_loop(), algorithm=algorithm, **network_kwargs)
+    for node_id in failed:
+        network.fail(node_id)
+    initiator = min(set(by_rank) - set(failed))
+    result = await network.elect(initiator)
+    return {"leader": by_rank.get(result.leader), "result": result}
+
+
+if __name__ == "__main__":
+    # Message cost and election latency as clusters grow (coordinator = top node failed)
+    for n in (10, 100, 1000, 5000):
+        for algorithm in ALGORITHMS:
+            if algorithm == "classic" and n > 1000:
+                continue  # O(n^2) messages: ~25M at n=5000
+            r = run_election(list(range(1, n + 1)), failed=[n], algorithm=algorithm, seed=0)
+            print(f"n={n:5d} {algorithm:8s} leader={r.leader} messages={r.total_messages:9d} "
+                  f"{r.messages} latency={r.latency * 1000:.2f} ms")
@@ -1,14 +1,17 @@
 import random
+import numpy as np
+import pandas as pd
 import streamlit as st
 from iot_device_simulator import generate_iot_devices
-from ga_module import generate_initial_population
+from global_balancer import GlobalBalancer
+from bully_election import elect_cluster_leader
+from failure_detector import ServerStatusSync, detect_cluster_failures
+from profiling import Profiler, set_profiler
 import copy
-from ga_module import generate_initial_population, evaluate_population, evolve_population
-
-# ------------------------------
-# Step 1: Generate IoT Devices
-# ------------------------------
-devices = generate_iot_devices(n=8)
+from ga_module import (
+    SEEDING_HEURISTICS, build_server_table, decode_chromosome, evaluate_population, evolve_clusters_parallel,
+    generate_initial_population_compact,
+)
 
 # ------------------------------
 # Step 2: Cloud Data Center Setup
@@ -24,32 +27,199 @@ CLOUD_CLUSTERS = {
     ],
 }
 
-# snapshot the original capacities for fitness evaluation
-ORIGINAL_CLUSTERS = copy.deepcopy(CLOUD_CLUSTERS)
+weights = {
+    "cpu": 0.1,
+    "ram": 0.3,
+    "bandwidth": 0.2,
+    "throughput": 0.4
+}
 
 # ------------------------------
-# Simulate Sending IoT Data to Cloud & Task Extraction
+# Cached pipeline stages
 # ------------------------------
-for device in devices:
-    # 1) Pick a random cluster for this device
-    cluster_name = random.choice(list(CLOUD_CLUSTERS.keys()))
-    servers = CLOUD_CLUSTERS[cluster_name]
-
-    # 2) For each task in the device's queue, assign it to the server
-    #    with the most available CPU that can handle it.
-    for task in device["task_queue"]:
-        # sort servers by remaining CPU (desc)
-        servers_sorted = sorted([s for s in servers if s.get('status', 'active') == 'active'], 
-                              key=lambda s: s["cpu"], reverse=True)
-        for server in servers_sorted:
-            if task["complexity"] <= server["cpu"]:
-                server["tasks"].append({
-                    "device_id": device["id"],
-                    "task": task["task"],
-                    "complexity": task["complexity"]
-                })
-                server["cpu"] -= task["complexity"]  # consume CPU
-                break  # move to next task
+# Streamlit re-runs the whole script on every widget change; each stage is
+# cached on its inputs (the seed fixes everything random), so moving a slider
+# only recomputes the stages downstream of it.
+
+@st.cache_data
+def run_steps_1_2(n_devices, seed):
+    """
+    Step 1 devices, Step 2 placement and heartbeat failure detection.
+    Returns (devices, cloud_clusters, original_clusters, server_status, health_report, balance).
+    """
+    random.seed(seed)
+    devices = generate_iot_devices(n=n_devices)
+    cloud_clusters = copy.deepcopy(CLOUD_CLUSTERS)
+    original_clusters = copy.deepcopy(cloud_clusters)  # original capacities for fitness evaluation
+
+    # each device goes to the least utilised cluster, then a migration pass
+    # evens out what is left
+    balancer = GlobalBalancer(cloud_clusters)
+    balancer.route_devices(devices)
+    balancer.migrate()
+    balance = balancer.stats()
+    balance["utilisation"] = balancer.utilisation().tolist()
+
+    # each server crashes with probability 0.5; statuses are what the detector
+    # concluded (synced into cloud_clusters)
+    server_status, health_report = detect_cluster_failures(
+        cloud_clusters, crash_prob=0.5, seed=seed, subscribers=(ServerStatusSync(cloud_clusters),)
+    )
+    health_report = {k: v for k, v in health_report.items() if k != "detector"}
+    return devices, cloud_clusters, original_clusters, server_status, health_report, balance
+
+@st.cache_data
+def run_step_3(_cloud_clusters, _server_status, seed, n_devices, pop_size, seeding, repair):
+    """
+    Initial population in the compact format, as (populations, task_tables);
+    the cluster state is keyed by (seed, n_devices) instead of being hashed.
+    """
+    random.seed(seed)
+    return generate_initial_population_compact(
+        _cloud_clusters, population_size=pop_size, server_status=_server_status, seeding=seeding, repair=repair
+    )
+
+@st.cache_data
+def run_step_4(_population, _task_tables, _original_clusters, weights, seed, n_devices, pop_size, seeding, repair):
+    return evaluate_population(_population, _original_clusters, weights, task_tables=_task_tables)
+
+def ga_run(run_key, initial_population):
+    """
+    The GA state kept in st.session_state across reruns: the latest population,
+    every generation seen so far, and the generations added with "Continue".
+    Starts over when the inputs of the earlier stages change.
+    """
+    run = st.session_state.get("ga_run")
+    if run is None or run["key"] != run_key:
+        run = {
+            "key": run_key,
+            "population": initial_population,
+            "generations": 0,
+            "extra": 0,
+            "history": {cname: [] for cname in initial_population},
+        }
+        st.session_state["ga_run"] = run
+    return run
+
+def evolve_to(run, target, original_clusters, pop_size, seed, task_tables, repair, server_status):
+    """
+    Make sure `run` holds at least `target` generations, evolving only the
+    missing ones from the stored population. Returns the first `target`
+    generations per cluster.
+    """
+    missing = target - run["generations"]
+    if missing > 0:
+        # Clusters are independent, so they evolve in parallel worker processes
+        population, _, history = evolve_clusters_parallel(
+            run["population"], original_clusters, weights,
+            generations=missing, population_size=pop_size, keep_history=True,
+            seed=[seed, run["generations"]],  # own stream per resumed chunk
+            cache_size=1000,  # elitism and duplicate children are not re-scored
+            task_tables=task_tables, repair=repair, server_status=server_status
+        )
+        for cluster_name, generations_seen in history.items():
+            run["history"][cluster_name].extend(generations_seen)
+        run["population"] = population
+        run["generations"] = target
+    return {cluster_name: h[:target] for cluster_name, h in run["history"].items()}
+
+# ------------------------------
+# Table rendering helpers
+# ------------------------------
+# Populations are shown as one summary row per chromosome, a page at a time;
+# gene listings are only built when asked for, so the number of widgets does
+# not grow with population size, generations or task count.
+
+PAGE_SIZE = 20
+
+def paged_dataframe(df, key, page_size=PAGE_SIZE):
+    """
+    Show one page of df with a page selector (only when there is more than one page).
+    """
+    pages = max(1, -(-len(df) // page_size))
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=key)
+    st.dataframe(df.iloc[(page - 1) * page_size:page * page_size])
+
+def genes_frame(chromosome):
+    return pd.DataFrame(chromosome, columns=["device_id", "task", "complexity", "server_id"])
+
+def population_frame(population, tasks, servers, fitnesses=None):
+    """
+    One row per compact chromosome: fitness, servers used, unassigned tasks and
+    the heaviest server load (summed task complexity), from one bincount of
+    (chromosome, server) pairs over the whole population.
+    """
+    n_srv = len(servers.ids)
+    genes = np.asarray(population, dtype=np.intp).reshape(len(population), len(tasks.complexity))
+    assigned = genes >= 0
+    cell = (np.arange(len(population))[:, None] * n_srv + genes)[assigned]
+    size = len(population) * n_srv
+    count = np.bincount(cell, minlength=size).reshape(-1, n_srv)
+    load = np.bincount(cell, weights=np.broadcast_to(tasks.complexity, genes.shape)[assigned],
+                       minlength=size).reshape(-1, n_srv)
+    df = pd.DataFrame({
+        "Chromosome": np.arange(1, len(population) + 1),
+        "Fitness": fitnesses if fitnesses is not None else np.nan,
+        "Tasks": assigned.sum(axis=1),
+        "Servers Used": (count > 0).sum(axis=1),
+        "Unassigned": (~assigned).sum(axis=1),
+        "Max Server Load": load.max(axis=1, initial=0).astype(int),
+    }).set_index("Chromosome")
+    return df if fitnesses is not None else df.drop(columns="Fitness")
+
+def fitness_stats_frame(history):
+    """
+    Best / mean / worst fitness per generation.
+    """
+    return pd.DataFrame(
+        [{"Generation": gen + 1, "Best": max(f), "Mean": sum(f) / len(f), "Worst": min(f)}
+         for gen, (_, f) in enumerate(history)]
+    ).set_index("Generation")
+
+def server_load_frame(chromosome, servers):
+    """
+    Tasks and summed complexity per server (every server listed, failed ones marked).
+    """
+    genes = genes_frame(chromosome)
+    load = genes.groupby("server_id")["complexity"].agg(["count", "sum"])
+    return pd.DataFrame({
+        "Server": [s["server_id"] for s in servers],
+        "Status": [s.get("status", "active") for s in servers],
+        "Tasks": [int(load["count"].get(s["server_id"], 0)) for s in servers],
+        "Load": [int(load["sum"].get(s["server_id"], 0)) for s in servers],
+    }).set_index("Server")
+
+def gene_listing(population, tasks, servers, key, label="Show gene listing"):
+    """
+    On-demand gene table for one compact chromosome of population (only that one is decoded).
+    """
+    if st.checkbox(label, key=f"{key}_show"):
+        idx = st.number_input("Chromosome", min_value=1, max_value=len(population), value=1, key=f"{key}_chrom")
+        paged_dataframe(genes_frame(decode_chromosome(population[idx - 1], tasks, servers)), key=f"{key}_genes")
+
+seed = st.sidebar.number_input("Random seed", min_value=0, value=0, step=1, key="seed_input")
+n_devices = 8
+
+# Optional profiling of this rerun (cached stages that are not recomputed do not show up)
+show_profile = st.sidebar.checkbox("Profile pipeline", key="profile_toggle")
+# each browser session profiles into its own Profiler; the instrumented code
+# reports to it for this script run only (set_profiler is per thread)
+profiler = st.session_state.setdefault("profiler", Profiler())
+set_profiler(profiler)
+profiler.reset()
+if show_profile:
+    profiler.enable()
+else:
+    profiler.disable()
+
+# Capacity-aware GA: bin-packing seeds in the initial population, and repair of
+# every chromosome so no server is loaded beyond its CPU
+seeding = tuple(st.sidebar.multiselect("Seeding heuristics", list(SEEDING_HEURISTICS), key="seeding_select"))
+repair = st.sidebar.checkbox("Capacity repair", key="repair_toggle")
+
+devices, CLOUD_CLUSTERS, ORIGINAL_CLUSTERS, server_status, health_report, balance = run_steps_1_2(n_devices, seed)
 
 # ------------------------------
 # Streamlit Visualization
@@ -74,6 +244,17 @@ for device in devices:
 # Step 2 Output: Cloud Clusters & Task Extraction
 st.header("Step 2: Cloud Data Center Simulation")
 
+imbalance = balance["imbalance"]
+st.write(
+    f"**Placed:** {balance['tasks'] - balance['unplaced']} of {balance['tasks']} tasks "
+    f"(least utilised cluster first, {balance['migrated']} moved by the migration pass) — "
+    f"**max/mean utilisation:** {imbalance['max_over_mean']:.3f}, **CV:** {imbalance['cv']:.3f}"
+)
+st.table({
+    "Cluster": list(CLOUD_CLUSTERS),
+    "CPU Utilisation": [f"{u:.1%}" for u in balance["utilisation"]],
+})
+
 for cluster_name, servers in CLOUD_CLUSTERS.items():
     with st.expander(cluster_name):
         for i, server in enumerate(servers):
@@ -121,6 +302,20 @@ for cluster_name, servers in CLOUD_CLUSTERS.items():
             "Remaining CPU": [s["cpu"] for s in servers]
         })
 
+with st.expander("Failure Detector Events"):
+    latency = health_report["detection_latency"]
+    st.write(
+        f"**Heartbeats:** {health_report['heartbeats']} — **Failures detected:** {health_report['detected']} — "
+        f"**False suspicions:** {health_report['false_suspicions']}"
+    )
+    if latency:
+        st.write(f"**Detection latency:** mean {latency['mean']:.2f} s, p95 {latency['p95']:.2f} s")
+    st.table({
+        "Time (s)": [f"{e.at:.2f}" for e in health_report["events"]],
+        "Server": [e.node_id for e in health_report["events"]],
+        "Transition": [f"{e.old} → {e.new}" for e in health_report["events"]],
+    })
+
 # ------------------------------
 # Step 3: Generate Chromosomes for Initial Population
 # ------------------------------
@@ -132,39 +327,32 @@ pop_size = st.slider(
     key="population_slider"
 )
 
-initial_population = generate_initial_population(CLOUD_CLUSTERS, population_size=pop_size)
+initial_population, task_tables = run_step_3(CLOUD_CLUSTERS, server_status, seed, n_devices, pop_size, seeding, repair)
+server_tables = {c: build_server_table(servers) for c, servers in ORIGINAL_CLUSTERS.items()}
 
 # Step 3 Output: Initial Population of Chromosomes
 st.header("Step 3: Initial Chromosome Population (Per Cluster)")
 
 for cluster_name, population in initial_population.items():
     with st.expander(f"{cluster_name} — Initial Chromosomes"):
-        for idx, chromosome in enumerate(population):
-            st.subheader(f"Chromosome {idx + 1}")
-            for gene in chromosome:
-                st.markdown(
-                    f"- Device {gene['device_id']} → Task **{gene['task']}** "
-                    f"(Complexity: {gene['complexity']}) → Assigned to Server {gene['server_id']}"
-                )
+        tables = task_tables[cluster_name], server_tables[cluster_name]
+        paged_dataframe(population_frame(population, *tables), key=f"step3_{cluster_name}")
+        gene_listing(population, *tables, key=f"step3_{cluster_name}")
 
 # ------------------------------
 # Step 4: Fitness Evaluation
 # ------------------------------
 st.header("Step 4: Fitness Evaluation")
 
-weights = {
-    "cpu": 0.1,
-    "ram": 0.3,
-    "bandwidth": 0.2,
-    "throughput": 0.4
-}
-
-fitness_map = evaluate_population(initial_population, ORIGINAL_CLUSTERS, weights)
+fitness_map = run_step_4(initial_population, task_tables, ORIGINAL_CLUSTERS, weights, seed, n_devices, pop_size,
+                         seeding, repair)
 
 for cluster_name, fitnesses in fitness_map.items():
     with st.expander(f"{cluster_name} — Chromosome Fitness"):
-        for idx, score in enumerate(fitnesses, start=1):
-            st.write(f"Chromosome {idx}: Fitness = {score:.2f}")
+        paged_dataframe(
+            pd.DataFrame({"Chromosome": range(1, len(fitnesses) + 1), "Fitness": fitnesses}).set_index("Chromosome"),
+            key=f"step4_{cluster_name}",
+        )
 
 # ------------------------------
 # Step 5–7: Genetic Algorithm Cycle
@@ -179,29 +367,33 @@ generations = st.slider(
     key="generations_slider"
 )
 
-final_generations = {}
-final_fitnesses = {}
+# The GA resumes from the population stored in session_state: raising the
+# slider or pressing "Continue" only runs the additional generations
+run = ga_run((seed, n_devices, pop_size, seeding, repair), initial_population)
+more = st.number_input("Continue N more generations", min_value=1, max_value=50, value=5, key="continue_input")
+if st.button("Continue", key="continue_button"):
+    run["extra"] += more
+total_generations = generations + run["extra"]
 
-for cluster_name, population in initial_population.items():
-    st.subheader(f"{cluster_name} — Evolution Process")
-    servers = copy.deepcopy(ORIGINAL_CLUSTERS[cluster_name])
-    current_population = population
-    fitness_scores = evaluate_population({cluster_name: current_population}, ORIGINAL_CLUSTERS, weights)[cluster_name]
-
-    for gen in range(generations):
-        current_population = evolve_population(current_population, fitness_scores, servers, population_size=pop_size)
-        fitness_scores = evaluate_population({cluster_name: current_population}, ORIGINAL_CLUSTERS, weights)[cluster_name]
-
-        with st.expander(f"Generation {gen + 1}"):
-            for idx, chrom in enumerate(current_population):
-                st.markdown(f"**Chromosome {idx + 1}** — Fitness: `{fitness_scores[idx]:.2f}`")
-                for gene in chrom:
-                    st.markdown(
-                        f"- Device `{gene['device_id']}` → Task **{gene['task']}** → Server `{gene['server_id']}`"
-                    )
+generation_history = evolve_to(run, total_generations, ORIGINAL_CLUSTERS, pop_size, seed, task_tables, repair,
+                               server_status)
+final_generations = {c: h[-1][0] for c, h in generation_history.items()}
+final_fitnesses = {c: h[-1][1] for c, h in generation_history.items()}
+st.caption(f"Showing {total_generations} generations ({run['generations']} evolved so far in this session)")
 
-    final_generations[cluster_name] = current_population
-    final_fitnesses[cluster_name] = fitness_scores
+for cluster_name in initial_population:
+    history = generation_history[cluster_name]
+    st.subheader(f"{cluster_name} — Evolution Process")
+    st.line_chart(fitness_stats_frame(history))
+    with st.expander("Generation details"):
+        gen = 1
+        if len(history) > 1:
+            gen = st.slider("Generation", min_value=1, max_value=len(history), value=len(history),
+                            key=f"gen_{cluster_name}")
+        current_population, fitness_scores = history[gen - 1]
+        tables = task_tables[cluster_name], server_tables[cluster_name]
+        paged_dataframe(population_frame(current_population, *tables, fitness_scores), key=f"gen_{cluster_name}_page")
+        gene_listing(current_population, *tables, key=f"gen_{cluster_name}")
 
 # ------------------------------
 # Step 8: Fault-Tolerant Leader Election
@@ -211,7 +403,7 @@ st.header("Step 8: Fault-Tolerant Leader Election")
 for cluster_name, chromosomes in final_generations.items():
     fitnesses = final_fitnesses[cluster_name]
     best_idx = fitnesses.index(max(fitnesses))
-    best_chrom = chromosomes[best_idx]
+    best_chrom = decode_chromosome(chromosomes[best_idx], task_tables[cluster_name], server_tables[cluster_name])
     
     current_servers = CLOUD_CLUSTERS[cluster_name]
     
@@ -222,20 +414,59 @@ for cluster_name, chromosomes in final_generations.items():
         if server and server.get('status', 'active') == 'active':
             server_task_count[server_id] = server_task_count.get(server_id, 0) + 1
     
-    if server_task_count:
-        elected_leader = max(server_task_count, key=server_task_count.get)
+    # Bully election among the cluster's servers: the most loaded active server
+    # in the best chromosome has the highest priority
+    def load_priority(s):
+        return server_task_count.get(s["server_id"], 0)
+
+    election = elect_cluster_leader(current_servers, priority=load_priority)
+    modified = elect_cluster_leader(current_servers, priority=load_priority, algorithm="modified")
+
+    if election["leader"] is not None:
+        elected_leader = election["leader"]
+        result = election["result"]
         
         with st.expander(f"{cluster_name} — Elected Leader"):
             st.success(f"Leader Node: `{elected_leader}` (Active)")
-            st.write(f"Tasks Assigned: {server_task_count[elected_leader]}")
+            st.write(f"Tasks Assigned: {server_task_count.get(elected_leader, 0)}")
+            st.write(
+                f"**Bully election:** {result.total_messages} messages "
+                f"(ELECTION {result.messages['ELECTION']}, OK {result.messages['OK']}, "
+                f"COORDINATOR {result.messages['COORDINATOR']}) in {result.latency * 1000:.2f} ms"
+            )
+            st.write(
+                f"**Modified Bully:** {modified['result'].total_messages} messages "
+                f"in {modified['result'].latency * 1000:.2f} ms"
+            )
             st.subheader("Final Best Chromosome")
-            for gene in best_chrom:
-                server_status = " (FAILED)" if any(s.get('status', 'active') == 'failed' 
-                    and s["server_id"] == gene["server_id"] for s in current_servers) else ""
-                st.markdown(
-                    f"- Device `{gene['device_id']}` → Task **{gene['task']}** "
-                    f"(Complexity: `{gene['complexity']}`) → Server `{gene['server_id']}`{server_status}"
-                )
+            load = server_load_frame(best_chrom, current_servers)
+            st.bar_chart(load["Load"])
+            st.dataframe(load)
+            if st.checkbox("Show gene listing", key=f"best_{cluster_name}_show"):
+                failed_ids = {s["server_id"] for s in current_servers if s.get('status', 'active') == 'failed'}
+                genes = genes_frame(best_chrom)
+                genes["server_failed"] = genes["server_id"].isin(failed_ids)
+                paged_dataframe(genes, key=f"best_{cluster_name}_genes")
     else:
         with st.expander(f"{cluster_name} — Leader Election"):
-            st.error("No active servers available for leader election!")
\ No newline at end of file
+            st.error("No active servers available for leader election!")
+
+# ------------------------------
+# Profiling panel
+# ------------------------------
+if show_profile:
+    st.header("Pipeline Profile")
+    snapshot = profiler.snapshot()
+    if snapshot["timers"]:
+        phases = pd.DataFrame(snapshot["timers"]).T.sort_values("seconds", ascending=False)
+        st.bar_chart(phases["seconds"])
+        st.dataframe(phases)
+    else:
+        st.info("Nothing was recomputed in this rerun (all stages came from the cache).")
+    if snapshot["counters"]:
+        st.table(pd.DataFrame({"Count": snapshot["counters"]}))
+    if snapshot["series"].get("generation_seconds"):
+        st.line_chart(pd.DataFrame({"Generation seconds": snapshot["series"]["generation_seconds"]}))
+    st.download_button("Download JSON", profiler.to_json(), file_name="profile.json", key="profile_json")
+    with st.expander("Prometheus text format"):
+        st.code(profiler.to_prometheus(), language="text")
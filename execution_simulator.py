@@ -0,0 +1,173 @@
+import heapq
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from ga_module import TaskTable, build_server_table, evaluate_population_batch
+from profiling import latency_summary
+
+# event kinds; at equal times finished work is handled before new arrivals
+TRANSFER_DONE = 0
+EXEC_DONE = 1
+ARRIVAL = 2
+
+LATENCY_METRICS = ("makespan", "mean", "p95")
+
+
+def simulate_execution(
+    chromosome,
+    servers: List[Dict],
+    tasks: Optional[TaskTable] = None,
+    arrival_times: Optional[np.ndarray] = None,
+    mb_per_mi: float = 0.001
+) -> Dict:
+    """
+    Discrete-event run of one chromosome on the servers' original capacities.
+    Every server has a network link and a CPU, each a FIFO queue working on one
+    task at a time: a task first transfers its input (complexity * mb_per_mi MB
+    over the server's bandwidth in Mbps), then executes (complexity MI at the
+    server's cpu MIPS). Transfers overlap with execution of earlier tasks.
+      - chromosome: dict genes, or a compact array with its TaskTable
+      - arrival_times: seconds per task (default: all at 0)
+    Tasks that are unassigned or sit on failed / zero-CPU servers are dropped.
+    Returns makespan, per-task latency percentiles (arrival -> done), per-server
+    CPU and link utilisation over the makespan, and event throughput.
+    """
+    t0 = time.perf_counter()
+    table = build_server_table(servers)
+    if tasks is not None:
+        srv = np.asarray(chromosome, dtype=np.int64)
+        complexity = np.asarray(tasks.complexity, dtype=np.float64)
+    else:
+        srv = np.asarray([table.index.get(g["server_id"], -1) for g in chromosome], dtype=np.int64)
+        complexity = np.asarray([g["complexity"] for g in chromosome], dtype=np.float64)
+    n = len(srv)
+    arrival = np.zeros(n) if arrival_times is None else np.asarray(arrival_times, dtype=np.float64)
+
+    cpu = table.cpu.astype(np.float64)
+    bandwidth = table.bandwidth.astype(np.float64)
+    safe = np.maximum(srv, 0)
+    runnable = (srv >= 0) & table.active[safe] & (cpu[safe] > 0) & (bandwidth[safe] > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        transfer = np.where(runnable, complexity * mb_per_mi * 8 / bandwidth[safe], 0.0).tolist()
+        execute = np.where(runnable, complexity / cpu[safe], 0.0).tolist()
+    on = srv.tolist()
+
+    n_srv = len(table.ids)
+    link_idle = [True] * n_srv
+    cpu_idle = [True] * n_srv
+    link_queue = [deque() for _ in range(n_srv)]
+    cpu_queue = [deque() for _ in range(n_srv)]
+    link_busy = [0.0] * n_srv
+    cpu_busy = [0.0] * n_srv
+    finish = np.full(n, np.nan)
+    done = finish.tolist()
+
+    events = [(a, ARRIVAL, i) for i, a in enumerate(arrival.tolist()) if runnable[i]]
+    heapq.heapify(events)
+    pop, push = heapq.heappop, heapq.heappush
+    processed = 0
+    while events:
+        now, kind, i = pop(events)
+        processed += 1
+        s = on[i]
+        if kind == ARRIVAL:
+            if link_idle[s]:
+                link_idle[s] = False
+                link_busy[s] += transfer[i]
+                push(events, (now + transfer[i], TRANSFER_DONE, i))
+            else:
+                link_queue[s].append(i)
+        elif kind == TRANSFER_DONE:
+            if link_queue[s]:
+                j = link_queue[s].popleft()
+                link_busy[s] += transfer[j]
+                push(events, (now + transfer[j], TRANSFER_DONE, j))
+            else:
+                link_idle[s] = True
+            if cpu_idle[s]:
+                cpu_idle[s] = False
+                cpu_busy[s] += execute[i]
+                push(events, (now + execute[i], EXEC_DONE, i))
+            else:
+                cpu_queue[s].append(i)
+        else:
+            done[i] = now
+            if cpu_queue[s]:
+                j = cpu_queue[s].popleft()
+                cpu_busy[s] += execute[j]
+                push(events, (now + execute[j], EXEC_DONE, j))
+            else:
+                cpu_idle[s] = True
+
+    finish = np.asarray(done)
+    completed = ~np.isnan(finish)
+    latency = finish[completed] - arrival[completed]
+    makespan = float(finish[completed].max()) if completed.any() else 0.0
+    seconds = time.perf_counter() - t0
+    return {
+        "tasks": n,
+        "completed": int(completed.sum()),
+        "dropped": int(n - completed.sum()),
+        "makespan": makespan,
+        "latency": latency_summary(latency),
+        "utilisation": {
+            sid: {"cpu": cpu_busy[k] / makespan if makespan else 0.0,
+                  "link": link_busy[k] / makespan if makespan else 0.0}
+            for k, sid in enumerate(table.ids)
+        },
+        "events": processed,
+        "seconds": seconds,
+        "events_per_sec": processed / seconds if seconds > 0 else None,
+    }
+
+
+def execution_cost(result: Dict, metric: str = "makespan") -> float:
+    """One number from a simulate_execution result: makespan, or mean / p95 task latency."""
+    if metric not in LATENCY_METRICS:
+        raise ValueError(f"metric must be one of {LATENCY_METRICS}, got {metric!r}")
+    if metric == "makespan":
+        return result["makespan"]
+    return result["latency"][metric] if result["latency"] else 0.0
+
+
+def execution_objective(
+    servers: List[Dict],
+    weights: Dict[str, float],
+    tasks: Optional[TaskTable] = None,
+    metric: str = "makespan",
+    latency_weight: float = 1.0,
+    **simulate_kwargs
+) -> Callable[[List], List[float]]:
+    """
+    Fitness function for GA drivers that accept one (e.g. evolve_adaptive's
+    fitness_fn): the usual Fs fitness minus latency_weight x the simulated
+    execution cost (makespan or a latency statistic, in seconds) of each chromosome.
+    """
+    def fitness(population: List) -> List[float]:
+        base = evaluate_population_batch(population, servers, weights, tasks=tasks)
+        costs = [
+            execution_cost(simulate_execution(chrom, servers, tasks, **simulate_kwargs), metric)
+            for chrom in population
+        ]
+        return (base - latency_weight * np.asarray(costs)).tolist()
+    return fitness
+
+
+if __name__ == "__main__":
+    # Event throughput on growing task counts (Poisson arrivals over 60 s)
+    from ga_benchmarks import make_cluster
+    from ga_module import build_task_table, generate_chromosome
+
+    for n_tasks in (10000, 100000, 1000000):
+        tasks, servers = make_cluster(n_tasks, 200)
+        task_table, table = build_task_table(tasks), build_server_table(servers)
+        chromosome = generate_chromosome(task_table, table)
+        arrivals = np.sort(np.random.default_rng(0).uniform(0, 60, n_tasks))
+        r = simulate_execution(chromosome, servers, task_table, arrival_times=arrivals)
+        busiest = max(u["cpu"] for u in r["utilisation"].values())
+        print(f"tasks={n_tasks:8d} events={r['events']:8d} {r['seconds']:.2f}s "
+              f"({r['events_per_sec'] * 60 / 1e6:.1f}M events/min) makespan={r['makespan']:.1f}s "
+              f"p95={r['latency']['p95']:.2f}s busiest cpu={busiest:.0%}")
@@ -0,0 +1,340 @@
+import asyncio
+import random
+import time
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+from bully_election import VirtualTimeLoop, elect_cluster_leader, elect_cluster_leader_async
+from profiling import latency_summary
+
+ACTIVE = "active"
+SUSPECTED = "suspected"
+FAILED = "failed"
+RECOVERED = "recovered"
+
+# how a detector status maps onto the GA's server["status"] field:
+# a suspected server still takes tasks, a recovered one is active again
+SERVER_STATUS = {ACTIVE: "active", SUSPECTED: "active", RECOVERED: "active", FAILED: "failed"}
+
+
+class StatusEvent(NamedTuple):
+    node_id: Hashable
+    old:     str
+    new:     str      # suspected | failed | recovered | active (suspicion cleared)
+    at:      float    # detector clock, seconds
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel (Varghese & Lauck). Time is counted in integer
+    ticks; level L has `slots` buckets of slots**L ticks each. schedule() and
+    cancel() are O(1); advance() costs O(ticks elapsed + timers expired), with
+    timers cascading down one level when their bucket comes up.
+    """
+
+    def __init__(self, slots: int = 256, levels: int = 4):
+        self.slots = slots
+        self.levels = levels
+        self.current = 0
+        self._spans = [slots ** level for level in range(levels)]
+        self._wheels: List[List[Dict[Hashable, int]]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._where: Dict[Hashable, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def _place(self, key: Hashable, expires: int) -> None:
+        delta = max(expires - self.current, 0)
+        level = 0
+        while level < self.levels - 1 and delta >= self._spans[level + 1]:
+            level += 1
+        if level == self.levels - 1 and delta >= self._spans[level] * self.slots:
+            bucket_tick = self.current + self._spans[level] * (self.slots - 1)   # beyond range: park in the last bucket
+        else:
+            bucket_tick = max(expires, self.current)
+        slot = (bucket_tick // self._spans[level]) % self.slots
+        self._wheels[level][slot][key] = expires
+        self._where[key] = (level, slot)
+
+    def schedule(self, key: Hashable, expires: int) -> None:
+        """(Re)arm the timer for key to fire at tick `expires` (at the earliest the next tick)."""
+        self.cancel(key)
+        self._place(key, max(expires, self.current + 1))
+
+    def cancel(self, key: Hashable) -> None:
+        where = self._where.pop(key, None)
+        if where is not None:
+            del self._wheels[where[0]][where[1]][key]
+
+    def advance(self, to_tick: int) -> List[Hashable]:
+        """Move the clock to `to_tick`; returns the keys whose timers fired."""
+        fired = []
+        while self.current < to_tick:
+            self.current += 1
+            t = self.current
+            # cascade from the highest level whose bucket boundary is reached
+            boundary = 0
+            while boundary < self.levels - 1 and t % self._spans[boundary + 1] == 0:
+                boundary += 1
+            for level in range(boundary, 0, -1):
+                slot = (t // self._spans[level]) % self.slots
+                bucket = self._wheels[level][slot]
+                if bucket:
+                    self._wheels[level][slot] = {}
+                    for key, expires in bucket.items():
+                        self._place(key, expires)
+            slot = t % self.slots
+            bucket = self._wheels[0][slot]
+            if bucket:
+                self._wheels[0][slot] = {}
+                for key in bucket:
+                    del self._where[key]
+                fired.extend(bucket)
+        return fired
+
+
+class FailureDetector:
+    """
+    Heartbeat failure detector. Every node has exactly one timer in a TimerWheel:
+    a node not heard from for suspect_after seconds becomes suspected, after
+    fail_after seconds failed. A heartbeat from a suspected node clears the
+    suspicion (-> active), one from a failed node marks it recovered.
+    Each heartbeat is O(1); transitions are published to subscribers as StatusEvents.
+    """
+
+    def __init__(self, suspect_after: float = 3.0, fail_after: float = 6.0, tick: float = 0.05):
+        if not 0 < suspect_after < fail_after:
+            raise ValueError("need 0 < suspect_after < fail_after")
+        self.suspect_after = suspect_after
+        self.fail_after = fail_after
+        self.tick = tick
+        self.wheel = TimerWheel()
+        self.status: Dict[Hashable, str] = {}
+        self.last_heartbeat: Dict[Hashable, float] = {}
+        self.heartbeats = 0
+        self.events: List[StatusEvent] = []
+        self._subscribers: List[Callable[[StatusEvent], None]] = []
+
+    def _ticks(self, seconds: float) -> int:
+        return int(-(-seconds // self.tick))   # ceil: never fire early
+
+    def subscribe(self, callback: Callable[[StatusEvent], None]) -> None:
+        self._subscribers.append(callback)
+
+    def _publish(self, node_id: Hashable, new: str, now: float) -> None:
+        event = StatusEvent(node_id, self.status[node_id], new, now)
+        self.status[node_id] = ACTIVE if new == RECOVERED else new
+        self.events.append(event)
+        for callback in self._subscribers:
+            callback(event)
+
+    def register(self, node_id: Hashable, now: float) -> None:
+        self.status[node_id] = ACTIVE
+        self.last_heartbeat[node_id] = now
+        self.wheel.schedule(node_id, self._ticks(now + self.suspect_after))
+
+    def heartbeat(self, node_id: Hashable, now: float) -> None:
+        if node_id not in self.status:
+            self.register(node_id, now)
+            return
+        self.heartbeats += 1
+        self.last_heartbeat[node_id] = now
+        status = self.status[node_id]
+        if status == FAILED:
+            self._publish(node_id, RECOVERED, now)
+        elif status == SUSPECTED:
+            self._publish(node_id, ACTIVE, now)
+        self.wheel.schedule(node_id, self._ticks(now + self.suspect_after))
+
+    def advance(self, now: float) -> None:
+        """Fire every timeout due by `now`."""
+        for node_id in self.wheel.advance(int(now // self.tick)):
+            if self.status[node_id] == ACTIVE:
+                self._publish(node_id, SUSPECTED, now)
+                self.wheel.schedule(node_id, self._ticks(self.last_heartbeat[node_id] + self.fail_after))
+            elif self.status[node_id] == SUSPECTED:
+                self._publish(node_id, FAILED, now)
+
+    def snapshot(self) -> Dict[Hashable, str]:
+        return dict(self.status)
+
+
+class ServerStatusSync:
+    """
+    Subscriber for the GA side: keeps server["status"] of the cluster dicts in
+    line with the detector (see SERVER_STATUS), so placement, chromosome
+    generation and FitnessCache keys see the new state.
+    """
+
+    def __init__(self, cloud_clusters: Dict[str, List[Dict]]):
+        self.servers = {srv["server_id"]: srv for servers in cloud_clusters.values() for srv in servers}
+
+    def __call__(self, event: StatusEvent) -> None:
+        server = self.servers.get(event.node_id)
+        if server is not None:
+            server["status"] = SERVER_STATUS[event.new]
+
+
+class LeaderWatcher:
+    """
+    Subscriber for the leader-election side: re-runs the Bully election of a
+    cluster whenever its leader fails or any server recovers (a recovered
+    higher-priority server bullies its way back in). Inside a running event
+    loop the election runs there as a task, so its latency is on the same clock.
+    """
+
+    def __init__(self, servers: List[Dict], priority: Optional[Callable[[Dict], float]] = None,
+                 algorithm: str = "modified"):
+        self.servers = servers
+        self.priority = priority
+        self.algorithm = algorithm
+        self.ids = {srv["server_id"] for srv in servers}
+        self.status = {srv["server_id"]: SERVER_STATUS.get(srv.get("status", "active"), "active") for srv in servers}
+        self.elections: List[Tuple[float, Dict]] = []
+        self._pending: set = set()
+        self.leader: Optional[str] = None
+        self._record(0.0, elect_cluster_leader(self._view(), priority=priority, algorithm=algorithm))
+
+    def _view(self) -> List[Dict]:
+        return [dict(srv, status=self.status[srv["server_id"]]) for srv in self.servers]
+
+    def _record(self, at: float, outcome: Dict) -> None:
+        self.elections.append((at, outcome))
+        self.leader = outcome["leader"]
+
+    async def _elect_async(self, at: float) -> None:
+        self._record(at, await elect_cluster_leader_async(self._view(), priority=self.priority,
+                                                          algorithm=self.algorithm))
+
+    def __call__(self, event: StatusEvent) -> None:
+        if event.node_id not in self.ids:
+            return
+        self.status[event.node_id] = SERVER_STATUS[event.new]
+        if not ((event.new == FAILED and event.node_id == self.leader) or event.new == RECOVERED):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._record(event.at, elect_cluster_leader(self._view(), priority=self.priority,
+                                                        algorithm=self.algorithm))
+            return
+        task = loop.create_task(self._elect_async(event.at))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+
+def simulate_heartbeats(
+    node_ids: List[Hashable],
+    duration: float,
+    crashes: Optional[Dict[Hashable, Tuple[float, Optional[float]]]] = None,
+    interval: float = 1.0,
+    suspect_after: float = 3.0,
+    fail_after: float = 6.0,
+    tick: float = 0.05,
+    loss_prob: float = 0.0,
+    subscribers: Tuple[Callable[[StatusEvent], None], ...] = (),
+    seed: Optional[int] = None,
+    virtual_time: bool = True
+) -> Dict:
+    """
+    Run a FailureDetector against simulated servers on an asyncio clock.
+      - crashes: node -> (crash_at, recover_at or None), in seconds
+      - interval: heartbeat period; every node gets a random phase
+      - loss_prob: chance each heartbeat is lost (causes false suspicions)
+    Heartbeats are emitted by one coroutine per tick for the nodes whose phase
+    falls in it, so CPU stays proportional to heartbeats, not to node count.
+    Returns the detector, its events, final statuses and detection-latency stats.
+    """
+    crashes = crashes or {}
+    rnd = random.Random(seed)
+    detector = FailureDetector(suspect_after, fail_after, tick)
+    for callback in subscribers:
+        detector.subscribe(callback)
+
+    ticks_per_interval = max(1, round(interval / tick))
+    phases: List[List[Hashable]] = [[] for _ in range(ticks_per_interval)]
+    for node_id in node_ids:
+        phases[rnd.randrange(ticks_per_interval)].append(node_id)
+
+    def is_down(node_id: Hashable, now: float) -> bool:
+        crash = crashes.get(node_id)
+        return crash is not None and crash[0] <= now and (crash[1] is None or now < crash[1])
+
+    async def run(loop: asyncio.AbstractEventLoop) -> None:
+        start = loop.time()
+        for node_id in node_ids:
+            detector.register(node_id, 0.0)
+        step = 0
+        while step * tick < duration:
+            step += 1
+            await asyncio.sleep(start + step * tick - loop.time())
+            now = step * tick
+            for node_id in phases[step % ticks_per_interval]:
+                if not is_down(node_id, now) and (loss_prob == 0 or rnd.random() >= loss_prob):
+                    detector.heartbeat(node_id, now)
+            detector.advance(now)
+        # let elections started by subscribers finish
+        others = asyncio.all_tasks(loop) - {asyncio.current_task(loop)}
+        if others:
+            await asyncio.gather(*others)
+
+    loop = VirtualTimeLoop() if virtual_time else asyncio.new_event_loop()
+    cpu_start = time.process_time()
+    try:
+        loop.run_until_complete(run(loop))
+    finally:
+        loop.close()
+    cpu_seconds = time.process_time() - cpu_start
+
+    detected = {}
+    for event in detector.events:
+        crash = crashes.get(event.node_id)
+        if event.new == FAILED and crash and event.at >= crash[0] and event.node_id not in detected:
+            detected[event.node_id] = event.at - crash[0]
+    crashed_ids = set(crashes)
+    latencies = list(detected.values())
+    return {
+        "detector": detector,
+        "events": detector.events,
+        "status": detector.snapshot(),
+        "nodes": len(node_ids),
+        "heartbeats": detector.heartbeats,
+        "cpu_seconds": cpu_seconds,
+        "detected": len(detected),
+        "missed": len([n for n, c in crashes.items() if c[0] + fail_after <= duration and n not in detected]),
+        "false_suspicions": sum(
+            1 for e in detector.events
+            if e.new == SUSPECTED and not is_down(e.node_id, e.at) and e.node_id not in crashed_ids
+        ),
+        "detection_latency": latency_summary(latencies),
+    }
+
+
+def detect_cluster_failures(
+    cloud_clusters: Dict[str, List[Dict]],
+    crash_prob: float = 0.5,
+    duration: float = 30.0,
+    seed: Optional[int] = None,
+    **kwargs
+) -> Tuple[Dict[str, str], Dict]:
+    """
+    Replacement for check_server_health's coin flips: each server crashes with
+    probability crash_prob at a random time in the first half of the run, and the
+    statuses are whatever the heartbeat detector concluded at the end.
+    Returns ({server_id: 'active' | 'failed'}, simulate_heartbeats report).
+    """
+    rnd = random.Random(seed)
+    server_ids = [srv["server_id"] for servers in cloud_clusters.values() for srv in servers]
+    crashes = {sid: (rnd.uniform(0, duration / 2), None) for sid in server_ids if rnd.random() < crash_prob}
+    report = simulate_heartbeats(server_ids, duration, crashes=crashes, seed=seed, **kwargs)
+    return {sid: SERVER_STATUS[status] for sid, status in report["status"].items()}, report
+
+
+if __name__ == "__main__":
+    # Detection latency and CPU cost as the monitored population grows
+    for n in (100, 1000, 10000, 50000):
+        rnd = random.Random(n)
+        crashes = {i: (rnd.uniform(5, 30), None) for i in rnd.sample(range(n), max(1, n // 100))}
+        r = simulate_heartbeats(list(range(n)), duration=60, crashes=crashes, loss_prob=0.01, seed=n)
+        print(f"nodes={n:6d} heartbeats={r['heartbeats']:8d} cpu={r['cpu_seconds']:.2f}s "
+              f"detected={r['detected']}/{len(crashes)} false_suspicions={r['false_suspicions']} "
+              f"latency={r['detection_latency']}")
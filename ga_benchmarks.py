@@ -0,0 +1,429 @@
+import json
+import os
+import pickle
+import random
+import shutil
+import tempfile
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+from itertools import islice
+
+import numpy as np
+
+from ga_module import (
+    DeltaEvaluator, SEEDING_HEURISTICS, SELECTION_OPERATORS, WEIGHT_KEYS, Selector, build_server_table,
+    build_task_table, decode_population, evolve_adaptive, evolve_clusters_parallel, evolve_islands,
+    evaluate_population_batch, evolve_population, evolve_single_population, generate_chromosome,
+    generation_loop, load_checkpoint, overloaded_servers, repair_chromosome, roulette_selection,
+    save_checkpoint, sweep_weights, weight_grid,
+)
+
+WEIGHTS = {"cpu": 0.1, "ram": 0.3, "bandwidth": 0.2, "throughput": 0.4}
+
+
+def make_cluster(n_tasks: int = 2000, n_servers: int = 50, seed: int = 0
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Synthetic cluster in extract_state's shape: (tasks, servers).
+    """
+    rnd = random.Random(seed)
+    servers = [
+        {
+            "server_id":  f"S{i + 1}",
+            "cpu":        rnd.randint(20000, 80000),
+            "ram":        rnd.choice([8, 12, 16, 32]),
+            "bandwidth":  rnd.randint(5, 10),
+            "throughput": rnd.randint(3, 5),
+            "status":     "active",
+        }
+        for i in range(n_servers)
+    ]
+    tasks = [
+        {
+            "device_id":   f"Device-{i // 2 + 1}",
+            "task":        f"task-{i % 7}",
+            "complexity":  rnd.randint(200, 3000),
+            "orig_server": servers[i % n_servers]["server_id"],
+        }
+        for i in range(n_tasks)
+    ]
+    return tasks, servers
+
+
+def _measure(build) -> Tuple[object, float, int]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def bench_chromosome_memory(n_tasks: int = 2000, n_servers: int = 50, population_size: int = 200) -> Dict:
+    """
+    Compare the dict-list chromosome format with the compact one
+    (shared TaskTable + one server-index array per individual).
+    """
+    tasks, servers = make_cluster(n_tasks, n_servers)
+
+    random.seed(0)
+    _, dict_time, dict_peak = _measure(
+        lambda: [generate_chromosome(tasks, servers) for _ in range(population_size)]
+    )
+
+    def build_compact():
+        task_table, server_table = build_task_table(tasks), build_server_table(servers)
+        return task_table, [generate_chromosome(task_table, server_table) for _ in range(population_size)]
+
+    random.seed(0)
+    _, compact_time, compact_peak = _measure(build_compact)
+
+    return {
+        "tasks": n_tasks,
+        "servers": n_servers,
+        "population_size": population_size,
+        "dict_peak_bytes": dict_peak,
+        "compact_peak_bytes": compact_peak,
+        "memory_ratio": dict_peak / max(compact_peak, 1),
+        "dict_seconds": dict_time,
+        "compact_seconds": compact_time,
+    }
+
+
+def bench_parallel_clusters(
+    n_clusters: int = 50,
+    n_tasks: int = 400,
+    n_servers: int = 20,
+    population_size: int = 40,
+    generations: int = 20
+) -> Dict:
+    """
+    Wall time of evolve_clusters_parallel with 1 worker vs. one worker per CPU.
+    """
+    task_tables, servers_map, populations = {}, {}, {}
+    for k in range(n_clusters):
+        tasks, servers = make_cluster(n_tasks, n_servers, seed=k)
+        cname = f"Cluster {k + 1}"
+        task_tables[cname] = build_task_table(tasks)
+        servers_map[cname] = servers
+        table = build_server_table(servers)
+        populations[cname] = [generate_chromosome(task_tables[cname], table) for _ in range(population_size)]
+
+    timings = {}
+    workers = os.cpu_count() or 1
+    for n in sorted({1, workers}):
+        t0 = time.perf_counter()
+        evolve_clusters_parallel(
+            populations, servers_map, WEIGHTS, generations, population_size,
+            max_workers=n, seed=0, task_tables=task_tables,
+        )
+        timings[n] = time.perf_counter() - t0
+
+    return {
+        "clusters": n_clusters,
+        "workers": workers,
+        "seconds_by_workers": timings,
+        "speedup": timings[1] / timings[workers],
+    }
+
+
+def bench_island_model(
+    n_tasks: int = 2000,
+    n_servers: int = 100,
+    population_size: int = 80,
+    generations: int = 60,
+    n_islands: int = 4,
+    migration_interval: int = 5,
+    topology: str = "ring"
+) -> Dict:
+    """
+    Time-to-target of the island model vs. the single-population loop.
+    The target is the single-population run's final best fitness.
+    """
+    tasks, servers = make_cluster(n_tasks, n_servers)
+    task_table, table = build_task_table(tasks), build_server_table(servers)
+    random.seed(0)
+    population = [generate_chromosome(task_table, table) for _ in range(population_size)]
+
+    single = evolve_single_population(population, servers, WEIGHTS, generations, tasks=task_table, seed=0)
+    target = single["best_fitness"]
+    single = evolve_single_population(
+        population, servers, WEIGHTS, generations, tasks=task_table, seed=0, target_fitness=target
+    )
+    islands = evolve_islands(
+        population, servers, WEIGHTS, generations, n_islands=n_islands,
+        migration_interval=migration_interval, topology=topology, seed=0,
+        tasks=task_table, target_fitness=target,
+    )
+
+    return {
+        "target_fitness": target,
+        "single": {k: single[k] for k in ("best_fitness", "generations_to_target", "time_to_target", "seconds")},
+        "islands": {k: islands[k] for k in ("best_fitness", "generations_to_target", "time_to_target", "seconds")},
+    }
+
+
+def bench_delta_evaluation(
+    n_tasks: int = 20000,
+    n_servers: int = 1000,
+    population_size: int = 100,
+    generations: int = 10
+) -> Dict:
+    """
+    Generation time with full re-scoring vs. DeltaEvaluator's incremental path,
+    plus a short verify=True run that cross-checks delta against full scores.
+    """
+    tasks, servers = make_cluster(n_tasks, n_servers)
+    task_table, table = build_task_table(tasks), build_server_table(servers)
+    random.seed(0)
+    population = [generate_chromosome(task_table, table) for _ in range(population_size)]
+
+    random.seed(1)
+    t0 = time.perf_counter()
+    pop = population
+    fitness = evaluate_population_batch(pop, table, WEIGHTS, tasks=task_table).tolist()
+    for _ in range(generations):
+        pop = evolve_population(pop, fitness, table, population_size, tasks=task_table)
+        fitness = evaluate_population_batch(pop, table, WEIGHTS, tasks=task_table).tolist()
+    full_time = time.perf_counter() - t0
+
+    def run_delta(evaluator: DeltaEvaluator, n_generations: int) -> float:
+        random.seed(1)
+        t0 = time.perf_counter()
+        pop = [evaluator.score(chrom) for chrom in population]
+        for _ in range(n_generations):
+            pop = evolve_population(pop, [c.fitness for c in pop], table, population_size, evaluator=evaluator)
+        return time.perf_counter() - t0
+
+    delta_time = run_delta(DeltaEvaluator(table, WEIGHTS, task_table), generations)
+    verifier = DeltaEvaluator(table, WEIGHTS, task_table, verify=True)
+    run_delta(verifier, 2)
+
+    return {
+        "tasks": n_tasks,
+        "servers": n_servers,
+        "full_seconds": full_time,
+        "delta_seconds": delta_time,
+        "speedup": full_time / delta_time,
+        "verified_children": verifier.checked,
+    }
+
+
+def bench_selection(population_size: int = 2000, children: int = 2000) -> Dict:
+    """
+    Time to pick parents for one generation: per-child roulette_selection
+    (O(population) per call) vs. one Selector per generation.
+    """
+    rnd = random.Random(0)
+    population = list(range(population_size))
+    fitness = [rnd.uniform(0, 100) for _ in population]
+
+    t0 = time.perf_counter()
+    for _ in range(children):
+        roulette_selection(population, fitness, num_parents=2)
+    timings = {"roulette_selection": time.perf_counter() - t0}
+
+    for method in SELECTION_OPERATORS:
+        t0 = time.perf_counter()
+        selector = Selector(fitness, method)
+        for _ in range(children):
+            selector.parents(population)
+        timings[method] = time.perf_counter() - t0
+
+    return {"population_size": population_size, "children": children, "seconds": timings}
+
+
+def bench_adaptive(
+    n_tasks: int = 2000,
+    n_servers: int = 100,
+    population_size: int = 40,
+    generations: int = 200,
+    patience: int = 15
+) -> Dict:
+    """
+    Fixed-generation loop vs. evolve_adaptive (plateau stop + adaptive mutation):
+    final fitness, evaluations and wall time.
+    """
+    tasks, servers = make_cluster(n_tasks, n_servers)
+    task_table, table = build_task_table(tasks), build_server_table(servers)
+    random.seed(0)
+    population = [generate_chromosome(task_table, table) for _ in range(population_size)]
+
+    fixed = evolve_single_population(population, servers, WEIGHTS, generations, tasks=task_table, seed=0)
+    adaptive = evolve_adaptive(population, servers, WEIGHTS, generations, tasks=task_table, seed=0, patience=patience)
+
+    return {
+        "fixed": {
+            "best_fitness": fixed["best_fitness"],
+            "evaluations": population_size * (generations + 1),
+            "seconds": fixed["seconds"],
+        },
+        "adaptive": {k: adaptive[k] for k in ("best_fitness", "evaluations", "seconds", "generations", "stop_reason", "saved")},
+    }
+
+
+def _dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def bench_checkpoint(n_tasks: int = 20000, n_servers: int = 200, population_size: int = 50) -> Dict:
+    """
+    Size, save and load time of one cluster's GA state: save_checkpoint /
+    load_checkpoint (memory-mapped and fully read) vs. pickle and JSON of the
+    dashboard's dict-format population.
+    """
+    tasks, servers = make_cluster(n_tasks, n_servers)
+    task_table, table = build_task_table(tasks), build_server_table(servers)
+    random.seed(0)
+    population = [generate_chromosome(task_table, table) for _ in range(population_size)]
+    fitness = evaluate_population_batch(population, table, WEIGHTS, tasks=task_table).tolist()
+    dict_state = {"population": decode_population(population, task_table, table),
+                  "fitness": fitness, "servers": servers, "generation": 0}
+
+    tmp = tempfile.mkdtemp()
+    try:
+        results = {}
+        ckpt = os.path.join(tmp, "ckpt")
+        t0 = time.perf_counter()
+        save_checkpoint(ckpt, {"C": population}, {"C": task_table}, {"C": servers}, {"C": fitness})
+        save_seconds = time.perf_counter() - t0
+        for mode, mmap in (("checkpoint_mmap", True), ("checkpoint_read", False)):
+            t0 = time.perf_counter()
+            state = load_checkpoint(ckpt, mmap=mmap)
+            results[mode] = {"bytes": _dir_size(ckpt), "save_seconds": save_seconds,
+                             "load_seconds": time.perf_counter() - t0}
+        del state
+
+        for name, dump, load, binary in (
+            ("pickle", pickle.dump, pickle.load, True),
+            ("json", json.dump, json.load, False),
+        ):
+            file = os.path.join(tmp, name)
+            t0 = time.perf_counter()
+            with open(file, "wb" if binary else "w") as f:
+                dump(dict_state, f)
+            save_seconds = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            with open(file, "rb" if binary else "r") as f:
+                load(f)
+            results[name] = {"bytes": os.path.getsize(file), "save_seconds": save_seconds,
+                             "load_seconds": time.perf_counter() - t0}
+    finally:
+        shutil.rmtree(tmp)
+
+    return {"tasks": n_tasks, "population_size": population_size, "formats": results}
+
+
+def bench_weight_sweep(
+    n_tasks: int = 2000,
+    n_servers: int = 100,
+    population_size: int = 60,
+    step: float = 0.1
+) -> Dict:
+    """
+    Scoring a population under a whole weight grid: one sweep_weights call vs.
+    one evaluate_population_batch call per weighting (and vs. a single one).
+    """
+    tasks, servers = make_cluster(n_tasks, n_servers)
+    task_table, table = build_task_table(tasks), build_server_table(servers)
+    random.seed(0)
+    population = [generate_chromosome(task_table, table) for _ in range(population_size)]
+    grid = weight_grid(step)
+
+    t0 = time.perf_counter()
+    evaluate_population_batch(population, table, WEIGHTS, tasks=task_table)
+    single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for w in grid:
+        evaluate_population_batch(population, table, dict(zip(WEIGHT_KEYS, w)), tasks=task_table)
+    looped = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    sweep = sweep_weights(population, table, grid, tasks=task_table)
+    swept = time.perf_counter() - t0
+
+    return {
+        "weightings": len(grid),
+        "single_evaluation_seconds": single,
+        "looped_seconds": looped,
+        "sweep_seconds": swept,
+        "speedup_vs_loop": looped / swept,
+        "distinct_best_chromosomes": len({r["best_index"] for r in sweep["results"]}),
+    }
+
+
+def bench_repair(
+    n_tasks: int = 2000,
+    n_servers: int = 100,
+    population_size: int = 40,
+    generations: int = 100,
+    target_fitness: Optional[float] = None
+) -> Dict:
+    """
+    Evaluations until the best capacity-feasible chromosome (no server above
+    its CPU) reaches target_fitness: random population without repair, with
+    repair_chromosome after every mutation, and with heuristic seeds + repair.
+    The default target is 90% of the best feasible fitness any variant reached.
+    """
+    tasks, servers = make_cluster(n_tasks, n_servers)
+    task_table, table = build_task_table(tasks), build_server_table(servers)
+    random.seed(0)
+    population = [generate_chromosome(task_table, table) for _ in range(population_size)]
+    variants = {"plain": (population, False), "repair": (population, True)}
+    for name, heuristic in SEEDING_HEURISTICS.items():
+        seeded = [heuristic(task_table, table)] + population[1:]
+        variants[f"{name}+repair"] = ([repair_chromosome(c, table, task_table) for c in seeded], True)
+
+    traces = {}
+    def best_feasible(pop: List, fitness: List[float]):
+        feasible = overloaded_servers(pop, table, task_table) == 0
+        return max((f for f, ok in zip(fitness, feasible) if ok), default=None)
+
+    for name, (pop, repair) in variants.items():
+        t0 = time.perf_counter()
+        fitness = evaluate_population_batch(pop, table, WEIGHTS, tasks=task_table).tolist()
+        trace = [(population_size, best_feasible(pop, fitness))]   # (evaluations, best feasible fitness)
+        loop = generation_loop(pop, fitness, servers, WEIGHTS, population_size, task_table,
+                            np.random.default_rng(0), repair=repair)
+        for g, (pop, fitness) in enumerate(islice(loop, generations)):
+            trace.append(((g + 2) * population_size, best_feasible(pop, fitness)))
+        traces[name] = (trace, time.perf_counter() - t0)
+
+    reached = [b for trace, _ in traces.values() for _, b in trace if b is not None]
+    if target_fitness is None and reached:
+        target_fitness = 0.9 * max(reached)
+    results = {"target_fitness": target_fitness}
+    for name, (trace, seconds) in traces.items():
+        bests = [b for _, b in trace if b is not None]
+        results[name] = {
+            "evaluations_to_target": next(
+                (e for e, b in trace if b is not None and b >= target_fitness), None
+            ),
+            "first_feasible_at": next((e for e, b in trace if b is not None), None),
+            "best_feasible_fitness": max(bests) if bests else None,
+            "seconds": seconds,
+        }
+    return results
+
+
+BENCHMARKS = {
+    "memory": bench_chromosome_memory,
+    "parallel": bench_parallel_clusters,
+    "islands": bench_island_model,
+    "delta": bench_delta_evaluation,
+    "selection": bench_selection,
+    "adaptive": bench_adaptive,
+    "checkpoint": bench_checkpoint,
+    "weights": bench_weight_sweep,
+    "repair": bench_repair,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(name, BENCHMARKS[name]())
@@ -1,6 +1,48 @@
+import bisect
+import hashlib
+import json
+import math
+import os
 import random
-from typing import Dict, List, Tuple
-import copy
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, islice
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from profiling import PROFILER, profiled
+
+
+class ServerTable(NamedTuple):
+    """
+    Column-oriented view of one cluster's servers, used by the batched evaluator.
+    Row i of every array describes the server whose id is ids[i].
+    """
+    ids:        Tuple[str, ...]
+    index:      Dict[str, int]
+    cpu:        np.ndarray
+    ram:        np.ndarray
+    bandwidth:  np.ndarray
+    throughput: np.ndarray
+    failed:     np.ndarray   # bool mask, True where status == 'failed'
+    active:     np.ndarray   # bool mask, True where status == 'active'
+    by_cpu:     np.ndarray   # indices of active servers, sorted by CPU (asc)
+    sorted_cpu: np.ndarray   # cpu[by_cpu], for searchsorted eligibility lookups
+
+
+class TaskTable(NamedTuple):
+    """
+    Shared, read-only task table for one cluster (compact chromosome format).
+    A compact chromosome is an integer array where gene i holds the ServerTable
+    index of the server running task i (-1 = unassigned).
+    """
+    device_id:   Tuple[str, ...]
+    task:        Tuple[str, ...]
+    complexity:  np.ndarray   # read-only
+    orig_server: Tuple[str, ...]
+
 
 def extract_state(cloud_clusters: Dict[str, List[Dict]]
 ) -> Tuple[Dict[str, List[Dict]], Dict[str, List[Dict]]]:
@@ -53,17 +95,152 @@ def check_server_health(servers: List[Dict], failure_prob: float = 0.5) -> List[
             server['status'] = 'active'
     return servers
 
+def apply_server_status(servers: List[Dict], status_by_id: Dict[str, str]) -> List[Dict]:
+    """
+    Mark servers with statuses observed elsewhere (e.g. failure_detector)
+    instead of check_server_health's coin flips. Servers missing from
+    status_by_id keep their status; failed ones get cpu 0 as above.
+    """
+    for server in servers:
+        status = status_by_id.get(server['server_id'], server.get('status', 'active'))
+        server['status'] = status
+        if status == 'failed':
+            server['cpu'] = 0
+    return servers
+
+def build_server_table(servers: List[Dict]) -> ServerTable:
+    """
+    Turn a cluster's server list into a ServerTable (one array per attribute).
+    Build it once per cluster/generation and reuse it for every evaluation.
+    Server order is kept, so tables built from extract_state snapshots and from
+    ORIGINAL_CLUSTERS share the same indices.
+    """
+    ids = tuple(srv["server_id"] for srv in servers)
+    cpu = np.asarray([srv["cpu"] for srv in servers])
+    active = np.asarray([srv.get("status", "active") == "active" for srv in servers], dtype=bool)
+    active_idx = np.flatnonzero(active)
+    by_cpu = active_idx[np.argsort(cpu[active_idx], kind="stable")]
+    return ServerTable(
+        ids=ids,
+        index={sid: i for i, sid in enumerate(ids)},
+        cpu=cpu,
+        ram=np.asarray([srv["ram"] for srv in servers]),
+        bandwidth=np.asarray([srv["bandwidth"] for srv in servers]),
+        throughput=np.asarray([srv.get("throughput", 0) for srv in servers]),
+        failed=np.asarray([srv.get("status", "active") == "failed" for srv in servers], dtype=bool),
+        active=active,
+        by_cpu=by_cpu,
+        sorted_cpu=cpu[by_cpu],
+    )
+
+def build_task_table(tasks: List[Dict]) -> TaskTable:
+    """
+    Build the shared task table for one cluster from extract_state's task list.
+    """
+    complexity = np.asarray([t["complexity"] for t in tasks])
+    complexity.flags.writeable = False
+    return TaskTable(
+        device_id=tuple(t["device_id"] for t in tasks),
+        task=tuple(t["task"] for t in tasks),
+        complexity=complexity,
+        orig_server=tuple(t.get("orig_server") for t in tasks),
+    )
+
+def _index_dtype(n_servers: int) -> np.dtype:
+    return np.dtype(np.int16) if n_servers < np.iinfo(np.int16).max else np.dtype(np.int32)
+
+def _np_rng(rng: Optional[np.random.Generator] = None) -> np.random.Generator:
+    # Seeded from the `random` module so random.seed() still reproduces a run
+    return rng if rng is not None else np.random.default_rng(random.getrandbits(64))
+
+def random_eligible(
+    complexity: np.ndarray,
+    table: ServerTable,
+    rng: np.random.Generator,
+    fallback_to_any: bool = True
+) -> np.ndarray:
+    """
+    For every task pick a random active server whose CPU >= complexity.
+    Active servers are pre-sorted by CPU, so the eligible set of each task is a
+    suffix of table.by_cpu, found with one searchsorted.
+    If none fit: any active server (fallback_to_any) or -1.
+    """
+    n_active = len(table.by_cpu)
+    if n_active == 0:
+        return np.full(len(complexity), -1, dtype=_index_dtype(len(table.ids)))
+    start = np.searchsorted(table.sorted_cpu, complexity, side="left")
+    n_eligible = n_active - start
+    none_fit = n_eligible == 0
+    if fallback_to_any:
+        start = np.where(none_fit, 0, start)
+        n_eligible = np.where(none_fit, n_active, n_eligible)
+    pick = start + (rng.random(len(complexity)) * np.maximum(n_eligible, 1)).astype(np.intp)
+    chosen = table.by_cpu[np.minimum(pick, n_active - 1)]
+    if not fallback_to_any:
+        chosen = np.where(none_fit, -1, chosen)
+    return chosen.astype(_index_dtype(len(table.ids)))
+
+def encode_chromosome(chromosome: List[Dict], tasks: TaskTable, servers: ServerTable) -> np.ndarray:
+    """
+    Dict-list chromosome -> compact server-index array (genes in task order).
+    An empty chromosome (no active servers) encodes to all -1.
+    """
+    n = len(tasks.complexity)
+    if not chromosome:
+        return np.full(n, -1, dtype=_index_dtype(len(servers.ids)))
+    if len(chromosome) != n:
+        raise ValueError(f"chromosome has {len(chromosome)} genes, task table has {n}")
+    return np.asarray(
+        [servers.index[gene["server_id"]] for gene in chromosome],
+        dtype=_index_dtype(len(servers.ids)),
+    )
+
+def decode_chromosome(chromosome: np.ndarray, tasks: TaskTable, servers: ServerTable) -> List[Dict]:
+    """
+    Compact chromosome -> dict-list form used by cloud_dashboard.py.
+    Unassigned genes (-1) are dropped, as generate_chromosome does.
+    """
+    complexity = tasks.complexity.tolist()
+    return [
+        {
+            "device_id":  tasks.device_id[i],
+            "task":       tasks.task[i],
+            "complexity": complexity[i],
+            "server_id":  servers.ids[srv],
+        }
+        for i, srv in enumerate(chromosome.tolist())
+        if srv >= 0
+    ]
+
+def encode_population(population: List[List[Dict]], tasks: TaskTable, servers: ServerTable) -> List[np.ndarray]:
+    return [encode_chromosome(chrom, tasks, servers) for chrom in population]
+
+def decode_population(population: List[np.ndarray], tasks: TaskTable, servers: ServerTable) -> List[List[Dict]]:
+    return [decode_chromosome(chrom, tasks, servers) for chrom in population]
+
 def generate_chromosome(
-    tasks: List[Dict],
-    servers: List[Dict],
-    use_orig: bool = False
-) -> List[Dict]:
+    tasks: Union[List[Dict], TaskTable],
+    servers: Union[List[Dict], ServerTable],
+    use_orig: bool = False,
+    rng: Optional[np.random.Generator] = None
+) -> Union[List[Dict], np.ndarray]:
     """
     Build one chromosome:
       - if use_orig=True, replicate Step 2 assignment (baseline)
       - else, randomly assign each task to any server whose CPU >= task.complexity
       - Now avoids failed servers
+    Given a TaskTable, returns a compact server-index array instead of dicts.
     """
+    if isinstance(tasks, TaskTable):
+        table = servers if isinstance(servers, ServerTable) else build_server_table(servers)
+        chromosome = random_eligible(tasks.complexity, table, _np_rng(rng))
+        if use_orig:
+            orig = np.asarray([table.index.get(sid, -1) for sid in tasks.orig_server], dtype=np.intp)
+            keep = orig >= 0
+            keep[keep] = table.active[orig[keep]]
+            chromosome[keep] = orig[keep]
+        return chromosome
+
     chromosome = []
     active_servers = [s for s in servers if s.get('status', 'active') == 'active']
     
@@ -94,14 +271,18 @@ def generate_chromosome(
             })
     return chromosome
 
+@profiled()
 def generate_initial_population(
     cloud_clusters: Dict[str, List[Dict]],
-    population_size: int = 10
+    population_size: int = 10,
+    server_status: Optional[Dict[str, str]] = None
 ) -> Dict[str, List[List[Dict]]]:
     """
     For each cluster Ci, produce a population:
       1) First chromosome = exact Step 2 assignment (baseline)
       2) Next (population_size-1) chromosomes = random variations
+    server_status: {server_id: status} from the failure detector; without it
+    failures are simulated by check_server_health.
     """
     tasks_map, servers_map = extract_state(cloud_clusters)
     populations: Dict[str, List[List[Dict]]] = {}
@@ -109,7 +290,10 @@ def generate_initial_population(
     for cname in cloud_clusters:
         tasks   = tasks_map[cname]
         servers = servers_map[cname]
-        servers = check_server_health(servers)  # Check for failures
+        if server_status is None:
+            servers = check_server_health(servers)  # Check for failures
+        else:
+            servers = apply_server_status(servers, server_status)
 
         # 1) Baseline
         pop = [generate_chromosome(tasks, servers, use_orig=True)]
@@ -122,6 +306,75 @@ def generate_initial_population(
 
     return populations
 
+@profiled()
+def generate_initial_population_compact(
+    cloud_clusters: Dict[str, List[Dict]],
+    population_size: int = 10,
+    rng: Optional[np.random.Generator] = None,
+    server_status: Optional[Dict[str, str]] = None,
+    seeding: Tuple[str, ...] = (),
+    repair: bool = False
+) -> Tuple[Dict[str, List[np.ndarray]], Dict[str, TaskTable]]:
+    """
+    generate_initial_population in the compact format.
+    Returns (populations, task_tables); evaluate against ORIGINAL_CLUSTERS with
+    task_tables, and decode_population() for display.
+      - seeding: SEEDING_HEURISTICS names; one chromosome each follows the baseline
+      - repair: run repair_chromosome on every chromosome
+    Seeding and repair pack against each server's full CPU (remaining CPU plus
+    its Step 2 tasks), not the remaining CPU used for random eligibility; with
+    server_status that is repair_table(ORIGINAL_CLUSTERS[c], server_status),
+    which the GA drivers repair against.
+    """
+    for name in seeding:
+        if name not in SEEDING_HEURISTICS:
+            raise ValueError(f"seeding must be among {tuple(SEEDING_HEURISTICS)}, got {name!r}")
+    tasks_map, servers_map = extract_state(cloud_clusters)
+    rng = _np_rng(rng)
+    populations: Dict[str, List[np.ndarray]] = {}
+    task_tables: Dict[str, TaskTable] = {}
+
+    for cname in cloud_clusters:
+        tasks   = build_task_table(tasks_map[cname])
+        if server_status is None:
+            servers = build_server_table(check_server_health(servers_map[cname]))  # Check for failures
+        else:
+            servers = build_server_table(apply_server_status(servers_map[cname], server_status))
+
+        pop = [generate_chromosome(tasks, servers, use_orig=True, rng=rng)]
+        if seeding or repair:
+            capacity = _capacity_table(servers, tasks)
+            pop.extend(SEEDING_HEURISTICS[name](tasks, capacity) for name in seeding)
+        while len(pop) < population_size:
+            pop.append(generate_chromosome(tasks, servers, use_orig=False, rng=rng))
+        if repair:
+            pop = [repair_chromosome(chrom, capacity, tasks) for chrom in pop]
+
+        populations[cname] = pop[:population_size]
+        task_tables[cname] = tasks
+
+    return populations, task_tables
+
+def _capacity_table(servers: ServerTable, tasks: TaskTable) -> ServerTable:
+    """extract_state's server table with each server's Step 2 load added back to its CPU."""
+    orig = np.asarray([servers.index.get(sid, -1) for sid in tasks.orig_server], dtype=np.intp)
+    placed = orig >= 0
+    load = np.bincount(orig[placed], weights=tasks.complexity[placed], minlength=len(servers.ids))
+    cpu = servers.cpu + load.astype(servers.cpu.dtype)
+    active_idx = np.flatnonzero(servers.active)
+    by_cpu = active_idx[np.argsort(cpu[active_idx], kind="stable")]
+    return servers._replace(cpu=cpu, by_cpu=by_cpu, sorted_cpu=cpu[by_cpu])
+
+def repair_table(servers: List[Dict], server_status: Optional[Dict[str, str]] = None) -> ServerTable:
+    """
+    The table repair_chromosome packs against during the GA: the servers'
+    full CPU (ORIGINAL_CLUSTERS) with server_status applied. Same active
+    servers and capacities as generate_initial_population_compact's repair.
+    The server dicts are not modified.
+    """
+    servers = [dict(srv) for srv in servers]
+    return build_server_table(apply_server_status(servers, server_status) if server_status else servers)
+
 def evaluate_chromosome(
     chromosome: List[Dict],
     servers: List[Dict],
@@ -135,18 +388,18 @@ def evaluate_chromosome(
     """
     # Track failed assignments
     failed_assignments = 0
-    
+    status_by_srv = {srv["server_id"]: srv.get('status', 'active') for srv in servers}
+
     # group tasks by server
     tasks_by_srv = {srv["server_id"]: [] for srv in servers}
     for gene in chromosome:
         tasks_by_srv[gene["server_id"]].append(gene)
         # Check if assigned to failed server
-        server = next((s for s in servers if s["server_id"] == gene["server_id"]), None)
-        if server and server.get('status', 'active') == 'failed':
+        if status_by_srv[gene["server_id"]] == 'failed':
             failed_assignments += 1
 
     best_fs = -float("inf")
-    for srv in copy.deepcopy(servers):  # prevent mutation bleed-over
+    for srv in servers:  # read-only, no copy needed
         if srv.get('status', 'active') == 'failed':
             continue  # skip failed servers
             
@@ -170,19 +423,347 @@ def evaluate_chromosome(
         
     return best_fs
 
+def _flatten_assignments(
+    chromosomes: List[List[Dict]],
+    table: ServerTable,
+    tasks: Optional[TaskTable] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flatten a population into three parallel gene arrays:
+    (chromosome row, server index, task complexity).
+    """
+    if tasks is not None:
+        # compact format: a (population x tasks) index matrix, -1 = unassigned
+        assign = np.stack(chromosomes).astype(np.intp)
+        valid = assign >= 0
+        rows = np.broadcast_to(np.arange(len(chromosomes))[:, None], assign.shape)
+        complexity = np.broadcast_to(tasks.complexity.astype(np.float64), assign.shape)
+        return rows[valid], assign[valid], complexity[valid]
+
+    index = table.index
+    rows, srv_idx, complexity = [], [], []
+    for row, chrom in enumerate(chromosomes):
+        for gene in chrom:
+            rows.append(row)
+            srv_idx.append(index[gene["server_id"]])   # KeyError on unknown server, like evaluate_chromosome
+            complexity.append(gene["complexity"])
+    return (
+        np.asarray(rows, dtype=np.intp),
+        np.asarray(srv_idx, dtype=np.intp),
+        np.asarray(complexity, dtype=np.float64),
+    )
+
+class FitnessCache:
+    """
+    Opt-in, size-bounded LRU cache of chromosome fitness.
+    Keys combine a digest of the assignment with the weights, the failure
+    penalty and server_state_version(), so a status change made by
+    check_server_health (or any other server change) simply misses and the
+    stale entries age out.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple) -> Optional[float]:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Tuple, value: float) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+def _digest(*chunks: bytes) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        h.update(chunk)
+    return h.digest()
+
+def server_state_version(servers: Union[List[Dict], ServerTable]) -> bytes:
+    """
+    Digest of everything the fitness reads from the servers (ids, capacities,
+    status). Changes whenever check_server_health flips a status.
+    """
+    table = servers if isinstance(servers, ServerTable) else build_server_table(servers)
+    return _digest(
+        "\x1f".join(table.ids).encode(),
+        *(np.ascontiguousarray(col, dtype=np.float64).tobytes()
+          for col in (table.cpu, table.ram, table.bandwidth, table.throughput)),
+        table.failed.tobytes(),
+    )
+
+def _assignment_key(chromosome, tasks: Optional[TaskTable] = None) -> bytes:
+    if tasks is not None:
+        return _digest(np.asarray(chromosome, dtype=np.int32).tobytes())
+    return _digest(repr([(g["server_id"], g["complexity"]) for g in chromosome]).encode())
+
+def _evaluate_cached(
+    chromosomes: List,
+    table: ServerTable,
+    weights: Dict[str, float],
+    failure_penalty: float,
+    tasks: Optional[TaskTable],
+    cache: FitnessCache
+) -> np.ndarray:
+    context = (
+        tuple(sorted(weights.items())),
+        failure_penalty,
+        server_state_version(table),
+        _digest(tasks.complexity.tobytes()) if tasks is not None else None,
+    )
+    scores = np.empty(len(chromosomes), dtype=np.float64)
+    pending: Dict[Tuple, List[int]] = {}   # key -> positions; duplicates are scored once
+    for i, chrom in enumerate(chromosomes):
+        key = (context, _assignment_key(chrom, tasks))
+        if key in pending:
+            pending[key].append(i)
+            cache.hits += 1
+            continue
+        cached = cache.get(key)
+        if cached is None:
+            pending[key] = [i]
+        else:
+            scores[i] = cached
+    PROFILER.count("cache_hits", len(chromosomes) - len(pending))
+    PROFILER.count("cache_misses", len(pending))
+
+    if pending:
+        keys = list(pending)
+        # the undecorated function, so the phase timer does not count this call twice
+        fresh = evaluate_population_batch.__wrapped__(
+            [chromosomes[pending[key][0]] for key in keys], table, weights, failure_penalty, tasks
+        )
+        for key, value in zip(keys, fresh.tolist()):
+            scores[pending[key]] = value
+            cache.put(key, value)
+    return scores
+
+def _server_usage(
+    chromosomes: List,
+    table: ServerTable,
+    tasks: Optional[TaskTable] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (used CPU per (chromosome, server) matrix, genes on failed servers per chromosome),
+    each a single bincount over the flattened genes.
+    """
+    pop, n_srv = len(chromosomes), len(table.ids)
+    rows, srv_idx, complexity = _flatten_assignments(chromosomes, table, tasks)
+    used_cpu = np.bincount(
+        rows * n_srv + srv_idx, weights=complexity, minlength=pop * n_srv
+    ).reshape(pop, n_srv)
+    failed_assignments = np.bincount(rows[table.failed[srv_idx]], minlength=pop)
+    return used_cpu, failed_assignments
+
+@profiled()
+def evaluate_population_batch(
+    chromosomes: List[List[Dict]],
+    servers: Union[List[Dict], ServerTable],
+    weights: Dict[str, float],
+    failure_penalty: float = -1000,
+    tasks: Optional[TaskTable] = None,
+    cache: Optional[FitnessCache] = None
+) -> np.ndarray:
+    """
+    Score a whole population at once; returns one fitness per chromosome.
+    Pass the cluster's TaskTable when the population is in compact format,
+    and a FitnessCache to skip chromosomes that were already scored.
+    Gives exactly the same numbers as evaluate_chromosome:
+      - used CPU per (chromosome, server) is a single bincount over the genes
+      - Fs is computed for every server as a (population x servers) matrix
+      - best_fs is the row max over active servers, plus the failure penalty
+    """
+    table = servers if isinstance(servers, ServerTable) else build_server_table(servers)
+    pop = len(chromosomes)
+    n_srv = len(table.ids)
+    if pop == 0:
+        return np.empty(0, dtype=np.float64)
+    if cache is not None:
+        return _evaluate_cached(chromosomes, table, weights, failure_penalty, tasks, cache)
+
+    PROFILER.count("evaluations", pop)
+
+    # 1) used CPU per (chromosome, server)
+    used_cpu, failed_assignments = _server_usage(chromosomes, table, tasks)
+
+    # 2) Fs matrix, same term order as evaluate_chromosome
+    CA = np.maximum(0, table.cpu - used_cpu)
+    fs = (
+        weights["cpu"]        * CA +
+        weights["ram"]        * table.ram +
+        weights["bandwidth"]  * table.bandwidth +
+        weights["throughput"] * table.throughput
+    )
+    fs[:, table.failed] = -np.inf
+    best_fs = fs.max(axis=1) if n_srv else np.full(pop, -np.inf)
+
+    # 3) failure penalty: genes placed on failed servers
+    penalised = failed_assignments > 0
+    best_fs[penalised] += failed_assignments[penalised] * failure_penalty
+
+    return best_fs
+
+@profiled()
 def evaluate_population(
     populations: Dict[str, List[List[Dict]]],
     ORIGINAL_CLUSTERS: Dict[str, List[Dict]],  # <-- use original
-    weights: Dict[str, float]
+    weights: Dict[str, float],
+    task_tables: Optional[Dict[str, TaskTable]] = None,  # set for compact populations
+    cache: Optional[FitnessCache] = None
 ) -> Dict[str, List[float]]:
     fitness_map: Dict[str, List[float]] = {}
     for cname, chroms in populations.items():
-        fitness_map[cname] = [
-            evaluate_chromosome(chrom, ORIGINAL_CLUSTERS[cname], weights)
-            for chrom in chroms
-        ]
+        fitness_map[cname] = evaluate_population_batch(
+            chroms, ORIGINAL_CLUSTERS[cname], weights,
+            tasks=task_tables[cname] if task_tables else None,
+            cache=cache
+        ).tolist()
     return fitness_map
 
+WEIGHT_KEYS = ("cpu", "ram", "bandwidth", "throughput")
+
+def weight_matrix(weight_vectors: List[Dict[str, float]]) -> np.ndarray:
+    """Stack weight dicts into a (K x 4) matrix, columns in WEIGHT_KEYS order."""
+    return np.asarray([[w[key] for key in WEIGHT_KEYS] for w in weight_vectors], dtype=np.float64)
+
+def weight_grid(step: float = 0.1) -> np.ndarray:
+    """
+    Every weighting on the simplex (non-negative, summing to 1) with the given
+    step: 286 vectors for step=0.1, 1771 for 0.05. step must be 1/n for a whole n.
+    """
+    n = round(1 / step)
+    if n < 1 or not np.isclose(n * step, 1):
+        raise ValueError(f"step must be 1/n for a whole number n, got {step!r}")
+    return np.asarray(
+        [(a * step, b * step, c * step, (n - a - b - c) * step)
+         for a in range(n + 1) for b in range(n + 1 - a) for c in range(n + 1 - a - b)],
+        dtype=np.float64,
+    )
+
+def evaluate_weight_sweep(
+    chromosomes: List,
+    servers: Union[List[Dict], ServerTable],
+    weight_vectors: Union[np.ndarray, List[Dict[str, float]]],
+    failure_penalty: float = -1000,
+    tasks: Optional[TaskTable] = None,
+    block_bytes: int = 64 << 20,
+    usage: Optional[Tuple[np.ndarray, np.ndarray]] = None
+) -> np.ndarray:
+    """
+    evaluate_population_batch for K weightings at once; returns a
+    (population x K) fitness matrix. Used CPU is computed once; the Fs of every
+    (chromosome, server) for all K weightings is one (P*S x 4) @ (4 x K)
+    matrix multiply, done in blocks of chromosomes of at most block_bytes.
+    Matches evaluate_population_batch up to float rounding (term order differs).
+    usage: the population's _server_usage, if the caller already has it.
+    """
+    table = servers if isinstance(servers, ServerTable) else build_server_table(servers)
+    W = weight_vectors if isinstance(weight_vectors, np.ndarray) else weight_matrix(weight_vectors)
+    pop, n_srv, k = len(chromosomes), len(table.ids), len(W)
+    scores = np.full((pop, k), -np.inf)
+    if pop == 0 or n_srv == 0:
+        return scores
+    PROFILER.count("evaluations", pop * k)
+
+    used_cpu, failed_assignments = usage if usage is not None else _server_usage(chromosomes, table, tasks)
+    static = np.stack([table.ram, table.bandwidth, table.throughput], axis=-1).astype(np.float64)
+    block = max(1, block_bytes // (8 * n_srv * k))
+    for start in range(0, pop, block):
+        stop = min(start + block, pop)
+        attrs = np.empty((stop - start, n_srv, 4))
+        attrs[:, :, 0] = np.maximum(0, table.cpu - used_cpu[start:stop])
+        attrs[:, :, 1:] = static
+        fs = (attrs.reshape(-1, 4) @ W.T).reshape(stop - start, n_srv, k)
+        fs[:, table.failed, :] = -np.inf
+        scores[start:stop] = fs.max(axis=1)
+
+    penalised = failed_assignments > 0
+    scores[penalised] += (failed_assignments[penalised] * failure_penalty)[:, None]
+    return scores
+
+def _pareto_front(maximise: np.ndarray, minimise: np.ndarray) -> np.ndarray:
+    """Indices not dominated on (maximise higher, minimise lower), best first."""
+    order = np.lexsort((minimise, -maximise))
+    front, best_low = [], np.inf
+    for i in order:
+        if minimise[i] < best_low:
+            front.append(i)
+            best_low = minimise[i]
+    return np.asarray(front, dtype=np.intp)
+
+def sweep_weights(
+    population: List,
+    servers: Union[List[Dict], ServerTable],
+    weight_vectors: Union[np.ndarray, List[Dict[str, float]]],
+    failure_penalty: float = -1000,
+    tasks: Optional[TaskTable] = None
+) -> Dict:
+    """
+    Score a population under many Fs weightings (see evaluate_weight_sweep) and
+    summarise each one:
+      - best_index / best_fitness / best_chromosome
+      - front: the chromosomes that are Pareto-optimal on (fitness under this
+        weighting, peak server utilisation), i.e. the fitness vs. balance
+        trade-off, with their fitness and utilisation
+    Returns {weights (K x 4), scores (P x K), utilisation (P), results [K dicts]}.
+    """
+    table = servers if isinstance(servers, ServerTable) else build_server_table(servers)
+    W = weight_vectors if isinstance(weight_vectors, np.ndarray) else weight_matrix(weight_vectors)
+    usage = _server_usage(population, table, tasks)
+    scores = evaluate_weight_sweep(population, table, W, failure_penalty, tasks, usage=usage)
+
+    used_cpu = usage[0]
+    capacity = np.where(table.active & (table.cpu > 0), table.cpu, np.inf)
+    utilisation = (used_cpu / capacity).max(axis=1) if len(table.ids) else np.zeros(len(population))
+
+    results = []
+    for k in range(len(W)):
+        column = scores[:, k]
+        best = int(np.argmax(column))
+        front = _pareto_front(column, utilisation)
+        results.append({
+            "weights": dict(zip(WEIGHT_KEYS, W[k].tolist())),
+            "best_index": best,
+            "best_fitness": float(column[best]),
+            "best_chromosome": population[best],
+            "front": front.tolist(),
+            "front_fitness": column[front].tolist(),
+            "front_utilisation": utilisation[front].tolist(),
+        })
+    return {"weights": W, "scores": scores, "utilisation": utilisation, "results": results}
+
+@profiled()
 def roulette_selection(population: List[List[Dict]], fitness_scores: List[float], num_parents: int = 2) -> List[List[Dict]]:
     total_fitness = sum(fitness_scores)
     if total_fitness == 0:
@@ -193,19 +774,133 @@ def roulette_selection(population: List[List[Dict]], fitness_scores: List[float]
     selected = random.choices(population, weights=selection_probs, k=num_parents)
     return selected
 
+SELECTION_OPERATORS = ("roulette", "rank", "tournament")
+
+class Selector:
+    """
+    Parent sampling for one generation, built once from its fitness scores
+    instead of once per child.
+      - roulette: fitness-proportional; if any score is negative (the failure
+        penalty) all scores are shifted by the minimum so weights stay >= 0.
+        Non-finite scores (-inf when every server is failed, NaN) get weight 0;
+        if any score is +inf, only the +inf ones are drawn
+      - rank: linear ranking, worst gets weight 1 and best n; ignores scale and sign
+      - tournament: best of tournament_size uniform picks; ignores scale and sign
+    roulette and rank bisect a cumulative weight list (O(log n) per parent),
+    tournament costs O(tournament_size).
+    """
+
+    def __init__(self, fitness_scores: List[float], method: str = "roulette", tournament_size: int = 2):
+        if method not in SELECTION_OPERATORS:
+            raise ValueError(f"selection must be one of {SELECTION_OPERATORS}, got {method!r}")
+        self.method = method
+        self.fitness = fitness_scores
+        self.n = len(fitness_scores)
+        self.tournament_size = tournament_size
+        self.cumulative: Optional[List[float]] = None
+        if method == "roulette":
+            if any(f == math.inf for f in fitness_scores):
+                weights = [float(f == math.inf) for f in fitness_scores]
+            else:
+                low = min((f for f in fitness_scores if math.isfinite(f)), default=0.0)
+                shift = low if low < 0 else 0.0
+                weights = [f - shift if math.isfinite(f) else 0.0 for f in fitness_scores]
+            if sum(weights) > 0:
+                self.cumulative = list(accumulate(weights))
+            # all weights 0: sample uniformly
+        elif method == "rank":
+            order = sorted(range(self.n), key=fitness_scores.__getitem__)
+            weights = [0] * self.n
+            for r, idx in enumerate(order, start=1):
+                weights[idx] = r
+            self.cumulative = list(accumulate(weights))
+
+    def sample(self) -> int:
+        """Index of one selected parent."""
+        if self.method == "tournament":
+            contenders = [random.randrange(self.n) for _ in range(self.tournament_size)]
+            return max(contenders, key=self.fitness.__getitem__)
+        if self.cumulative is None:
+            return random.randrange(self.n)
+        # hi: random() * total can round up to total itself
+        return bisect.bisect_right(self.cumulative, random.random() * self.cumulative[-1], 0, self.n - 1)
+
+    @profiled("selection")
+    def parents(self, population: List, max_attempts: int = 10) -> Tuple:
+        """
+        Two parents, re-drawing the second (up to max_attempts times) while it
+        is the same chromosome as the first.
+        """
+        i = self.sample()
+        j = self.sample()
+        for _ in range(max_attempts - 1):
+            if j != i and not _same_chromosome(population[i], population[j]):
+                break
+            j = self.sample()
+        return population[i], population[j]
+
+def _crossover_points(size: int) -> Tuple[int, int]:
+    pt1 = random.randint(0, size - 2)
+    pt2 = random.randint(pt1 + 1, size - 1)
+    return pt1, pt2
+
+@profiled()
 def two_point_crossover(parent1: List[Dict], parent2: List[Dict]) -> List[Dict]:
     size = len(parent1)
     if size < 2:
         return parent1.copy()
 
-    pt1 = random.randint(0, size - 2)
-    pt2 = random.randint(pt1 + 1, size - 1)
+    pt1, pt2 = _crossover_points(size)
+
+    if isinstance(parent1, np.ndarray):
+        return np.concatenate((parent1[:pt1], parent2[pt1:pt2], parent1[pt2:]))
 
     child = parent1[:pt1] + parent2[pt1:pt2] + parent1[pt2:]
 
     return child
 
-def mutate_chromosome(chromosome: List[Dict], servers: List[Dict], mutation_rate: float = 0.20) -> List[Dict]:
+def _mutation_moves(
+    chromosome: np.ndarray,
+    servers: ServerTable,
+    tasks: TaskTable,
+    mutation_rate: float,
+    rng: np.random.Generator
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pick the genes to mutate and their new servers: (gene positions, server indices).
+    Genes with no eligible server are left out (kept as is).
+    """
+    genes = np.flatnonzero(rng.random(len(chromosome)) < mutation_rate)
+    if not len(genes):
+        return genes, genes
+    moved = random_eligible(tasks.complexity[genes], servers, rng, fallback_to_any=False)
+    ok = moved >= 0
+    return genes[ok], moved[ok]
+
+def _mutate_compact(
+    chromosome: np.ndarray,
+    servers: ServerTable,
+    tasks: TaskTable,
+    mutation_rate: float,
+    rng: Optional[np.random.Generator] = None
+) -> np.ndarray:
+    genes, moved = _mutation_moves(chromosome, servers, tasks, mutation_rate, _np_rng(rng))
+    new_chrom = chromosome.copy()
+    new_chrom[genes] = moved
+    return new_chrom
+
+@profiled()
+def mutate_chromosome(
+    chromosome: List[Dict],
+    servers: List[Dict],
+    mutation_rate: float = 0.20,
+    tasks: Optional[TaskTable] = None,
+    rng: Optional[np.random.Generator] = None
+) -> List[Dict]:
+    if tasks is not None:
+        table = servers if isinstance(servers, ServerTable) else build_server_table(servers)
+        return _mutate_compact(chromosome, table, tasks, mutation_rate, rng)
+
     new_chrom = []
     active_servers = [s for s in servers if s.get('status', 'active') == 'active']
     
@@ -224,13 +919,297 @@ def mutate_chromosome(chromosome: List[Dict], servers: List[Dict], mutation_rate
             new_chrom.append(gene)
     return new_chrom
 
+class _SpareIndex:
+    """
+    Active servers kept sorted by spare CPU (a bisect list of (spare, index)).
+    Best-fit and most-spare lookups are O(log servers); take() is O(servers),
+    as it deletes from and inserts into the list.
+    """
+
+    def __init__(self, servers: ServerTable, used: np.ndarray):
+        self.spare = (servers.cpu - used).tolist()
+        self.order = sorted((self.spare[i], i) for i in np.flatnonzero(servers.active).tolist())
+
+    def best_fit(self, complexity: int) -> Optional[int]:
+        """Active server with the least spare CPU that still fits complexity, or None."""
+        k = bisect.bisect_left(self.order, (complexity, -1))
+        return self.order[k][1] if k < len(self.order) else None
+
+    def most_spare(self) -> Optional[int]:
+        return self.order[-1][1] if self.order else None
+
+    def take(self, i: int, complexity: int) -> None:
+        spare = self.spare[i]
+        del self.order[bisect.bisect_left(self.order, (spare, i))]
+        self.spare[i] = spare - complexity
+        bisect.insort(self.order, (spare - complexity, i))
+
+def repair_chromosome(chromosome: np.ndarray, servers: ServerTable, tasks: TaskTable) -> np.ndarray:
+    """
+    Capacity repair for a compact chromosome: genes on inactive servers (or
+    unassigned) and, on every server whose summed complexity exceeds its CPU,
+    its largest tasks until the rest fits, are moved -- largest first -- to the
+    best-fitting active server with enough spare CPU (_SpareIndex).
+    A task that fits nowhere stays put (or goes to the server with most spare
+    CPU if its own is inactive). O(n log n + moved x servers) for n tasks;
+    returns the chromosome itself when nothing overflows.
+    """
+    complexity = tasks.complexity
+    n_srv = len(servers.ids)
+    misplaced = (chromosome < 0) | ~servers.active[np.maximum(chromosome, 0)]
+    kept = np.flatnonzero(~misplaced)
+    on = chromosome[kept]
+    used = np.bincount(on, weights=complexity[kept], minlength=n_srv)
+    over = used > servers.cpu
+    if not misplaced.any() and not over.any():
+        return chromosome
+
+    # per overloaded server, largest tasks first: a task leaves while the load
+    # before it (server load minus the larger tasks already leaving) overflows
+    candidates = kept[over[on]]
+    if len(candidates):
+        order = np.lexsort((-complexity[candidates], chromosome[candidates]))
+        candidates = candidates[order]
+        srv = chromosome[candidates].astype(np.intp)
+        size = complexity[candidates]
+        prior = np.cumsum(size) - size
+        starts = np.flatnonzero(np.r_[True, srv[1:] != srv[:-1]])
+        prior -= np.repeat(prior[starts], np.diff(np.r_[starts, len(srv)]))
+        leave = used[srv] - prior > servers.cpu[srv]
+        used -= np.bincount(srv[leave], weights=size[leave], minlength=n_srv)
+        candidates = candidates[leave]
+
+    moving = np.concatenate((np.flatnonzero(misplaced), candidates))
+    moving = moving[np.argsort(-complexity[moving], kind="stable")]
+    index = _SpareIndex(servers, used)
+    repaired = chromosome.copy()
+    for t, c in zip(moving.tolist(), complexity[moving].tolist()):
+        i = index.best_fit(c)
+        if i is None:
+            i = index.most_spare() if misplaced[t] else int(chromosome[t])
+            if i is None:
+                continue   # no active server at all
+        index.take(i, c)
+        repaired[t] = i
+    return repaired
+
+def first_fit_decreasing(tasks: TaskTable, servers: ServerTable) -> np.ndarray:
+    """
+    Seeding heuristic: tasks by decreasing complexity, each on the first active
+    server (table order) with enough spare CPU, else on the one with most spare.
+    """
+    complexity = tasks.complexity
+    chromosome = np.full(len(complexity), -1, dtype=_index_dtype(len(servers.ids)))
+    active = np.flatnonzero(servers.active)
+    if not len(active):
+        return chromosome
+    spare = servers.cpu[active].astype(np.float64)
+    for t in np.argsort(-complexity, kind="stable").tolist():
+        c = complexity[t]
+        fits = spare >= c
+        k = int(np.argmax(fits)) if fits.any() else int(np.argmax(spare))
+        spare[k] -= c
+        chromosome[t] = active[k]
+    return chromosome
+
+def best_fit(tasks: TaskTable, servers: ServerTable) -> np.ndarray:
+    """
+    Seeding heuristic: tasks by decreasing complexity, each on the active server
+    with the least spare CPU that still fits it, else on the one with most spare.
+    """
+    complexity = tasks.complexity
+    chromosome = np.full(len(complexity), -1, dtype=_index_dtype(len(servers.ids)))
+    index = _SpareIndex(servers, np.zeros(len(servers.ids)))
+    for t in np.argsort(-complexity, kind="stable").tolist():
+        c = int(complexity[t])
+        i = index.best_fit(c)
+        if i is None:
+            i = index.most_spare()
+            if i is None:
+                break
+        index.take(i, c)
+        chromosome[t] = i
+    return chromosome
+
+SEEDING_HEURISTICS = {
+    "first_fit_decreasing": first_fit_decreasing,
+    "best_fit": best_fit,
+}
+
+def overloaded_servers(
+    chromosomes: List[np.ndarray],
+    servers: Union[List[Dict], ServerTable],
+    tasks: TaskTable
+) -> np.ndarray:
+    """Per chromosome, the number of servers whose summed task complexity exceeds their CPU."""
+    table = servers if isinstance(servers, ServerTable) else build_server_table(servers)
+    used_cpu, _ = _server_usage(chromosomes, table, tasks)
+    return (used_cpu > table.cpu).sum(axis=1)
+
+class ScoredChromosome(NamedTuple):
+    """
+    Compact chromosome plus the cached pieces of its fitness, so children can be
+    re-scored from a parent by touching only the servers whose genes changed.
+    """
+    genes:    np.ndarray   # server index per task (-1 = unassigned)
+    used_cpu: np.ndarray   # per-server used CPU
+    fs:       np.ndarray   # per-server Fs, -inf for failed servers
+    failed:   int          # genes placed on failed servers
+    fitness:  float
+
+
+class DeltaEvaluator:
+    """
+    Incremental fitness for compact chromosomes of one cluster.
+    score() builds the caches once (full cost); crossover() and mutate() derive a
+    child from a parent's caches in O(changed genes) plus an O(servers) copy/max.
+    Results equal evaluate_population_batch; verify=True re-checks every child
+    against it and raises RuntimeError on any mismatch.
+    """
+
+    def __init__(
+        self,
+        servers: Union[List[Dict], ServerTable],
+        weights: Dict[str, float],
+        tasks: TaskTable,
+        failure_penalty: float = -1000,
+        verify: bool = False
+    ):
+        self.servers = servers if isinstance(servers, ServerTable) else build_server_table(servers)
+        self.weights = weights
+        self.tasks = tasks
+        self.failure_penalty = failure_penalty
+        self.verify = verify
+        self.complexity = tasks.complexity.astype(np.float64)
+        self.checked = 0
+
+    def _server_fs(self, idx: np.ndarray, used_cpu: np.ndarray) -> np.ndarray:
+        srv, w = self.servers, self.weights
+        CA = np.maximum(0, srv.cpu[idx] - used_cpu[idx])
+        fs = (
+            w["cpu"]        * CA +
+            w["ram"]        * srv.ram[idx] +
+            w["bandwidth"]  * srv.bandwidth[idx] +
+            w["throughput"] * srv.throughput[idx]
+        )
+        return np.where(srv.failed[idx], -np.inf, fs)
+
+    def _fitness(self, fs: np.ndarray, failed: int) -> float:
+        best_fs = fs.max() if len(fs) else -np.inf
+        if failed > 0:
+            best_fs += failed * self.failure_penalty
+        return float(best_fs)
+
+    def score(self, genes: np.ndarray) -> ScoredChromosome:
+        """Full evaluation; builds the caches for a compact chromosome."""
+        n_srv = len(self.servers.ids)
+        valid = genes >= 0
+        assigned = genes[valid].astype(np.intp)
+        used_cpu = np.bincount(assigned, weights=self.complexity[valid], minlength=n_srv)
+        fs = self._server_fs(np.arange(n_srv), used_cpu)
+        failed = int(self.servers.failed[assigned].sum())
+        return ScoredChromosome(genes, used_cpu, fs, failed, self._fitness(fs, failed))
+
+    def _rescore(self, parent: ScoredChromosome, positions: np.ndarray, new_srv: np.ndarray) -> ScoredChromosome:
+        """Child = parent with genes[positions] moved to new_srv; updates caches only there."""
+        old_srv = parent.genes[positions].astype(np.intp)
+        new_srv = np.asarray(new_srv, dtype=np.intp)
+        changed = old_srv != new_srv
+        if not changed.any():
+            return parent
+        positions, old_srv, new_srv = positions[changed], old_srv[changed], new_srv[changed]
+
+        genes = parent.genes.copy()
+        genes[positions] = new_srv
+        complexity = self.complexity[positions]
+        left, joined = old_srv >= 0, new_srv >= 0
+        old_srv, old_cpu = old_srv[left], complexity[left]
+        new_srv, new_cpu = new_srv[joined], complexity[joined]
+
+        n_srv = len(self.servers.ids)
+        used_cpu = parent.used_cpu + (
+            np.bincount(new_srv, weights=new_cpu, minlength=n_srv)
+            - np.bincount(old_srv, weights=old_cpu, minlength=n_srv)
+        )
+        touched = np.zeros(n_srv, dtype=bool)
+        touched[old_srv] = True
+        touched[new_srv] = True
+        touched = np.flatnonzero(touched)
+        fs = parent.fs.copy()
+        fs[touched] = self._server_fs(touched, used_cpu)
+        failed_mask = self.servers.failed
+        failed = parent.failed - int(failed_mask[old_srv].sum()) + int(failed_mask[new_srv].sum())
+
+        child = ScoredChromosome(genes, used_cpu, fs, failed, self._fitness(fs, failed))
+        if self.verify:
+            self._check(child)
+        return child
+
+    def _check(self, child: ScoredChromosome) -> None:
+        full = evaluate_population_batch(
+            [child.genes], self.servers, self.weights, self.failure_penalty, tasks=self.tasks
+        )[0]
+        self.checked += 1
+        if not np.isclose(child.fitness, full, rtol=1e-9, atol=1e-6):
+            raise RuntimeError(f"delta fitness {child.fitness} != full evaluation {full}")
+
+    def crossover(self, parent1: ScoredChromosome, parent2: ScoredChromosome) -> ScoredChromosome:
+        """two_point_crossover, re-scored from parent1 over the swapped segment."""
+        size = len(parent1.genes)
+        if size < 2:
+            return parent1
+        pt1, pt2 = _crossover_points(size)
+        segment = np.arange(pt1, pt2)
+        return self._rescore(parent1, segment, parent2.genes[pt1:pt2])
+
+    def mutate(
+        self,
+        chromosome: ScoredChromosome,
+        mutation_rate: float = 0.20,
+        rng: Optional[np.random.Generator] = None
+    ) -> ScoredChromosome:
+        """mutate_chromosome, re-scored over the mutated genes only."""
+        positions, moved = _mutation_moves(chromosome.genes, self.servers, self.tasks, mutation_rate, _np_rng(rng))
+        return self._rescore(chromosome, positions, moved)
+
+def _same_chromosome(a, b) -> bool:
+    if isinstance(a, ScoredChromosome):
+        return a is b or np.array_equal(a.genes, b.genes)
+    if isinstance(a, np.ndarray):
+        return a is b or np.array_equal(a, b)
+    return a == b
+
 def evolve_population(
     population: List[List[Dict]],
     fitness_scores: List[float],
     servers: List[Dict],
-    population_size: int
+    population_size: int,
+    tasks: Optional[TaskTable] = None,
+    rng: Optional[np.random.Generator] = None,
+    evaluator: Optional[DeltaEvaluator] = None,
+    selection: str = "roulette",
+    tournament_size: int = 2,
+    mutation_rate: float = 0.20,
+    repair: bool = False,
+    capacity: Optional[ServerTable] = None
 ) -> List[List[Dict]]:
-    import copy
+    """
+    One GA generation: elitism, selection, two-point crossover, mutation.
+    selection is one of SELECTION_OPERATORS (see Selector); rank and tournament
+    also work when fitness scores are negative.
+    With a TaskTable the population is in compact format (server-index arrays).
+    With a DeltaEvaluator the population holds ScoredChromosomes and children
+    come back already scored (fitness_scores = [c.fitness for c in population]).
+    repair=True runs repair_chromosome on every child (compact format only),
+    against capacity (see repair_table) or else the servers themselves.
+    """
+    if repair and (tasks is None or evaluator is not None):
+        raise ValueError("repair needs compact chromosomes (tasks=TaskTable) and no DeltaEvaluator")
+    if evaluator is not None:
+        rng = _np_rng(rng)
+    elif tasks is not None:
+        servers = servers if isinstance(servers, ServerTable) else build_server_table(servers)
+        rng = _np_rng(rng)
     new_generation = []
 
     # Step 1: Elitism — Retain best chromosome
@@ -238,24 +1217,633 @@ def evolve_population(
     new_generation.append(population[best_idx])
 
     # Step 2: Create the rest of the new generation
+    selector = Selector(fitness_scores, selection, tournament_size)
     while len(new_generation) < population_size:
         # Ensure parents are distinct
-        attempts = 0
-        max_attempts = 10
-        while True:
-            parent1, parent2 = roulette_selection(population, fitness_scores, num_parents=2)
-            if parent1 != parent2:
-                break
-            attempts += 1
-            if attempts >= max_attempts:
-                break
+        parent1, parent2 = selector.parents(population)
+
+        if evaluator is not None:
+            # Steps 3-4 with incremental re-scoring
+            mutated_child = evaluator.mutate(evaluator.crossover(parent1, parent2), mutation_rate, rng=rng)
+            new_generation.append(mutated_child)
+            continue
 
         # Step 3: Crossover
         child = two_point_crossover(parent1, parent2)
 
         # Step 4: Mutation
-        mutated_child = mutate_chromosome(child, copy.deepcopy(servers))  # safe copy
+        # (mutate_chromosome only reads servers, so no defensive copy is needed)
+        mutated_child = mutate_chromosome(child, servers, mutation_rate, tasks=tasks, rng=rng)
+        if repair:
+            mutated_child = repair_chromosome(mutated_child, servers if capacity is None else capacity, tasks)
 
         new_generation.append(mutated_child)
 
-    return new_generation
\ No newline at end of file
+    return new_generation
+
+def generation_loop(
+    population: List,
+    fitness_scores: List[float],
+    servers: List[Dict],
+    weights: Dict[str, float],
+    population_size: int,
+    tasks: Optional[TaskTable] = None,
+    rng: Optional[np.random.Generator] = None,
+    cache: Optional[FitnessCache] = None,
+    selection: str = "roulette",
+    repair: bool = False,
+    capacity: Optional[ServerTable] = None
+) -> Iterator[Tuple[List, List[float]]]:
+    """
+    Endless evolve -> evaluate loop; yields (population, fitness) per generation.
+    Starts from any scored population, so it also warm-starts a GA on a patched
+    one (see online_rebalancer).
+    """
+    table = build_server_table(servers)
+    ga_servers = table if tasks is not None else servers  # dict path reads the server list
+    while True:
+        start = time.perf_counter()
+        population = evolve_population(
+            population, fitness_scores, ga_servers, population_size, tasks=tasks, rng=rng,
+            selection=selection, repair=repair, capacity=capacity,
+        )
+        fitness_scores = evaluate_population_batch(population, table, weights, tasks=tasks, cache=cache).tolist()
+        if PROFILER.enabled:
+            seconds = time.perf_counter() - start
+            PROFILER.record("generation", seconds)
+            PROFILER.sample("generation_seconds", seconds)
+        yield population, fitness_scores
+
+def _evolve_cluster(job: Tuple) -> Tuple[str, List, List[float], List[Tuple[List, List[float]]], Optional[Dict], Optional[Dict]]:
+    """
+    Worker body for evolve_clusters_parallel: run the full GA for one cluster.
+    Seeds both `random` and the NumPy generator from the job's own seed, so a
+    cluster's result does not depend on which worker runs it.
+    profile_pid is the caller's pid when its PROFILER is enabled; a worker in
+    another process then profiles itself and returns the snapshot.
+    capacity is the repair table (None: no repair).
+    """
+    (cname, population, servers, weights, generations, population_size,
+     tasks, seed, keep_history, cache_size, selection, capacity, profile_pid) = job
+    remote_profile = profile_pid is not None and os.getpid() != profile_pid
+    if remote_profile:
+        PROFILER.reset()
+        PROFILER.enable()
+    random.seed(seed)
+    rng = np.random.default_rng(seed)
+    cache = FitnessCache(cache_size) if cache_size else None
+
+    fitness_scores = evaluate_population_batch(population, servers, weights, tasks=tasks, cache=cache).tolist()
+    history = []
+    loop = generation_loop(population, fitness_scores, servers, weights, population_size, tasks, rng, cache,
+                           selection, repair=capacity is not None, capacity=capacity)
+    for population, fitness_scores in islice(loop, generations):
+        if keep_history:
+            history.append((population, fitness_scores))
+    profile = PROFILER.snapshot() if remote_profile else None
+    return cname, population, fitness_scores, history, cache.stats() if cache else None, profile
+
+def evolve_clusters_parallel(
+    populations: Dict[str, List[List[Dict]]],
+    ORIGINAL_CLUSTERS: Dict[str, List[Dict]],
+    weights: Dict[str, float],
+    generations: int,
+    population_size: int,
+    max_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    task_tables: Optional[Dict[str, TaskTable]] = None,
+    keep_history: bool = False,
+    cache_size: int = 0,
+    cache_stats: Optional[Dict[str, Dict]] = None,
+    selection: str = "roulette",
+    repair: bool = False,
+    server_status: Optional[Dict[str, str]] = None
+) -> Tuple[Dict[str, List], Dict[str, List[float]], Dict[str, List[Tuple[List, List[float]]]]]:
+    """
+    Evolve every cluster's population independently in a process pool.
+      - max_workers: pool size (default: one per CPU, capped at the cluster count);
+        1 runs in-process without a pool
+      - seed: root seed; each cluster gets its own stream spawned from it
+      - keep_history: also return (population, fitness) for every generation
+      - cache_size: > 0 gives each cluster a FitnessCache of that size;
+        pass a dict as cache_stats to receive its hit/miss counters per cluster
+      - selection: parent selection operator, see SELECTION_OPERATORS
+      - repair: repair_chromosome every child against
+        repair_table(ORIGINAL_CLUSTERS[c], server_status) (compact format only)
+    Returns (final_generations, final_fitnesses, history) keyed by cluster name.
+    """
+    if repair and not task_tables:
+        raise ValueError("repair needs compact populations (task_tables)")
+    names = list(populations)
+    seeds = np.random.SeedSequence(seed).spawn(len(names))
+    jobs = [
+        (
+            cname, populations[cname], ORIGINAL_CLUSTERS[cname], weights, generations,
+            population_size, task_tables[cname] if task_tables else None,
+            int(ss.generate_state(1)[0]), keep_history, cache_size, selection,
+            repair_table(ORIGINAL_CLUSTERS[cname], server_status) if repair else None,
+            os.getpid() if PROFILER.enabled else None,
+        )
+        for cname, ss in zip(names, seeds)
+    ]
+
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, len(jobs))
+    if max_workers <= 1 or len(jobs) <= 1:
+        results = [_evolve_cluster(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            chunksize = max(1, len(jobs) // (max_workers * 4))
+            results = list(pool.map(_evolve_cluster, jobs, chunksize=chunksize))
+
+    final_generations, final_fitnesses, history = {}, {}, {}
+    for cname, population, fitness_scores, generations_seen, stats, profile in results:
+        final_generations[cname] = population
+        final_fitnesses[cname] = fitness_scores
+        history[cname] = generations_seen
+        if cache_stats is not None and stats is not None:
+            cache_stats[cname] = stats
+        if profile is not None:
+            PROFILER.merge(profile)
+    return final_generations, final_fitnesses, history
+
+def population_diversity(population: List, tasks: Optional[TaskTable] = None) -> float:
+    """
+    Mean over task positions of the Gini-Simpson index of the assigned servers:
+    the probability that two random chromosomes disagree on a task.
+    0 = all chromosomes identical; approaches 1 as assignments spread out.
+    """
+    if len(population) < 2:
+        return 0.0
+    if tasks is not None:
+        genes = np.stack([np.asarray(chrom) for chrom in population]).astype(np.int64) + 1   # -1 (unassigned) -> 0
+    else:
+        codes: Dict[Optional[str], int] = {}
+        genes = np.array([[codes.setdefault(g["server_id"], len(codes)) for g in chrom] for chrom in population])
+    n_chrom, n_genes = genes.shape
+    if n_genes == 0:
+        return 0.0
+    n_codes = int(genes.max()) + 1
+    counts = np.bincount((np.arange(n_genes) * n_codes + genes).ravel(), minlength=n_genes * n_codes)
+    share = counts.reshape(n_genes, n_codes) / n_chrom
+    return float(np.mean(1.0 - (share * share).sum(axis=1)))
+
+def adaptive_mutation_rate(
+    diversity: float,
+    target_diversity: float = 0.3,
+    mutation_range: Tuple[float, float] = (0.05, 0.5)
+) -> float:
+    """
+    Linear schedule: the low rate at or above target_diversity, rising to the
+    high rate as diversity drops to 0.
+    """
+    low, high = mutation_range
+    return high - (high - low) * min(diversity / target_diversity, 1.0) if target_diversity > 0 else low
+
+def evolve_adaptive(
+    population: List,
+    servers: List[Dict],
+    weights: Dict[str, float],
+    max_generations: int = 100,
+    tasks: Optional[TaskTable] = None,
+    seed: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    eval_budget: Optional[int] = None,
+    patience: int = 10,
+    min_improvement: float = 1e-9,
+    min_diversity: float = 0.005,
+    target_diversity: float = 0.3,
+    mutation_range: Tuple[float, float] = (0.05, 0.5),
+    selection: str = "roulette",
+    cache_size: int = 0,
+    fitness_fn: Optional[Callable[[List], List[float]]] = None,
+    repair: bool = False,
+    server_status: Optional[Dict[str, str]] = None
+) -> Dict:
+    """
+    GA driver that stops when more generations stop paying off:
+      - time_budget (seconds) / eval_budget (chromosome evaluations): hard limits
+      - patience: stop after that many generations without the best fitness
+        improving by more than min_improvement (plateau)
+      - min_diversity: stop once population_diversity falls below it
+    The mutation rate follows adaptive_mutation_rate(diversity) every generation.
+    telemetry has one entry per generation (best/mean fitness, diversity,
+    mutation rate, evaluations, seconds); 'saved' compares the run with the
+    fixed loop of max_generations.
+    fitness_fn(population) -> scores replaces the Fs evaluation (and the
+    cache), e.g. execution_simulator.execution_objective.
+    repair: repair_chromosome every child against repair_table(servers, server_status).
+    """
+    random.seed(seed)
+    rng = np.random.default_rng(seed)
+    table = build_server_table(servers)
+    ga_servers = table if tasks is not None else servers
+    capacity = repair_table(servers, server_status) if repair else None
+    cache = FitnessCache(cache_size) if cache_size else None
+    population_size = len(population)
+
+    t0 = time.perf_counter()
+    def score(population: List) -> List[float]:
+        if fitness_fn is not None:
+            return list(fitness_fn(population))
+        return evaluate_population_batch(population, table, weights, tasks=tasks, cache=cache).tolist()
+
+    fitness_scores = score(population)
+    evaluations = population_size
+    best = max(fitness_scores)
+    diversity = population_diversity(population, tasks)
+    stale = 0
+    stop_reason = "max_generations"
+    telemetry = []
+
+    for generation in range(1, max_generations + 1):
+        if time_budget is not None and time.perf_counter() - t0 >= time_budget:
+            stop_reason = "time_budget"
+            break
+        if eval_budget is not None and evaluations + population_size > eval_budget:
+            stop_reason = "eval_budget"
+            break
+
+        g0 = time.perf_counter()
+        mutation_rate = adaptive_mutation_rate(diversity, target_diversity, mutation_range)
+        population = evolve_population(
+            population, fitness_scores, ga_servers, population_size, tasks=tasks, rng=rng,
+            selection=selection, mutation_rate=mutation_rate, repair=repair, capacity=capacity,
+        )
+        fitness_scores = score(population)
+        evaluations += population_size
+        diversity = population_diversity(population, tasks)
+
+        generation_best = max(fitness_scores)
+        if generation_best > best + min_improvement:
+            best = generation_best
+            stale = 0
+        else:
+            stale += 1
+        telemetry.append({
+            "generation": generation,
+            "best": generation_best,
+            "mean": sum(fitness_scores) / population_size,
+            "diversity": diversity,
+            "mutation_rate": mutation_rate,
+            "evaluations": evaluations,
+            "seconds": time.perf_counter() - g0,
+        })
+
+        if stale >= patience:
+            stop_reason = "plateau"
+            break
+        if diversity < min_diversity:
+            stop_reason = "diversity"
+            break
+
+    generations_run = len(telemetry)
+    seconds_per_generation = sum(t["seconds"] for t in telemetry) / generations_run if generations_run else 0.0
+    best_idx = fitness_scores.index(max(fitness_scores))
+    return {
+        "best_chromosome": population[best_idx],
+        "best_fitness": fitness_scores[best_idx],
+        "population": population,
+        "fitness": fitness_scores,
+        "generations": generations_run,
+        "evaluations": evaluations,
+        "stop_reason": stop_reason,
+        "telemetry": telemetry,
+        "cache": cache.stats() if cache else None,
+        "seconds": time.perf_counter() - t0,
+        "saved": {
+            "generations": max_generations - generations_run,
+            "evaluations": (max_generations - generations_run) * population_size,
+            "seconds_estimate": (max_generations - generations_run) * seconds_per_generation,
+        },
+    }
+
+MIGRATION_TOPOLOGIES = ("ring", "full")
+
+def _island_epoch(job: Tuple) -> Tuple[List, List[float], List[Tuple[float, float]], Tuple]:
+    """
+    Worker body for evolve_islands: evolve one island for one migration interval.
+    RNG state travels with the job so an island's stream continues across epochs.
+    Returns (population, fitness, [(seconds_into_epoch, best_fitness)], rng_state).
+    """
+    population, fitness_scores, servers, weights, generations, tasks, rng_state = job
+    random.setstate(rng_state[0])
+    rng = np.random.default_rng()
+    rng.bit_generator.state = rng_state[1]
+
+    t0 = time.perf_counter()
+    trace = []
+    loop = generation_loop(population, fitness_scores, servers, weights, len(population), tasks, rng)
+    for population, fitness_scores in islice(loop, generations):
+        trace.append((time.perf_counter() - t0, max(fitness_scores)))
+    return population, fitness_scores, trace, (random.getstate(), rng.bit_generator.state)
+
+def _migrate(islands: List[List], fitnesses: List[List[float]], n_migrants: int, topology: str) -> None:
+    """
+    Copy each island's best n_migrants to its neighbours, replacing their worst
+    individuals (in place). ring: island i -> i+1; full: every island -> all others.
+    """
+    k = len(islands)
+    outgoing = []
+    for pop, fit in zip(islands, fitnesses):
+        best = sorted(range(len(pop)), key=fit.__getitem__, reverse=True)[:n_migrants]
+        outgoing.append([(pop[i], fit[i]) for i in best])
+
+    for dst in range(k):
+        sources = [(dst - 1) % k] if topology == "ring" else [src for src in range(k) if src != dst]
+        incoming = [m for src in sources for m in outgoing[src]]
+        pop, fit = islands[dst], fitnesses[dst]
+        # never overwrite the island's elite (index of its max fitness)
+        worst = sorted(range(len(pop)), key=fit.__getitem__)[:min(len(incoming), len(pop) - 1)]
+        for slot, (chrom, score) in zip(worst, incoming):
+            pop[slot] = chrom
+            fit[slot] = score
+
+def _first_reaching(trace: List[Tuple[float, float]], target: Optional[float]) -> Optional[int]:
+    if target is None:
+        return None
+    return next((i for i, (_, best) in enumerate(trace) if best >= target), None)
+
+def evolve_single_population(
+    population: List,
+    servers: List[Dict],
+    weights: Dict[str, float],
+    generations: int,
+    tasks: Optional[TaskTable] = None,
+    seed: Optional[int] = None,
+    target_fitness: Optional[float] = None
+) -> Dict:
+    """
+    The dashboard's single-population loop, instrumented like evolve_islands
+    so the two can be compared (best fitness and wall time per generation).
+    """
+    random.seed(seed)
+    rng = np.random.default_rng(seed)
+    t0 = time.perf_counter()
+    fitness_scores = evaluate_population_batch(population, servers, weights, tasks=tasks).tolist()
+    trace = []
+    loop = generation_loop(population, fitness_scores, servers, weights, len(population), tasks, rng)
+    for population, fitness_scores in islice(loop, generations):
+        trace.append((time.perf_counter() - t0, max(fitness_scores)))
+
+    hit = _first_reaching(trace, target_fitness)
+    best_idx = fitness_scores.index(max(fitness_scores))
+    return {
+        "best_chromosome": population[best_idx],
+        "best_fitness": fitness_scores[best_idx],
+        "population": population,
+        "fitness": fitness_scores,
+        "trace": trace,
+        "generations_to_target": None if hit is None else hit + 1,
+        "time_to_target": None if hit is None else trace[hit][0],
+        "seconds": time.perf_counter() - t0,
+    }
+
+def evolve_islands(
+    population: List,
+    servers: List[Dict],
+    weights: Dict[str, float],
+    generations: int,
+    n_islands: int = 4,
+    migration_interval: int = 5,
+    n_migrants: int = 1,
+    topology: str = "ring",
+    max_workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    tasks: Optional[TaskTable] = None,
+    target_fitness: Optional[float] = None
+) -> Dict:
+    """
+    Island-model GA for one cluster. The population is split round-robin into
+    n_islands sub-populations that evolve in separate worker processes with the
+    usual evolve_population operators. Every migration_interval generations each
+    island's best n_migrants chromosomes replace the worst ones of its neighbours
+    (topology 'ring' or 'full').
+    Reports best fitness per generation and, if target_fitness is set, the
+    generation and wall time at which any island first reached it.
+    """
+    if topology not in MIGRATION_TOPOLOGIES:
+        raise ValueError(f"topology must be one of {MIGRATION_TOPOLOGIES}, got {topology!r}")
+    if len(population) < 2 * n_islands:
+        raise ValueError(f"need at least 2 chromosomes per island, got {len(population)} for {n_islands}")
+
+    t0 = time.perf_counter()
+    islands = [population[i::n_islands] for i in range(n_islands)]
+    fitnesses = [evaluate_population_batch(pop, servers, weights, tasks=tasks).tolist() for pop in islands]
+    rng_states = []
+    for ss in np.random.SeedSequence(seed).spawn(n_islands):
+        island_seed = int(ss.generate_state(1)[0])
+        random.seed(island_seed)
+        rng_states.append((random.getstate(), np.random.default_rng(island_seed).bit_generator.state))
+
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, n_islands)
+    pool = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+
+    trace = []   # (seconds since start, best fitness over all islands) per generation
+    done = 0
+    try:
+        while done < generations:
+            epoch = min(migration_interval, generations - done)
+            epoch_start = time.perf_counter() - t0
+            jobs = [
+                (islands[i], fitnesses[i], servers, weights, epoch, tasks, rng_states[i])
+                for i in range(n_islands)
+            ]
+            results = list(pool.map(_island_epoch, jobs)) if pool else [_island_epoch(job) for job in jobs]
+
+            islands = [r[0] for r in results]
+            fitnesses = [r[1] for r in results]
+            rng_states = [r[3] for r in results]
+            for g in range(epoch):
+                seconds, best = max((r[2][g] for r in results), key=lambda point: point[1])
+                trace.append((epoch_start + seconds, best))
+            done += epoch
+            if done < generations:
+                _migrate(islands, fitnesses, n_migrants, topology)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    hit = _first_reaching(trace, target_fitness)
+    best_island = max(range(n_islands), key=lambda i: max(fitnesses[i]))
+    best_idx = fitnesses[best_island].index(max(fitnesses[best_island]))
+    return {
+        "best_chromosome": islands[best_island][best_idx],
+        "best_fitness": fitnesses[best_island][best_idx],
+        "islands": list(zip(islands, fitnesses)),
+        "trace": trace,
+        "generations_to_target": None if hit is None else hit + 1,
+        "time_to_target": None if hit is None else trace[hit][0],
+        "seconds": time.perf_counter() - t0,
+    }
+
+CHECKPOINT_VERSION = 1
+SERVER_FIELDS = ("server_id", "cpu", "ram", "bandwidth", "throughput", "status")
+
+def _rng_state(rng: Optional[np.random.Generator]) -> Dict:
+    version, internal, gauss = random.getstate()
+    return {
+        "random": [version, list(internal), gauss],
+        "numpy": rng.bit_generator.state if rng is not None else None,
+    }
+
+def restore_rng_state(state: Dict) -> np.random.Generator:
+    """
+    Put `random` back into the checkpointed state and return the NumPy
+    generator it held; if none was saved, one seeded from the restored
+    `random` state (as _np_rng does), so restoring stays deterministic.
+    """
+    version, internal, gauss = state["random"]
+    random.setstate((version, tuple(internal), gauss))
+    if state.get("numpy") is None:
+        return np.random.default_rng(random.getrandbits(64))
+    rng = np.random.default_rng()
+    rng.bit_generator.state = state["numpy"]
+    return rng
+
+def save_checkpoint(
+    path: str,
+    populations: Dict[str, List[np.ndarray]],
+    task_tables: Dict[str, TaskTable],
+    servers_by_cluster: Dict[str, List[Dict]],
+    fitness: Optional[Dict[str, List[float]]] = None,
+    generation: int = 0,
+    rng: Optional[np.random.Generator] = None
+) -> None:
+    """
+    Write the full GA state to directory `path` as plain .npy arrays plus a
+    meta.json: per cluster the population as one (population x tasks) gene
+    matrix, fitness, the task table and the servers it is evaluated against
+    (extract_state format), and globally the generation number and RNG state.
+    Populations must be in compact format (see encode_population).
+    meta.json is removed first and written last, so a checkpoint without it is
+    incomplete, also when overwriting an existing checkpoint directory.
+    """
+    os.makedirs(path, exist_ok=True)
+    meta_path = os.path.join(path, "meta.json")
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    names = list(populations)
+    for i, cname in enumerate(names):
+        prefix = os.path.join(path, f"c{i}.")
+        tasks = task_tables[cname]
+        servers = servers_by_cluster[cname]
+        genes = np.stack(populations[cname]) if populations[cname] else np.empty((0, len(tasks.complexity)))
+        np.save(prefix + "genes.npy", genes.astype(_index_dtype(len(servers)), copy=False))
+        np.save(prefix + "fitness.npy", np.asarray(fitness[cname] if fitness else [], dtype=np.float64))
+        np.save(prefix + "complexity.npy", np.asarray(tasks.complexity))
+        for field in ("device_id", "task", "orig_server"):
+            values = [v if v is not None else "" for v in getattr(tasks, field)]
+            np.save(prefix + f"{field}.npy", np.asarray(values, dtype=str))
+        for field in SERVER_FIELDS:
+            values = [srv.get(field, "active" if field == "status" else 0) for srv in servers]
+            np.save(prefix + f"server.{field}.npy", np.asarray(values))
+
+    meta = {
+        "version": CHECKPOINT_VERSION,
+        "generation": generation,
+        "clusters": names,
+        "rng": _rng_state(rng),
+    }
+    tmp = os.path.join(path, "meta.json.tmp")
+    with open(tmp, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp, meta_path)
+
+def load_checkpoint(path: str, clusters: Optional[List[str]] = None, mmap: bool = True) -> Dict:
+    """
+    Open a checkpoint written by save_checkpoint. With mmap=True the gene
+    matrices, fitness and complexity arrays are read-only memory maps, so
+    opening is O(metadata) and worker processes share the pages with no copy;
+    each population is a list of row views. clusters limits which are opened.
+    Returns {generation, rng_state, populations, fitness, task_tables, servers}.
+    """
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    if meta["version"] != CHECKPOINT_VERSION:
+        raise ValueError(f"unsupported checkpoint version {meta['version']}")
+    mode = "r" if mmap else None
+    wanted = set(clusters) if clusters is not None else None
+
+    state = {
+        "generation": meta["generation"],
+        "rng_state": meta["rng"],
+        "populations": {}, "fitness": {}, "task_tables": {}, "servers": {},
+    }
+    for i, cname in enumerate(meta["clusters"]):
+        if wanted is not None and cname not in wanted:
+            continue
+        prefix = os.path.join(path, f"c{i}.")
+        genes = np.load(prefix + "genes.npy", mmap_mode=mode)
+        complexity = np.load(prefix + "complexity.npy", mmap_mode=mode)
+        complexity.flags.writeable = False
+        text = {field: np.load(prefix + f"{field}.npy").tolist() for field in ("device_id", "task", "orig_server")}
+        server_columns = {field: np.load(prefix + f"server.{field}.npy").tolist() for field in SERVER_FIELDS}
+
+        state["populations"][cname] = list(genes)
+        state["fitness"][cname] = np.load(prefix + "fitness.npy", mmap_mode=mode)
+        state["task_tables"][cname] = TaskTable(
+            device_id=tuple(text["device_id"]),
+            task=tuple(text["task"]),
+            complexity=complexity,
+            orig_server=tuple(s or None for s in text["orig_server"]),
+        )
+        state["servers"][cname] = [dict(zip(SERVER_FIELDS, row)) for row in zip(*server_columns.values())]
+    return state
+
+def _evolve_checkpoint_cluster(job: Tuple) -> Tuple:
+    """
+    Worker body for resume_checkpoint: opens its own cluster of the checkpoint
+    (memory-mapped, nothing is pickled over) and runs _evolve_cluster on it.
+    """
+    path, cname, weights, generations, seed, cache_size, selection = job
+    state = load_checkpoint(path, clusters=[cname])
+    population = state["populations"][cname]
+    return _evolve_cluster((
+        cname, population, state["servers"][cname], weights, generations, len(population),
+        state["task_tables"][cname], seed, False, cache_size, selection, None, None,
+    ))
+
+def resume_checkpoint(
+    path: str,
+    weights: Dict[str, float],
+    generations: int,
+    max_workers: Optional[int] = None,
+    cache_size: int = 0,
+    selection: str = "roulette",
+    save_to: Optional[str] = None
+) -> Tuple[Dict[str, List], Dict[str, List[float]], int]:
+    """
+    Continue a checkpointed run for `generations` more generations, one cluster
+    per worker; workers open the checkpoint themselves (zero-copy).
+    Per-cluster seeds come from the checkpoint's RNG state, so resuming the same
+    checkpoint twice gives the same result. save_to writes the new state.
+    Returns (populations, fitness, generation).
+    """
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    rng = restore_rng_state(meta["rng"])
+    names = meta["clusters"]
+    seeds = np.random.SeedSequence(int(rng.integers(2 ** 63))).spawn(len(names))
+    jobs = [
+        (path, cname, weights, generations, int(ss.generate_state(1)[0]), cache_size, selection)
+        for cname, ss in zip(names, seeds)
+    ]
+
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, len(jobs))
+    if max_workers <= 1 or len(jobs) <= 1:
+        results = [_evolve_checkpoint_cluster(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_evolve_checkpoint_cluster, jobs))
+
+    # copies: with generations=0 the rows are memory maps of the checkpoint itself
+    populations = {r[0]: [np.array(chrom) for chrom in r[1]] for r in results}
+    fitness = {r[0]: list(r[2]) for r in results}
+    generation = meta["generation"] + generations
+    if save_to is not None:
+        state = load_checkpoint(path, mmap=False)
+        save_checkpoint(save_to, populations, state["task_tables"], state["servers"], fitness, generation, rng)
+    return populations, fitness, generation
@@ -0,0 +1,293 @@
+import heapq
+import random
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ga_module import evolve_clusters_parallel, generate_initial_population_compact
+from iot_device_simulator import DEVICE_TYPES, TASK_POOL
+from profiling import PROFILER, profiled
+from task_placement import PlacementEngine
+
+
+def _active(server: Dict) -> bool:
+    return server.get('status', 'active') == 'active'
+
+
+def cluster_utilisation(cloud_clusters: Dict[str, List[Dict]]) -> np.ndarray:
+    """
+    Used / total CPU of the active servers of every cluster (in dict order);
+    total is remaining CPU plus the complexity of the placed tasks.
+    """
+    util = np.empty(len(cloud_clusters))
+    for c, servers in enumerate(cloud_clusters.values()):
+        used = sum(t["complexity"] for srv in servers if _active(srv) for t in srv["tasks"])
+        total = used + sum(srv["cpu"] for srv in servers if _active(srv))
+        util[c] = used / total if total > 0 else np.inf
+    return util
+
+
+def load_imbalance(util: np.ndarray) -> Dict[str, float]:
+    """Spread of cluster utilisations: max, min, mean, max/mean and coefficient of variation."""
+    util = util[np.isfinite(util)]
+    mean = float(util.mean())
+    return {
+        "max": float(util.max()),
+        "min": float(util.min()),
+        "mean": mean,
+        "max_over_mean": float(util.max()) / mean if mean else 0.0,
+        "cv": float(util.std()) / mean if mean else 0.0,
+    }
+
+
+class GlobalBalancer:
+    """
+    Two-level placement over many clusters. The global level keeps each
+    cluster's aggregate CPU (used / total over its active servers) and a
+    min-heap of utilisations, so a device goes to the least utilised cluster
+    in O(log clusters); inside the cluster its tasks are placed by the
+    cluster's PlacementEngine heap as in Step 2. A cluster that cannot fit a
+    task is marked full, which sinks it below the others until migrate() frees
+    CPU in it, and the task goes to the next cluster. migrate() is the coarse
+    global pass moving tasks from the most to the least utilised clusters, and
+    optimise() hands the clusters changed since the last call to the
+    per-cluster GA (evolve_clusters_parallel).
+    Mutates the server dicts exactly like place_devices.
+    """
+
+    def __init__(self, cloud_clusters: Dict[str, List[Dict]]):
+        self.clusters = cloud_clusters
+        self.names = list(cloud_clusters)
+        self.engine = PlacementEngine(cloud_clusters)
+        self.used = np.zeros(len(self.names))
+        self.total = np.zeros(len(self.names))
+        for c, servers in enumerate(cloud_clusters.values()):
+            for srv in servers:
+                if _active(srv):
+                    used = sum(t["complexity"] for t in srv["tasks"])
+                    self.used[c] += used
+                    self.total[c] += used + srv["cpu"]
+        self.full = np.zeros(len(self.names), dtype=bool)
+        self.dirty: Set[str] = set(self.names)
+        self.routed_devices = 0
+        self.routed_tasks = 0
+        self.unplaced = 0
+        self.routing_seconds = 0.0
+        self.moves = 0
+        self._rebuild()
+
+    def _util(self, c: int) -> float:
+        return self.used[c] / self.total[c] if self.total[c] > 0 else np.inf
+
+    def _key(self, c: int) -> float:
+        """Heap key: utilisation, plus one for clusters marked full so they sort last."""
+        return self._util(c) + self.full[c]
+
+    def _rebuild(self) -> None:
+        self._heap = [(self._key(c), c) for c in range(len(self.names))]
+        heapq.heapify(self._heap)
+
+    def route_device(self, device_id: str, tasks: List[Tuple[str, int]]) -> Optional[str]:
+        """
+        Place a device's (task, complexity) list in the least utilised cluster.
+        A task that does not fit there tries the next clusters in heap order;
+        the clusters it skipped are marked full. Returns the cluster of the
+        device's first placed task, or None if nothing was placed.
+        """
+        home = None
+        for task_name, complexity in tasks:
+            skipped = []
+            while self._heap:
+                c = self._heap[0][1]
+                if self.engine.place_task(self.names[c], device_id, task_name, complexity) is not None:
+                    self.used[c] += complexity
+                    heapq.heapreplace(self._heap, (self._key(c), c))
+                    self.dirty.add(self.names[c])
+                    home = home or self.names[c]
+                    break
+                self.full[c] = True
+                skipped.append(heapq.heappop(self._heap)[1])
+            else:
+                self.unplaced += 1
+            for c in skipped:
+                heapq.heappush(self._heap, (self._key(c), c))
+        self.routed_devices += 1
+        self.routed_tasks += len(tasks)
+        return home
+
+    @profiled("placement")
+    def route_devices(self, devices: List[Dict]) -> None:
+        """route_device for generate_iot_devices-style dicts."""
+        t0 = time.perf_counter()
+        for device in devices:
+            self.route_device(device["id"], [(t["task"], t["complexity"]) for t in device["task_queue"]])
+        self.routing_seconds += time.perf_counter() - t0
+        PROFILER.count("devices_placed", len(devices))
+
+    @profiled("placement")
+    def route_columns(self, columns: Dict[str, np.ndarray]) -> None:
+        """route_device for a columnar batch (iot_device_simulator.generate_device_columns)."""
+        t0 = time.perf_counter()
+        types = columns["type"].tolist()
+        tasks = columns["task"].tolist()
+        complexity = columns["complexity"].tolist()
+        for row, i in enumerate(columns["index"].tolist()):
+            pool = TASK_POOL[DEVICE_TYPES[types[row]]]
+            self.route_device(f"Device-{i+1}", [(pool[t], c) for t, c in zip(tasks[row], complexity[row])])
+        self.routing_seconds += time.perf_counter() - t0
+        PROFILER.count("devices_placed", len(types))
+
+    def _donor(self, c: int) -> Optional[int]:
+        """Index of the active server of cluster c with the least CPU left that still has tasks."""
+        best, best_cpu = None, None
+        for i, srv in enumerate(self.clusters[self.names[c]]):
+            if srv["tasks"] and _active(srv) and (best is None or srv["cpu"] < best_cpu):
+                best, best_cpu = i, srv["cpu"]
+        return best
+
+    @profiled("migration")
+    def migrate(self, tolerance: float = 0.02, max_moves: Optional[int] = None) -> Dict:
+        """
+        Coarse global pass: while the most and least utilised clusters differ by
+        more than tolerance, move the latest task of the fullest server of the
+        most utilised cluster to the least utilised one, as long as that lowers
+        the pair's peak utilisation. Each move is O(log clusters + servers).
+        """
+        t0 = time.perf_counter()
+        high = [(-u, c) for u, c in self._heap]
+        heapq.heapify(high)
+        low = list(self._heap)
+        moves = 0
+
+        def top(heap: List, sign: int) -> int:
+            while True:
+                u, c = heap[0]
+                if sign * u == self._util(c):
+                    return c
+                heapq.heapreplace(heap, (sign * self._util(c), c))   # stale utilisation
+
+        while max_moves is None or moves < max_moves:
+            a, b = top(high, -1), top(low, 1)
+            ua, ub = self._util(a), self._util(b)
+            if not np.isfinite(ua) or ua - ub <= tolerance:
+                break
+            i = self._donor(a)
+            if i is None:
+                break
+            complexity = self.clusters[self.names[a]][i]["tasks"][-1]["complexity"]
+            if max((self.used[a] - complexity) / self.total[a], (self.used[b] + complexity) / self.total[b]) >= ua:
+                break
+            task = self.engine.remove_task(self.names[a], i)
+            if self.engine.place_task(self.names[b], task["device_id"], task["task"], complexity) is None:
+                self.engine.place_task(self.names[a], task["device_id"], task["task"], complexity)
+                break
+            self.used[a] -= complexity
+            self.used[b] += complexity
+            self.full[a] = False
+            for c in (a, b):
+                heapq.heappush(high, (-self._util(c), c))
+                heapq.heappush(low, (self._util(c), c))
+            self.dirty.update((self.names[a], self.names[b]))
+            moves += 1
+
+        self.moves += moves
+        self._rebuild()
+        PROFILER.count("tasks_migrated", moves)
+        return {"moves": moves, "seconds": time.perf_counter() - t0, "imbalance": self.imbalance()}
+
+    def utilisation(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.total > 0, self.used / self.total, np.inf)
+
+    def imbalance(self) -> Dict[str, float]:
+        return load_imbalance(self.utilisation())
+
+    def optimise(
+        self,
+        original_clusters: Dict[str, List[Dict]],
+        weights: Dict[str, float],
+        population_size: int = 20,
+        generations: int = 10,
+        max_workers: int = 1,
+        seed: Optional[int] = None,
+        selection: str = "roulette",
+        all_clusters: bool = False,
+        seeding: Tuple[str, ...] = (),
+        repair: bool = False
+    ) -> Tuple[Dict[str, List], Dict[str, List[float]]]:
+        """
+        Run the per-cluster GA on the clusters routed to or migrated since the
+        last call (every cluster with all_clusters=True), sharded across
+        max_workers processes. Server status comes from the cluster dicts (no
+        simulated failures), so the same seed gives the same run. seeding and
+        repair are passed to generate_initial_population_compact, and repair
+        also to the GA (see evolve_clusters_parallel).
+        Returns the final populations and fitness.
+        """
+        names = self.names if all_clusters else [n for n in self.names if n in self.dirty]
+        shard = {n: self.clusters[n] for n in names}
+        server_status = {
+            srv["server_id"]: srv.get("status", "active") for servers in shard.values() for srv in servers
+        }
+        populations, task_tables = generate_initial_population_compact(
+            shard, population_size, rng=np.random.default_rng(seed), server_status=server_status,
+            seeding=seeding, repair=repair,
+        )
+        populations, fitness, _ = evolve_clusters_parallel(
+            populations, {n: original_clusters[n] for n in populations}, weights, generations,
+            population_size, max_workers=max_workers, seed=seed, task_tables=task_tables,
+            selection=selection, repair=repair, server_status=server_status,
+        )
+        self.dirty.difference_update(names)
+        return populations, fitness
+
+    def stats(self) -> Dict:
+        return {
+            "clusters": len(self.names),
+            "devices": self.routed_devices,
+            "tasks": self.routed_tasks,
+            "unplaced": self.unplaced,
+            "routing_seconds": self.routing_seconds,
+            "devices_per_sec": self.routed_devices / self.routing_seconds if self.routing_seconds else None,
+            "migrated": self.moves,
+            "imbalance": self.imbalance(),
+        }
+
+
+if __name__ == "__main__":
+    # Least-utilised routing + migration vs. random cluster choice (place_devices)
+    import copy
+    from iot_device_simulator import iter_iot_devices
+    from pipeline_benchmark import WEIGHTS, make_cloud_clusters
+    from task_placement import place_device_stream
+
+    random.seed(0)
+    for n_clusters, n_devices in ((100, 50000), (1000, 100000), (5000, 200000)):
+        cloud_clusters = make_cloud_clusters(n_clusters, 10, 2 * n_devices)
+        # uneven clusters: a third of them at half capacity
+        for servers in list(cloud_clusters.values())[::3]:
+            for srv in servers:
+                srv["cpu"] //= 2
+        original_clusters = copy.deepcopy(cloud_clusters)
+
+        baseline = copy.deepcopy(cloud_clusters)
+        t0 = time.perf_counter()
+        place_device_stream(iter_iot_devices(n_devices, seed=0, columnar=True), baseline, np.random.default_rng(0))
+        base_seconds = time.perf_counter() - t0
+        base = load_imbalance(cluster_utilisation(baseline))
+
+        balancer = GlobalBalancer(cloud_clusters)
+        for columns in iter_iot_devices(n_devices, seed=0, columnar=True):
+            balancer.route_columns(columns)
+        routed = balancer.stats()
+        migration = balancer.migrate()
+        print(f"clusters={n_clusters:5d} devices={n_devices:6d} | random: {n_devices / base_seconds:8.0f} dev/s "
+              f"max/mean={base['max_over_mean']:.3f} cv={base['cv']:.3f} | indexed: "
+              f"{routed['devices_per_sec']:8.0f} dev/s max/mean={routed['imbalance']['max_over_mean']:.3f} "
+              f"cv={routed['imbalance']['cv']:.3f} | migrate: {migration['moves']} moves "
+              f"{migration['seconds']:.2f}s cv={migration['imbalance']['cv']:.3f}")
+
+    t0 = time.perf_counter()
+    _, fitness = balancer.optimise(original_clusters, WEIGHTS, population_size=10, generations=3, seed=0)
+    print(f"per-cluster GA on {len(fitness)} clusters: {time.perf_counter() - t0:.1f}s")
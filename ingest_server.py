@@ -0,0 +1,344 @@
+import asyncio
+import logging
+import random
+import struct
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from iot_device_simulator import DEVICE_TYPES, TASK_POOL, generate_device_columns
+from profiling import PROFILER, latency_summary
+from task_placement import PlacementEngine
+
+# Frame = HEADER (kind, record count) + count fixed-size little-endian records.
+# One frame carries a batch of messages; the server answers every frame with
+# an ACK header carrying the number of records it accepted.
+HEADER = struct.Struct("<BI")
+TELEMETRY = 1
+TASK = 2
+ACK = 3
+
+RECORD_DTYPES = {
+    TELEMETRY: np.dtype([
+        ("device", "<u4"), ("type", "u1"), ("cpu", "<u2"), ("ram", "<f4"), ("bandwidth", "<f4"),
+        ("throughput", "<f4"), ("availability", "<f4"), ("sent_ns", "<u8"),
+    ]),
+    TASK: np.dtype([
+        ("device", "<u4"), ("type", "u1"), ("task", "u1"), ("complexity", "<u2"), ("sent_ns", "<u8"),
+    ]),
+}
+
+MAX_FRAME_RECORDS = 65536
+_POOL_SIZE = np.array([len(TASK_POOL[t]) for t in DEVICE_TYPES])
+
+Address = Union[Tuple[str, int], str]   # (host, port) for TCP, a path for a UNIX socket
+
+logger = logging.getLogger(__name__)
+
+
+def encode_frame(kind: int, records: np.ndarray) -> bytes:
+    return HEADER.pack(kind, len(records)) + records.tobytes()
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, Optional[np.ndarray], int]:
+    """Next (kind, records, count) from the stream; records is None for ACK frames."""
+    kind, count = HEADER.unpack(await reader.readexactly(HEADER.size))
+    dtype = RECORD_DTYPES.get(kind)
+    if dtype is None:
+        return kind, None, count
+    payload = await reader.readexactly(count * dtype.itemsize)
+    return kind, np.frombuffer(payload, dtype=dtype), count
+
+
+def valid_records(kind: int, records: np.ndarray) -> bool:
+    """True if every record names a known device type (and, for tasks, a task of that type's pool)."""
+    types = records["type"]
+    if (types >= len(DEVICE_TYPES)).any():
+        return False
+    return kind != TASK or bool((records["task"] < _POOL_SIZE[types]).all())
+
+
+class IngestServer:
+    """
+    Local device-to-cloud ingest endpoint (TCP or UNIX socket).
+    Connection handlers only parse frames and put them on a bounded queue; one
+    consumer task keeps the latest telemetry per device and places every
+    accepted task through a PlacementEngine on cloud_clusters (each device goes
+    to one random cluster, as place_devices does). When the queue is full the
+    handlers stop reading, so the socket buffers fill and clients block in
+    drain() -- backpressure down to the devices.
+    Frames are validated before they are acknowledged; a connection sending an
+    unknown frame kind, an oversized frame or out-of-range records is dropped.
+    A frame the consumer fails on is logged and counted, and consuming goes on.
+    End-to-end latency is client send -> record handled by the consumer.
+    """
+
+    def __init__(
+        self,
+        cloud_clusters: Dict[str, List[Dict]],
+        queue_frames: int = 64,
+        seed: Optional[int] = None
+    ):
+        self.clusters = cloud_clusters
+        self.engine = PlacementEngine(cloud_clusters)
+        self.names = list(cloud_clusters)
+        self.rng = random.Random(seed)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_frames)
+        self.device_cluster: Dict[int, str] = {}
+        self.telemetry: Dict[int, Dict] = {}
+        self.messages = 0
+        self.frames = 0
+        self.placed = 0
+        self.unplaced = 0
+        self.backpressure_waits = 0
+        self.connections = 0
+        self.rejected_connections = 0
+        self.consumer_errors = 0
+        self._latencies: List[np.ndarray] = []
+        self._server = None
+        self._consumer = None
+        self._first = None
+        self._last = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: Optional[str] = None) -> Address:
+        """Listen on host:port (port 0 = any free port) or on a UNIX socket path; returns the address."""
+        self._consumer = asyncio.get_running_loop().create_task(self._consume())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+            return path
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self) -> None:
+        """Stop accepting, finish the queued frames and stop the consumer."""
+        self._server.close()
+        await self._server.wait_closed()
+        await self.queue.join()
+        self._consumer.cancel()
+        try:
+            await self._consumer
+        except asyncio.CancelledError:
+            pass
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                kind, count = HEADER.unpack(await reader.readexactly(HEADER.size))
+                dtype = RECORD_DTYPES.get(kind)
+                if dtype is None or count > MAX_FRAME_RECORDS:
+                    self.rejected_connections += 1
+                    break
+                records = np.frombuffer(await reader.readexactly(count * dtype.itemsize), dtype=dtype)
+                if not valid_records(kind, records):
+                    self.rejected_connections += 1
+                    break
+                if self.queue.full():
+                    self.backpressure_waits += 1
+                await self.queue.put((kind, records))
+                writer.write(HEADER.pack(ACK, count))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def _consume(self) -> None:
+        while True:
+            kind, records = await self.queue.get()
+            try:
+                if self._first is None:
+                    self._first = time.perf_counter()
+                if kind == TASK:
+                    self._place(records)
+                else:
+                    for device, dtype, cpu, ram, bw, tp, avail, _ in records.tolist():
+                        self.telemetry[device] = {
+                            "type": DEVICE_TYPES[dtype], "cpu": cpu, "ram": ram, "bandwidth": bw,
+                            "throughput": tp, "availability": avail,
+                        }
+                self._latencies.append((time.monotonic_ns() - records["sent_ns"]) / 1e9)
+                self.messages += len(records)
+                self.frames += 1
+                self._last = time.perf_counter()
+            except Exception:
+                self.consumer_errors += 1
+                logger.exception("ingest consumer failed on a frame of kind %d", kind)
+            finally:
+                self.queue.task_done()
+
+    def _place(self, records: np.ndarray) -> None:
+        with PROFILER.phase("placement"):
+            for device, dtype, task, complexity, _ in records.tolist():
+                cname = self.device_cluster.get(device)
+                if cname is None:
+                    cname = self.device_cluster[device] = self.rng.choice(self.names)
+                task_name = TASK_POOL[DEVICE_TYPES[dtype]][task]
+                if self.engine.place_task(cname, f"Device-{device + 1}", task_name, complexity) is None:
+                    self.unplaced += 1
+                else:
+                    self.placed += 1
+        PROFILER.count("tasks_ingested", len(records))
+
+    def stats(self) -> Dict:
+        seconds = (self._last - self._first) if self._first is not None else 0.0
+        latency = np.concatenate(self._latencies) if self._latencies else np.empty(0)
+        return {
+            "connections": self.connections,
+            "frames": self.frames,
+            "messages": self.messages,
+            "devices": len(self.device_cluster),
+            "tasks_placed": self.placed,
+            "tasks_unplaced": self.unplaced,
+            "backpressure_waits": self.backpressure_waits,
+            "rejected_connections": self.rejected_connections,
+            "consumer_errors": self.consumer_errors,
+            "seconds": seconds,
+            "msgs_per_sec": self.messages / seconds if seconds > 0 else None,
+            "latency": latency_summary(latency),
+        }
+
+
+def _device_frames(columns: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Telemetry and task records for a columnar device batch (sent_ns filled in at send time)."""
+    telemetry = np.zeros(len(columns["index"]), dtype=RECORD_DTYPES[TELEMETRY])
+    for field in ("type", "cpu", "ram", "bandwidth", "throughput", "availability"):
+        telemetry[field] = columns[field]
+    telemetry["device"] = columns["index"]
+    tasks = np.zeros(columns["task"].size, dtype=RECORD_DTYPES[TASK])
+    tasks["device"] = np.repeat(columns["index"], columns["task"].shape[1])
+    tasks["type"] = np.repeat(columns["type"], columns["task"].shape[1])
+    tasks["task"] = columns["task"].ravel()
+    tasks["complexity"] = columns["complexity"].ravel()
+    return telemetry, tasks
+
+
+async def _open(address: Address) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+    return await asyncio.open_connection(*address)
+
+
+async def device_gateway(
+    address: Address,
+    start: int,
+    count: int,
+    batch_size: int = 256,
+    window: int = 8,
+    rounds: int = 1,
+    seed: Optional[int] = None
+) -> int:
+    """
+    One persistent connection sending for devices start .. start+count-1:
+    every round each device reports its telemetry, and the first round also
+    submits its task queue. Records go out batch_size per frame with at most
+    `window` frames unacknowledged. Returns the number of messages sent.
+    Raises ConnectionError if the server drops the connection (or answers with
+    anything but ACKs) before every frame is acknowledged.
+    """
+    reader, writer = await _open(address)
+    credits = asyncio.Semaphore(window)
+
+    async def acks() -> None:
+        try:
+            while True:
+                kind, _, _ = await read_frame(reader)
+                if kind != ACK:
+                    raise ConnectionError(f"expected an ACK frame, got kind {kind}")
+                credits.release()
+        finally:
+            for _ in range(window):
+                credits.release()    # wake the sender, which then sees ack_task is done
+
+    async def acquire() -> None:
+        await credits.acquire()
+        if ack_task.done():
+            raise ConnectionError("ingest server closed the connection before acknowledging") \
+                from ack_task.exception()
+
+    ack_task = asyncio.get_running_loop().create_task(acks())
+    try:
+        telemetry, tasks = _device_frames(generate_device_columns(start, count, np.random.default_rng(seed)))
+        batches = [(TELEMETRY, telemetry)] * rounds + [(TASK, tasks)]
+        sent = 0
+        for kind, records in batches:
+            for i in range(0, len(records), batch_size):
+                await acquire()
+                chunk = records[i:i + batch_size].copy()
+                chunk["sent_ns"] = time.monotonic_ns()
+                writer.write(encode_frame(kind, chunk))
+                await writer.drain()
+                sent += len(chunk)
+        for _ in range(window):
+            await acquire()          # every frame acknowledged
+    finally:
+        ack_task.cancel()
+        writer.close()
+    await writer.wait_closed()
+    return sent
+
+
+async def run_ingest(
+    cloud_clusters: Dict[str, List[Dict]],
+    n_devices: int,
+    connections: int = 8,
+    batch_size: int = 256,
+    window: int = 8,
+    rounds: int = 1,
+    queue_frames: int = 64,
+    path: Optional[str] = None,
+    seed: Optional[int] = None
+) -> Dict:
+    """
+    Start an IngestServer, stream n_devices through `connections` gateway
+    connections and return the server's stats once everything is placed.
+    cloud_clusters is mutated like place_devices does, ready for Step 3.
+    """
+    server = IngestServer(cloud_clusters, queue_frames=queue_frames, seed=seed)
+    address = await server.start(path=path)
+    share = -(-n_devices // connections)
+    gateways = [
+        device_gateway(address, start, min(share, n_devices - start), batch_size, window, rounds,
+                       None if seed is None else [seed, start])
+        for start in range(0, n_devices, share)
+    ]
+    sent = sum(await asyncio.gather(*gateways))
+    await server.close()
+    stats = server.stats()
+    stats["sent"] = sent
+    return stats
+
+
+def ingest_devices(cloud_clusters: Dict[str, List[Dict]], n_devices: int, **kwargs) -> Dict:
+    """Synchronous run_ingest (runs its own event loop)."""
+    return asyncio.run(run_ingest(cloud_clusters, n_devices, **kwargs))
+
+
+if __name__ == "__main__":
+    # Ingest throughput / latency as the device count grows, then Steps 3-4 on the result
+    import copy
+    import os
+    import tempfile
+    from ga_module import evolve_clusters_parallel, generate_initial_population_compact
+    from pipeline_benchmark import WEIGHTS, make_cloud_clusters
+
+    random.seed(0)
+    for n_devices in (1000, 10000, 50000):
+        for transport in ("tcp", "unix"):
+            cloud_clusters = make_cloud_clusters(10, 20, 2 * n_devices)
+            original_clusters = copy.deepcopy(cloud_clusters)
+            path = os.path.join(tempfile.mkdtemp(), "ingest.sock") if transport == "unix" else None
+            r = ingest_devices(cloud_clusters, n_devices, connections=16, path=path, seed=0)
+            lat = r["latency"]
+            print(f"devices={n_devices:6d} {transport:4s} msgs={r['messages']:6d} "
+                  f"{r['msgs_per_sec']:9.0f} msg/s p50={lat['p50'] * 1e3:.1f}ms p99={lat['p99'] * 1e3:.1f}ms "
+                  f"placed={r['tasks_placed']} backpressure_waits={r['backpressure_waits']}")
+
+    populations, task_tables = generate_initial_population_compact(cloud_clusters, population_size=20)
+    t0 = time.perf_counter()
+    _, fitness, _ = evolve_clusters_parallel(
+        populations, original_clusters, WEIGHTS, 5, 20, seed=0, task_tables=task_tables,
+    )
+    best = {c: round(max(f), 1) for c, f in fitness.items()}
+    print(f"GA on ingested tasks: {time.perf_counter() - t0:.2f}s best={best}")
@@ -1,5 +1,7 @@
 import random
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
 
 DEVICE_TYPES = [
     "Smart Light", "Smart Fan", "Smart TV", "Smart AC",
@@ -60,6 +62,91 @@ def generate_iot_devices(n: int = 8) -> List[Dict]:
         devices.append(device)
     return devices
 
+# Lookup tables for the vectorized generator (row = DEVICE_TYPES index)
+_TYPE_POOL_SIZE = np.array([len(TASK_POOL[t]) for t in DEVICE_TYPES])
+_TYPE_COMPLEXITY_LOW = np.array([TASK_COMPLEXITY_RANGES[t][0] for t in DEVICE_TYPES])
+_TYPE_COMPLEXITY_HIGH = np.array([TASK_COMPLEXITY_RANGES[t][1] for t in DEVICE_TYPES])
+
+def generate_device_columns(start: int, count: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """
+    Vectorized generate_iot_devices for devices start .. start+count-1, as columns:
+      - index: global device index (id is f"Device-{index + 1}")
+      - type: index into DEVICE_TYPES
+      - cpu, ram, bandwidth, throughput, availability, priority_score
+      - task: (count, 2) indices into TASK_POOL[device type], two distinct per device
+      - complexity: (count, 2) task complexities from TASK_COMPLEXITY_RANGES
+    Same distributions as generate_iot_devices; every device is "active" and a "worker".
+    """
+    index = np.arange(start, start + count, dtype=np.int64)
+    dtype = (index % len(DEVICE_TYPES)).astype(np.int8)
+
+    # two distinct tasks per device: first uniform, second offset by 1..k-1 (mod k)
+    k = _TYPE_POOL_SIZE[dtype]
+    first = (rng.random(count) * k).astype(np.int64)
+    second = (first + 1 + (rng.random(count) * (k - 1)).astype(np.int64)) % k
+    task = np.stack((first, second), axis=1).astype(np.int8)
+
+    low = _TYPE_COMPLEXITY_LOW[dtype][:, None]
+    high = _TYPE_COMPLEXITY_HIGH[dtype][:, None]
+    complexity = rng.integers(low, high + 1, size=(count, 2)).astype(np.int32)
+
+    return {
+        "index": index,
+        "type": dtype,
+        "cpu": rng.integers(500, 3001, size=count).astype(np.int32),            # MIPS
+        "ram": np.round(rng.uniform(0.5, 4, size=count), 2),                     # GB
+        "bandwidth": np.round(rng.uniform(1, 5, size=count), 2),                 # Mbps
+        "throughput": np.round(rng.uniform(0.1, 1.0, size=count), 2),            # MB/s
+        "availability": np.round(rng.uniform(0.85, 0.99, size=count), 2),        # uptime %
+        "priority_score": rng.integers(50, 101, size=count).astype(np.int16),
+        "task": task,
+        "complexity": complexity,
+    }
+
+def columns_to_devices(columns: Dict[str, np.ndarray]) -> List[Dict]:
+    """
+    Expand a columnar batch into generate_iot_devices-style device dicts.
+    """
+    lists = {key: col.tolist() for key, col in columns.items()}
+    devices = []
+    for row, i in enumerate(lists["index"]):
+        device_type = DEVICE_TYPES[lists["type"][row]]
+        pool = TASK_POOL[device_type]
+        devices.append({
+            "id": f"Device-{i+1}",
+            "type": device_type,
+            "cpu": lists["cpu"][row],
+            "ram": lists["ram"][row],
+            "bandwidth": lists["bandwidth"][row],
+            "throughput": lists["throughput"][row],
+            "task_queue": [
+                {"task": pool[t], "complexity": c}
+                for t, c in zip(lists["task"][row], lists["complexity"][row])
+            ],
+            "availability": lists["availability"][row],
+            "role": "worker",
+            "priority_score": lists["priority_score"][row],
+            "status": "active"
+        })
+    return devices
+
+def iter_iot_devices(
+    n: int,
+    batch_size: int = 10000,
+    seed: Optional[int] = None,
+    columnar: bool = False
+) -> Iterator[Union[List[Dict], Dict[str, np.ndarray]]]:
+    """
+    Stream n devices in batches of at most batch_size, never holding more than
+    one batch in memory. Yields device dict lists, or column dicts when
+    columnar=True (see generate_device_columns).
+    The same (seed, batch_size) always yields the same devices.
+    """
+    rng = np.random.default_rng(seed)
+    for start in range(0, n, batch_size):
+        columns = generate_device_columns(start, min(batch_size, n - start), rng)
+        yield columns if columnar else columns_to_devices(columns)
+
 if __name__ == "__main__":
     devices = generate_iot_devices()
     for d in devices:
@@ -0,0 +1,280 @@
+import random
+import time
+from itertools import islice
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ga_module import (
+    TaskTable, build_server_table, decode_chromosome, evaluate_population, evaluate_population_batch,
+    generate_initial_population_compact, generation_loop, random_eligible,
+)
+from profiling import latency_summary
+
+ARRIVE = "arrive"
+DEPART = "depart"
+
+
+class TaskEvent(NamedTuple):
+    kind:       str    # ARRIVE | DEPART
+    cluster:    str
+    device_id:  str
+    task:       str
+    complexity: int = 0
+
+
+def device_events(device: Dict, cluster: str, kind: str = ARRIVE) -> List[TaskEvent]:
+    """One event per task in a device's task_queue (device joins or leaves `cluster`)."""
+    return [TaskEvent(kind, cluster, device["id"], t["task"], t["complexity"]) for t in device["task_queue"]]
+
+
+class ClusterState:
+    """
+    One cluster's GA state, patched in place as tasks come and go.
+    genes is a (population x capacity) matrix of server indices whose first
+    n_tasks columns are live, so an arrival is a column append (amortised
+    O(population)) and a departure moves the last column into the hole.
+    """
+
+    def __init__(self, servers: List[Dict], population: List[np.ndarray], tasks: TaskTable, fitness: List[float]):
+        self.servers = servers
+        self.table = build_server_table(servers)
+        n = len(tasks.complexity)
+        capacity = max(16, 2 * n)
+        self.n_tasks = n
+        self.complexity = np.zeros(capacity, dtype=np.int64)
+        self.complexity[:n] = tasks.complexity
+        self.device_id = list(tasks.device_id)
+        self.task = list(tasks.task)
+        self.genes = np.full((len(population), capacity), -1, dtype=np.int32)
+        for i, chrom in enumerate(population):
+            self.genes[i, :n] = chrom
+        self.fitness = list(fitness)
+        self.positions: Dict[Tuple[str, str], List[int]] = {}
+        for i, key in enumerate(zip(self.device_id, self.task)):
+            self.positions.setdefault(key, []).append(i)
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self.complexity)
+        complexity = np.zeros(capacity, dtype=np.int64)
+        complexity[:self.n_tasks] = self.complexity[:self.n_tasks]
+        genes = np.full((len(self.genes), capacity), -1, dtype=np.int32)
+        genes[:, :self.n_tasks] = self.genes[:, :self.n_tasks]
+        self.complexity, self.genes = complexity, genes
+
+    def _best_load(self, best: int) -> np.ndarray:
+        live = self.genes[best, :self.n_tasks]
+        placed = live >= 0
+        return np.bincount(live[placed], weights=self.complexity[:self.n_tasks][placed],
+                           minlength=len(self.table.ids))
+
+    def apply(self, events: List[TaskEvent], rng: np.random.Generator) -> int:
+        """
+        Patch every chromosome for the events. Arrivals go to a random eligible
+        server, except in the current best chromosome, where they go to the
+        active server with the most spare CPU. Returns the number of unknown departures.
+        """
+        best = self.fitness.index(max(self.fitness))
+        load = self._best_load(best)
+        spare_base = np.where(self.table.active, self.table.cpu, -np.inf)
+        unknown = 0
+        for event in events:
+            if event.kind == ARRIVE:
+                if self.n_tasks == len(self.complexity):
+                    self._grow()
+                pos = self.n_tasks
+                column = random_eligible(np.full(len(self.genes), event.complexity), self.table, rng)
+                if self.table.active.any():
+                    column[best] = int(np.argmax(spare_base - load))
+                    load[column[best]] += event.complexity
+                self.genes[:, pos] = column
+                self.complexity[pos] = event.complexity
+                self.device_id.append(event.device_id)
+                self.task.append(event.task)
+                self.positions.setdefault((event.device_id, event.task), []).append(pos)
+                self.n_tasks += 1
+            else:
+                if not self._remove((event.device_id, event.task), load, best):
+                    unknown += 1
+        return unknown
+
+    def _remove(self, key: Tuple[str, str], load: np.ndarray, best: int) -> bool:
+        positions = self.positions.get(key)
+        if not positions:
+            return False
+        pos = positions.pop()
+        if not positions:
+            del self.positions[key]
+        srv = self.genes[best, pos]
+        if srv >= 0:
+            load[srv] -= self.complexity[pos]
+
+        last = self.n_tasks - 1
+        if pos != last:
+            self.genes[:, pos] = self.genes[:, last]
+            self.complexity[pos] = self.complexity[last]
+            self.device_id[pos] = self.device_id[last]
+            self.task[pos] = self.task[last]
+            moved = self.positions[(self.device_id[pos], self.task[pos])]
+            moved[moved.index(last)] = pos
+        self.genes[:, last] = -1
+        self.device_id.pop()
+        self.task.pop()
+        self.n_tasks = last
+        return True
+
+    def task_table(self) -> TaskTable:
+        complexity = self.complexity[:self.n_tasks].copy()
+        complexity.flags.writeable = False
+        return TaskTable(tuple(self.device_id), tuple(self.task), complexity, (None,) * self.n_tasks)
+
+    def population(self) -> List[np.ndarray]:
+        return [row[:self.n_tasks].copy() for row in self.genes]
+
+    def store(self, population: List[np.ndarray], fitness: List[float]) -> None:
+        self.genes[:, :self.n_tasks] = np.stack(population)
+        self.fitness = list(fitness)
+
+
+class OnlineRebalancer:
+    """
+    Keeps every cluster's population alive between events: an event batch
+    patches the affected clusters' chromosomes (ClusterState.apply) and runs
+    warm_generations GA generations from there, instead of rebuilding the
+    populations through extract_state / generate_initial_population.
+    Every event's latency (batch start -> rebalanced) is recorded.
+    """
+
+    def __init__(
+        self,
+        cloud_clusters: Dict[str, List[Dict]],
+        original_clusters: Dict[str, List[Dict]],
+        weights: Dict[str, float],
+        population_size: int = 20,
+        warm_generations: int = 3,
+        seed: Optional[int] = None,
+        selection: str = "roulette",
+        server_status: Optional[Dict[str, str]] = None
+    ):
+        random.seed(seed)
+        self.rng = np.random.default_rng(seed)
+        self.weights = weights
+        self.warm_generations = warm_generations
+        self.selection = selection
+        populations, task_tables = generate_initial_population_compact(
+            cloud_clusters, population_size, rng=self.rng, server_status=server_status
+        )
+        fitness = evaluate_population(populations, original_clusters, weights, task_tables=task_tables)
+        self.clusters = {
+            cname: ClusterState(original_clusters[cname], populations[cname], task_tables[cname], fitness[cname])
+            for cname in populations
+        }
+        self.latencies: List[float] = []
+        self.busy_seconds = 0.0
+        self.batches = 0
+        self.unknown_departures = 0
+
+    def handle(self, events: List[TaskEvent]) -> Dict[str, float]:
+        """
+        Apply one batch of events and rebalance the clusters it touched.
+        Returns the best fitness per touched cluster.
+        """
+        start = time.perf_counter()
+        by_cluster: Dict[str, List[TaskEvent]] = {}
+        for event in events:
+            by_cluster.setdefault(event.cluster, []).append(event)
+
+        best = {}
+        for cname, cluster_events in by_cluster.items():
+            state = self.clusters[cname]
+            self.unknown_departures += state.apply(cluster_events, self.rng)
+            best[cname] = self._rebalance(state)
+
+        seconds = time.perf_counter() - start
+        self.busy_seconds += seconds
+        self.batches += 1
+        self.latencies.extend([seconds] * len(events))
+        return best
+
+    def _rebalance(self, state: ClusterState) -> float:
+        tasks = state.task_table()
+        population = state.population()
+        fitness = evaluate_population_batch(population, state.table, self.weights, tasks=tasks).tolist()
+        loop = generation_loop(
+            population, fitness, state.servers, self.weights, len(population), tasks, self.rng,
+            selection=self.selection,
+        )
+        for population, fitness in islice(loop, self.warm_generations):
+            pass
+        state.store(population, fitness)
+        return max(fitness)
+
+    def best_assignment(self, cname: str) -> List[Dict]:
+        """The cluster's current best chromosome in the dashboard's gene format."""
+        state = self.clusters[cname]
+        best = state.fitness.index(max(state.fitness))
+        return decode_chromosome(state.genes[best, :state.n_tasks], state.task_table(), state.table)
+
+    def stats(self) -> Dict:
+        events = len(self.latencies)
+        return {
+            "events": events,
+            "batches": self.batches,
+            "unknown_departures": self.unknown_departures,
+            "busy_seconds": self.busy_seconds,
+            "events_per_sec": events / self.busy_seconds if self.busy_seconds else None,
+            "latency": latency_summary(self.latencies),
+        }
+
+
+def synthetic_events(
+    balancer: OnlineRebalancer,
+    n_events: int,
+    arrival_share: float = 0.5,
+    seed: Optional[int] = None
+) -> List[TaskEvent]:
+    """
+    A random stream of arrivals (new tasks, complexity 100-2000) and departures
+    of tasks that exist at that point of the stream.
+    """
+    rnd = random.Random(seed)
+    live = {cname: list(zip(s.device_id, s.task)) for cname, s in balancer.clusters.items()}
+    names = list(live)
+    events = []
+    for i in range(n_events):
+        cname = rnd.choice(names)
+        if rnd.random() < arrival_share or not live[cname]:
+            device_id, task = f"Online-{i}", f"task-{i % 7}"
+            live[cname].append((device_id, task))
+            events.append(TaskEvent(ARRIVE, cname, device_id, task, rnd.randint(100, 2000)))
+        else:
+            j = rnd.randrange(len(live[cname]))
+            live[cname][j], live[cname][-1] = live[cname][-1], live[cname][j]
+            device_id, task = live[cname].pop()
+            events.append(TaskEvent(DEPART, cname, device_id, task))
+    return events
+
+
+if __name__ == "__main__":
+    # Warm rebalancing vs. a cold rebuild, single events and batches
+    import copy
+    from pipeline_benchmark import WEIGHTS, make_cloud_clusters
+    from iot_device_simulator import generate_iot_devices
+    from task_placement import place_devices
+
+    random.seed(0)
+    devices = generate_iot_devices(n=10000)
+    cloud_clusters = make_cloud_clusters(10, 20, sum(len(d["task_queue"]) for d in devices))
+    original_clusters = copy.deepcopy(cloud_clusters)
+    place_devices(devices, cloud_clusters)
+
+    t0 = time.perf_counter()
+    balancer = OnlineRebalancer(cloud_clusters, original_clusters, WEIGHTS, population_size=20, seed=0)
+    print(f"cold start (extract_state + population + evaluation): {time.perf_counter() - t0:.3f} s")
+
+    for batch_size in (1, 10, 100):
+        balancer.latencies, balancer.busy_seconds, balancer.batches = [], 0.0, 0
+        events = synthetic_events(balancer, 1000, seed=batch_size)
+        for i in range(0, len(events), batch_size):
+            balancer.handle(events[i:i + batch_size])
+        print(f"batch={batch_size:3d} {balancer.stats()}")
@@ -0,0 +1,217 @@
+import argparse
+import copy
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from ga_module import (
+    evaluate_population, evolve_clusters_parallel,
+    generate_initial_population, generate_initial_population_compact,
+)
+from iot_device_simulator import generate_iot_devices
+from profiling import PROFILER
+from task_placement import place_devices
+
+WEIGHTS = {"cpu": 0.1, "ram": 0.3, "bandwidth": 0.2, "throughput": 0.4}
+MEAN_TASK_COMPLEXITY = 1500
+
+PRESETS = {
+    "smoke": {"devices": [100], "clusters": [2], "servers_per_cluster": [4],
+              "population": [10], "generations": [3]},
+    "full":  {"devices": [1000, 10000, 50000], "clusters": [10], "servers_per_cluster": [10, 100],
+              "population": [20, 100], "generations": [10]},
+}
+
+
+def make_cloud_clusters(n_clusters: int, servers_per_cluster: int, n_tasks: int) -> Dict[str, List[Dict]]:
+    """
+    Synthetic CLOUD_CLUSTERS in the dashboard's shape, with CPU sized so the
+    expected load fits with ~50% headroom.
+    """
+    n_servers = n_clusters * servers_per_cluster
+    cpu_per_server = max(4000, int(1.5 * n_tasks * MEAN_TASK_COMPLEXITY / n_servers))
+    clusters = {}
+    sid = 0
+    for c in range(n_clusters):
+        servers = []
+        for _ in range(servers_per_cluster):
+            sid += 1
+            servers.append({
+                "server_id": f"S{sid}",
+                "cpu": int(cpu_per_server * random.uniform(0.8, 1.2)),
+                "ram": random.choice([8, 12, 16]),
+                "bandwidth": random.randint(7, 10),
+                "throughput": random.randint(3, 5),
+                "tasks": [],
+                "status": "active",
+            })
+        clusters[f"Cluster {c + 1}"] = servers
+    return clusters
+
+
+def _phase(record: Dict, name: str, fn: Callable, evaluations: int = 0, memory: bool = True):
+    if memory:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - t0
+    peak = None
+    if memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    record[name] = {
+        "seconds": seconds,
+        "evaluations": evaluations,
+        "evals_per_sec": evaluations / seconds if evaluations and seconds > 0 else None,
+        "peak_bytes": peak,
+    }
+    return result
+
+
+def run_pipeline(
+    devices: int,
+    clusters: int,
+    servers_per_cluster: int,
+    population: int,
+    generations: int,
+    compact: bool = True,
+    workers: int = 1,
+    seed: int = 0,
+    memory: bool = True,
+    profile: bool = False
+) -> Dict:
+    """
+    One end-to-end pipeline run; returns its config and per-phase metrics
+    (plus the PROFILER breakdown with profile=True).
+    """
+    random.seed(seed)
+    phases: Dict[str, Dict] = {}
+    PROFILER.reset()
+    if profile:
+        PROFILER.enable()
+
+    device_list = _phase(phases, "generate_devices", lambda: generate_iot_devices(n=devices), memory=memory)
+    n_tasks = sum(len(d["task_queue"]) for d in device_list)
+
+    cloud_clusters = make_cloud_clusters(clusters, servers_per_cluster, n_tasks)
+    original_clusters = copy.deepcopy(cloud_clusters)
+    _phase(phases, "placement", lambda: place_devices(device_list, cloud_clusters), memory=memory)
+
+    if compact:
+        populations, task_tables = _phase(
+            phases, "initial_population",
+            lambda: generate_initial_population_compact(cloud_clusters, population_size=population),
+            memory=memory,
+        )
+    else:
+        task_tables = None
+        populations = _phase(
+            phases, "initial_population",
+            lambda: generate_initial_population(cloud_clusters, population_size=population),
+            memory=memory,
+        )
+
+    _phase(
+        phases, "evaluation",
+        lambda: evaluate_population(populations, original_clusters, WEIGHTS, task_tables=task_tables),
+        evaluations=clusters * population, memory=memory,
+    )
+    _phase(
+        phases, "evolution",
+        lambda: evolve_clusters_parallel(
+            populations, original_clusters, WEIGHTS, generations, population,
+            max_workers=workers, seed=seed, task_tables=task_tables,
+        ),
+        evaluations=clusters * population * (generations + 1), memory=memory,
+    )
+
+    PROFILER.disable()
+    return {
+        "config": {
+            "devices": devices, "tasks": n_tasks, "clusters": clusters,
+            "servers": clusters * servers_per_cluster, "population": population,
+            "generations": generations, "format": "compact" if compact else "dict",
+            "workers": workers, "seed": seed,
+        },
+        "phases": phases,
+        "total_seconds": sum(p["seconds"] for p in phases.values()),
+        "profile": PROFILER.snapshot() if profile else None,
+    }
+
+
+def sweep(grid: Dict[str, List[int]], **run_kwargs) -> List[Dict]:
+    keys = ("devices", "clusters", "servers_per_cluster", "population", "generations")
+    runs = []
+    for values in itertools.product(*(grid[k] for k in keys)):
+        run = run_pipeline(**dict(zip(keys, values)), **run_kwargs)
+        print(json.dumps({"config": run["config"], "total_seconds": round(run["total_seconds"], 3)}),
+              file=sys.stderr)
+        runs.append(run)
+    return runs
+
+
+def parse_args(argv: List[str]) -> Tuple[argparse.Namespace, Dict[str, List[int]]]:
+    parser = argparse.ArgumentParser(
+        description="Headless load-balancing pipeline benchmark: device generation, Step 2 placement, "
+                    "initial population, evaluation and evolution, for every combination of the swept sizes.",
+        epilog="example: python pipeline_benchmark.py --devices 1000 50000 --clusters 10 "
+               "--servers-per-cluster 10 100 --population 20 --generations 10 --output bench.json",
+    )
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="smoke")
+    parser.add_argument("--devices", type=int, nargs="+")
+    parser.add_argument("--clusters", type=int, nargs="+")
+    parser.add_argument("--servers-per-cluster", type=int, nargs="+")
+    parser.add_argument("--population", type=int, nargs="+")
+    parser.add_argument("--generations", type=int, nargs="+")
+    parser.add_argument("--format", choices=("compact", "dict"), default="compact")
+    parser.add_argument("--workers", type=int, default=1, help="process pool size for evolution")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (more accurate timings)")
+    parser.add_argument("--profile", action="store_true", help="add the per-function profiling breakdown to each run")
+    parser.add_argument("--prometheus", help="write the last run's profile here in Prometheus text format")
+    parser.add_argument("--output", help="write JSON results here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    grid = dict(PRESETS[args.preset])
+    for key in grid:
+        if getattr(args, key) is not None:
+            grid[key] = getattr(args, key)
+    return args, grid
+
+
+def main(argv: List[str]) -> None:
+    args, grid = parse_args(argv)
+    runs = sweep(
+        grid, compact=args.format == "compact", workers=args.workers,
+        seed=args.seed, memory=not args.no_memory, profile=args.profile or bool(args.prometheus),
+    )
+    if args.prometheus:
+        with open(args.prometheus, "w") as f:
+            f.write(PROFILER.to_prometheus())
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "grid": grid,
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,193 @@
+import contextlib
+import contextvars
+import functools
+import json
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+
+def latency_summary(values: Iterable[float]) -> Optional[Dict[str, float]]:
+    """
+    mean / p50 / p95 / p99 / max of a latency sample (nearest-rank
+    percentiles), or None for an empty sample. Accepts lists and NumPy arrays.
+    """
+    ordered = sorted(values.tolist() if hasattr(values, "tolist") else values)
+    if not ordered:
+        return None
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {"mean": sum(ordered) / len(ordered), "p50": pick(0.50), "p95": pick(0.95),
+            "p99": pick(0.99), "max": ordered[-1]}
+
+
+class Profiler:
+    """
+    Per-phase timers, event counters and sample series for the GA and
+    placement pipeline. Disabled by default: an instrumented call then costs
+    one attribute check. Export with snapshot() / to_json() / to_prometheus().
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self) -> None:
+        self.timers: Dict[str, List[float]] = {}     # name -> [calls, total seconds, max seconds]
+        self.counters: Dict[str, int] = {}
+        self.series: Dict[str, List[float]] = {}     # name -> samples in order (e.g. per-generation seconds)
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def record(self, name: str, seconds: float) -> None:
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, seconds, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def sample(self, name: str, value: float) -> None:
+        if self.enabled:
+            self.series.setdefault(name, []).append(value)
+
+    def phase(self, name: str) -> "_Phase":
+        """Context manager timing a block as phase `name`."""
+        return _Phase(self, name)
+
+    def merge(self, snapshot: Dict) -> None:
+        """Add a snapshot() taken elsewhere (e.g. in a worker process)."""
+        for name, t in snapshot["timers"].items():
+            timer = self.timers.setdefault(name, [0, 0.0, 0.0])
+            timer[0] += t["calls"]
+            timer[1] += t["seconds"]
+            timer[2] = max(timer[2], t["max_seconds"])
+        for name, n in snapshot["counters"].items():
+            self.counters[name] = self.counters.get(name, 0) + n
+        for name, values in snapshot["series"].items():
+            self.series.setdefault(name, []).extend(values)
+
+    def snapshot(self) -> Dict:
+        return {
+            "timers": {
+                name: {"calls": int(calls), "seconds": total, "max_seconds": peak,
+                       "mean_seconds": total / calls if calls else 0.0}
+                for name, (calls, total, peak) in self.timers.items()
+            },
+            "counters": dict(self.counters),
+            "series": {name: list(values) for name, values in self.series.items()},
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "loadbalancer") -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+
+        def family(name: str, kind: str, help_text: str, samples: List) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(f"{prefix}_{name}{labels} {value}" for labels, value in samples)
+
+        phases = sorted(self.timers.items())
+        family("phase_calls_total", "counter", "Calls per instrumented phase.",
+               [(f'{{phase="{n}"}}', int(t[0])) for n, t in phases])
+        family("phase_seconds_total", "counter", "Seconds spent per instrumented phase.",
+               [(f'{{phase="{n}"}}', repr(t[1])) for n, t in phases])
+        family("phase_seconds_max", "gauge", "Longest single call per phase.",
+               [(f'{{phase="{n}"}}', repr(t[2])) for n, t in phases])
+        family("events_total", "counter", "Pipeline event counters.",
+               [(f'{{event="{n}"}}', v) for n, v in sorted(self.counters.items())])
+        family("series_last", "gauge", "Latest sample of each series.",
+               [(f'{{series="{n}"}}', repr(v[-1])) for n, v in sorted(self.series.items()) if v])
+        return "\n".join(lines) + "\n"
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: Profiler, name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> "_Phase":
+        self.start = time.perf_counter() if self.profiler.enabled else None
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.start is not None:
+            self.profiler.record(self.name, time.perf_counter() - self.start)
+
+
+# profiler the instrumented functions report to: the process-wide one unless
+# set_profiler / use_profiler picked another for the current thread or task
+_active: contextvars.ContextVar = contextvars.ContextVar("profiler", default=Profiler())
+
+
+def current_profiler() -> Profiler:
+    return _active.get()
+
+
+def set_profiler(profiler: Profiler) -> contextvars.Token:
+    """
+    Make profiler the active one for the rest of the current context (thread
+    or asyncio task), e.g. a per-session profiler in a Streamlit script run.
+    Returns the token to undo it with reset_profiler().
+    """
+    return _active.set(profiler)
+
+
+def reset_profiler(token: contextvars.Token) -> None:
+    _active.reset(token)
+
+
+@contextlib.contextmanager
+def use_profiler(profiler: Profiler) -> Iterator[Profiler]:
+    """set_profiler for the duration of a with block."""
+    token = _active.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _active.reset(token)
+
+
+class _ActiveProfiler:
+    """Forwards every attribute to current_profiler(), so PROFILER follows set_profiler."""
+    __slots__ = ()
+
+    def __getattr__(self, name: str):
+        return getattr(_active.get(), name)
+
+
+PROFILER = _ActiveProfiler()
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """
+    Decorator timing every call of the function as phase `name`
+    (default: the function name) while the active profiler is enabled.
+    """
+    def decorate(fn: Callable) -> Callable:
+        phase = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profiler = _active.get()
+            if not profiler.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.record(phase, time.perf_counter() - start)
+        return wrapper
+    return decorate
@@ -0,0 +1,217 @@
+import heapq
+import random
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from iot_device_simulator import DEVICE_TYPES, TASK_POOL
+from profiling import PROFILER, profiled
+
+
+class PlacementEngine:
+    """
+    Step 2 greedy placement with one max-heap of active servers per cluster,
+    keyed by remaining CPU (ties -> earlier server in the list, as the stable
+    sort in the original loop did). Each task costs O(log servers).
+
+    Servers are the cluster's own dicts and are mutated exactly like the
+    original loop: the task is appended to server["tasks"] and its complexity
+    is subtracted from server["cpu"], so extract_state keeps working.
+    Failed servers are dropped lazily: heap entries are checked against the
+    server's current status/CPU when they reach the top. That also catches CPU
+    lowered outside the engine; after raising a server's CPU (or any other
+    outside change) call refresh(), or the server may be passed over.
+    Entries carry a per-server version; re-keying a server bumps it, so older
+    entries are discarded when they surface, and the heap is compacted once
+    stale entries outnumber the servers.
+    """
+
+    def __init__(self, cloud_clusters: Dict[str, List[Dict]]):
+        self.clusters = cloud_clusters
+        self._heaps: Dict[str, List[Tuple[int, int, int]]] = {}
+        self._versions: Dict[str, List[int]] = {}
+        for cname, servers in cloud_clusters.items():
+            heap = [(-srv["cpu"], i, 0) for i, srv in enumerate(servers) if self._active(srv)]
+            heapq.heapify(heap)
+            self._heaps[cname] = heap
+            self._versions[cname] = [0] * len(servers)
+
+    @staticmethod
+    def _active(server: Dict) -> bool:
+        return server.get('status', 'active') == 'active'
+
+    def _top(self, cname: str) -> Optional[int]:
+        """Index of the active server with most remaining CPU, fixing stale entries."""
+        heap = self._heaps[cname]
+        servers = self.clusters[cname]
+        versions = self._versions[cname]
+        while heap:
+            neg_cpu, i, version = heap[0]
+            server = servers[i]
+            if version != versions[i] or not self._active(server):
+                heapq.heappop(heap)                    # superseded entry / lazy deletion of failed servers
+            elif -neg_cpu != server["cpu"]:
+                versions[i] += 1
+                heapq.heapreplace(heap, (-server["cpu"], i, versions[i]))   # CPU lowered outside the engine
+            else:
+                return i
+        return None
+
+    def refresh(self, cname: str, i: int) -> None:
+        """
+        Re-key server number i of the cluster from its current status and CPU
+        (its only live heap entry afterwards). Use after changing it outside the engine.
+        """
+        heap = self._heaps[cname]
+        servers = self.clusters[cname]
+        versions = self._versions[cname]
+        versions[i] += 1
+        if self._active(servers[i]):
+            heapq.heappush(heap, (-servers[i]["cpu"], i, versions[i]))
+        if len(heap) > 2 * len(servers):
+            heap[:] = [e for e in heap if e[2] == versions[e[1]] and self._active(servers[e[1]])]
+            heapq.heapify(heap)
+
+    def place_task(self, cname: str, device_id: str, task_name: str, complexity: int) -> Optional[Dict]:
+        """
+        Put one task on the cluster's active server with the most remaining CPU,
+        if it fits. Returns that server, or None if no server can handle it.
+        """
+        i = self._top(cname)
+        if i is None:
+            return None
+        server = self.clusters[cname][i]
+        if complexity > server["cpu"]:
+            return None   # the largest server does not fit -> none does
+        server["tasks"].append({
+            "device_id": device_id,
+            "task": task_name,
+            "complexity": complexity
+        })
+        server["cpu"] -= complexity  # consume CPU
+        heapq.heapreplace(self._heaps[cname], (-server["cpu"], i, self._versions[cname][i]))
+        return server
+
+    def place_device(self, device: Dict, cname: str) -> List[Dict]:
+        """Place a device's task queue in one cluster; returns the tasks that did not fit."""
+        return [
+            task for task in device["task_queue"]
+            if self.place_task(cname, device["id"], task["task"], task["complexity"]) is None
+        ]
+
+    def place_columns(self, columns: Dict[str, np.ndarray], cluster_idx: List[int]) -> int:
+        """
+        Place a columnar device batch (iot_device_simulator.generate_device_columns);
+        device row r goes to cluster number cluster_idx[r]. Returns tasks left unplaced.
+        """
+        names = list(self.clusters)
+        unplaced = 0
+        index = columns["index"].tolist()
+        types = columns["type"].tolist()
+        tasks = columns["task"].tolist()
+        complexity = columns["complexity"].tolist()
+        for row, i in enumerate(index):
+            cname = names[cluster_idx[row]]
+            pool = TASK_POOL[DEVICE_TYPES[types[row]]]
+            device_id = f"Device-{i+1}"
+            for t, c in zip(tasks[row], complexity[row]):
+                if self.place_task(cname, device_id, pool[t], c) is None:
+                    unplaced += 1
+        return unplaced
+
+    def remove_task(self, cname: str, i: int, position: int = -1) -> Dict:
+        """
+        Take a task off server number i of the cluster (default: its latest one)
+        and give its CPU back. Returns the task dict.
+        """
+        server = self.clusters[cname][i]
+        task = server["tasks"].pop(position)
+        server["cpu"] += task["complexity"]
+        self.refresh(cname, i)
+        return task
+
+    def mark_failed(self, cname: str, server_id: str) -> None:
+        """Fail a server; its heap entry is discarded lazily."""
+        for server in self.clusters[cname]:
+            if server["server_id"] == server_id:
+                server["status"] = "failed"
+
+    def mark_active(self, cname: str, server_id: str) -> None:
+        """(Re)activate a server and make it eligible again."""
+        for i, server in enumerate(self.clusters[cname]):
+            if server["server_id"] == server_id and not self._active(server):
+                server["status"] = "active"
+                self.refresh(cname, i)
+
+
+def place_device_tasks(device: Dict, servers: List[Dict]) -> List[Dict]:
+    """
+    Step 2 greedy placement for one device: each task in the device's queue goes
+    to the active server with the most remaining CPU that can handle it.
+    Mutates the servers (appends to server["tasks"], consumes server["cpu"]).
+    Returns the tasks that did not fit anywhere.
+    """
+    return PlacementEngine({"cluster": servers}).place_device(device, "cluster")
+
+
+@profiled("placement")
+def place_devices(devices: List[Dict], cloud_clusters: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+    """
+    Send every device to a random cluster and place its tasks there (Step 2).
+    Mutates and returns cloud_clusters.
+    """
+    engine = PlacementEngine(cloud_clusters)
+    cluster_names = list(cloud_clusters.keys())
+    for device in devices:
+        # 1) Pick a random cluster for this device
+        cluster_name = random.choice(cluster_names)
+        # 2) Assign its tasks inside that cluster
+        engine.place_device(device, cluster_name)
+    PROFILER.count("devices_placed", len(devices))
+    return cloud_clusters
+
+
+@profiled("placement")
+def place_device_columns(
+    columns: Dict[str, np.ndarray],
+    cloud_clusters: Dict[str, List[Dict]],
+    rng: Optional[np.random.Generator] = None,
+    engine: Optional[PlacementEngine] = None
+) -> Dict[str, List[Dict]]:
+    """
+    place_devices for a columnar batch from iot_device_simulator.iter_iot_devices,
+    without building per-device dicts. Mutates and returns cloud_clusters.
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    if engine is None:
+        engine = PlacementEngine(cloud_clusters)
+    cluster_idx = rng.integers(0, len(cloud_clusters), size=len(columns["index"])).tolist()
+    engine.place_columns(columns, cluster_idx)
+    PROFILER.count("devices_placed", len(cluster_idx))
+    return cloud_clusters
+
+
+def place_device_stream(
+    batches: Iterable[Union[List[Dict], Dict[str, np.ndarray]]],
+    cloud_clusters: Dict[str, List[Dict]],
+    rng: Optional[np.random.Generator] = None
+) -> Dict[str, List[Dict]]:
+    """
+    Place a whole stream of device batches (dict lists or columnar, e.g. from
+    iter_iot_devices) with one PlacementEngine. Mutates and returns cloud_clusters.
+    """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    engine = PlacementEngine(cloud_clusters)
+    names = list(cloud_clusters)
+    for batch in batches:
+        if isinstance(batch, dict):
+            place_device_columns(batch, cloud_clusters, rng, engine)
+        else:
+            cluster_idx = rng.integers(0, len(names), size=len(batch)).tolist()
+            with PROFILER.phase("placement"):
+                for device, c in zip(batch, cluster_idx):
+                    engine.place_device(device, names[c])
+            PROFILER.count("devices_placed", len(batch))
+    return cloud_clusters
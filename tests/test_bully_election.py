@@ -0,0 +1,142 @@
+import asyncio
+import random
+
+import pytest
+
+from bully_election import (
+    ALGORITHMS, COORDINATOR, ELECTION, GRANT, OK, BullyNetwork, VirtualTimeLoop, elect_cluster_leader,
+    elect_cluster_leader_async, run_election,
+)
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("seed", range(10))
+def test_highest_alive_node_wins_under_random_failures(algorithm, seed):
+    rnd = random.Random(seed)
+    ids = rnd.sample(range(1, 200), 30)
+    failed = rnd.sample(ids, rnd.randint(0, 25))
+    alive = sorted(set(ids) - set(failed))
+    initiator = rnd.choice(alive)
+    r = run_election(ids, failed=failed, initiator=initiator, algorithm=algorithm, seed=seed)
+    assert r.leader == max(alive)
+    assert r.initiator == initiator
+    assert r.total_messages == sum(r.messages.values())
+    assert 0 <= r.latency < float("inf")
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_coordinator_failed_lowest_node_initiates(algorithm):
+    n = 20
+    r = run_election(list(range(1, n + 1)), failed=[n], algorithm=algorithm, seed=0)
+    assert r.leader == n - 1
+    assert r.messages[COORDINATOR] == n - 2   # the new leader announces to every lower node
+    if algorithm == "classic":
+        assert r.messages[GRANT] == 0
+    else:
+        # only the initiator sends ELECTION; every alive higher node answers once
+        assert r.messages[ELECTION] == n - 1
+        assert r.messages[OK] == n - 2
+        assert r.messages[GRANT] == 1
+
+
+def test_modified_bully_sends_fewer_messages():
+    ids = list(range(1, 51))
+    classic = run_election(ids, failed=[50], algorithm="classic", seed=0)
+    modified = run_election(ids, failed=[50], algorithm="modified", seed=0)
+    assert classic.leader == modified.leader == 49
+    assert modified.total_messages < classic.total_messages
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_single_alive_node_elects_itself(algorithm):
+    r = run_election([1, 2, 3], failed=[1, 3], algorithm=algorithm)
+    assert r.leader == 2
+    assert r.messages[OK] == 0
+    assert r.messages[COORDINATOR] == 1     # to the failed node 1, which drops it
+
+
+def test_no_alive_node_raises():
+    with pytest.raises(ValueError):
+        run_election([1, 2], failed=[1, 2])
+
+
+def test_unknown_algorithm_raises():
+    with pytest.raises(ValueError):
+        run_election([1, 2], algorithm="ring")
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_same_seed_same_result(algorithm):
+    ids = list(range(1, 41))
+    a = run_election(ids, failed=[40, 17, 3], algorithm=algorithm, seed=5, jitter=0.002)
+    b = run_election(ids, failed=[40, 17, 3], algorithm=algorithm, seed=5, jitter=0.002)
+    assert a == b
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_candidate_failing_mid_election_is_passed_over(algorithm):
+    # node 9 (10 is down) answers OK, then dies before announcing: the election must settle on 8
+    ids = list(range(1, 11))
+    static = run_election(ids, failed=[10], algorithm=algorithm, seed=0)
+    loop = VirtualTimeLoop()
+    try:
+        network = BullyNetwork(ids, loop, algorithm=algorithm, seed=0)
+        network.fail(10)
+        loop.call_at(2 * (network.delay + network.jitter) + network.tick, network.fail, 9)
+        r = loop.run_until_complete(network.elect(1))
+    finally:
+        loop.close()
+    assert static.leader == 9
+    assert r.leader == 8
+    assert r.messages[COORDINATOR] == 7             # only 8 announces: a crashed node sends nothing
+    if algorithm == "modified":
+        assert r.messages[GRANT] == 2               # GRANT to 9 times out, then goes to 8
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_recovered_node_takes_over_in_next_election(algorithm):
+    loop = VirtualTimeLoop()
+    try:
+        network = BullyNetwork(list(range(1, 9)), loop, algorithm=algorithm, seed=0)
+        network.fail(8)
+        assert loop.run_until_complete(network.elect(1)).leader == 7
+        network.recover(8)
+        assert loop.run_until_complete(network.elect(2)).leader == 8
+    finally:
+        loop.close()
+
+
+def _servers(statuses):
+    return [{"server_id": f"srv-{i}", "status": s, "cpu": 100 * (i + 1)} for i, s in enumerate(statuses)]
+
+
+def test_cluster_leader_skips_failed_servers():
+    servers = _servers(["active", "active", "failed", "active", "failed"])
+    assert elect_cluster_leader(servers, seed=0)["leader"] == "srv-3"
+    # priority by CPU, lowest wins -> the first active server
+    assert elect_cluster_leader(servers, priority=lambda s: -s["cpu"], seed=0)["leader"] == "srv-0"
+
+
+def test_cluster_leader_all_failed():
+    assert elect_cluster_leader(_servers(["failed", "failed"])) == {"leader": None, "result": None}
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_async_cluster_leader_matches_sync(algorithm):
+    servers = _servers(["active", "failed", "active", "active", "failed", "active", "failed"])
+    sync = elect_cluster_leader(servers, algorithm=algorithm, seed=1)
+    loop = VirtualTimeLoop()
+    try:
+        result = loop.run_until_complete(elect_cluster_leader_async(servers, algorithm=algorithm, seed=1))
+    finally:
+        loop.close()
+    assert result["leader"] == sync["leader"] == "srv-5"
+    assert result["result"].messages == sync["result"].messages
+
+
+def test_real_time_loop_agrees_with_virtual_time():
+    ids = list(range(1, 6))
+    virtual = run_election(ids, failed=[5], seed=0)
+    real = run_election(ids, failed=[5], seed=0, virtual_time=False)
+    assert real.leader == virtual.leader == 4
+    assert real.messages == virtual.messages
@@ -0,0 +1,100 @@
+import os
+import random
+
+import numpy as np
+import pytest
+
+from ga_benchmarks import WEIGHTS, make_cluster
+from ga_module import (
+    build_server_table, build_task_table, evaluate_population_batch, generate_chromosome, load_checkpoint,
+    restore_rng_state, resume_checkpoint, save_checkpoint,
+)
+
+
+def state(n_clusters=3, population_size=6):
+    populations, task_tables, servers_by_cluster, fitness = {}, {}, {}, {}
+    rng = np.random.default_rng(0)
+    for k in range(n_clusters):
+        tasks, servers = make_cluster(120, 8, seed=k)
+        servers[k]["status"] = "failed"
+        cname = f"Cluster {k + 1}"
+        task_tables[cname] = build_task_table(tasks)
+        servers_by_cluster[cname] = servers
+        table = build_server_table(servers)
+        populations[cname] = [generate_chromosome(task_tables[cname], table, rng=rng) for _ in range(population_size)]
+        fitness[cname] = evaluate_population_batch(populations[cname], table, WEIGHTS, tasks=task_tables[cname]).tolist()
+    return populations, task_tables, servers_by_cluster, fitness
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(tmp_path, mmap):
+    populations, task_tables, servers, fitness = state()
+    save_checkpoint(str(tmp_path), populations, task_tables, servers, fitness, generation=7,
+                    rng=np.random.default_rng(5))
+    loaded = load_checkpoint(str(tmp_path), mmap=mmap)
+    assert loaded["generation"] == 7
+    for cname in populations:
+        assert all(np.array_equal(a, b) for a, b in zip(loaded["populations"][cname], populations[cname]))
+        assert list(loaded["fitness"][cname]) == fitness[cname]
+        tasks = loaded["task_tables"][cname]
+        assert np.array_equal(tasks.complexity, task_tables[cname].complexity)
+        assert (tasks.device_id, tasks.task, tasks.orig_server) == \
+               (task_tables[cname].device_id, task_tables[cname].task, task_tables[cname].orig_server)
+        assert [srv["status"] for srv in loaded["servers"][cname]] == [srv["status"] for srv in servers[cname]]
+        assert [srv["cpu"] for srv in loaded["servers"][cname]] == [srv["cpu"] for srv in servers[cname]]
+        if mmap:
+            assert not loaded["populations"][cname][0].flags.writeable
+    only = load_checkpoint(str(tmp_path), clusters=["Cluster 2"])
+    assert list(only["populations"]) == ["Cluster 2"]
+
+
+def test_rng_state_round_trip(tmp_path):
+    populations, task_tables, servers, fitness = state(1)
+    random.seed(3)
+    rng = np.random.default_rng(3)
+    save_checkpoint(str(tmp_path), populations, task_tables, servers, fitness, rng=rng)
+    expected = (random.random(), rng.random())
+    restored = restore_rng_state(load_checkpoint(str(tmp_path))["rng_state"])
+    assert (random.random(), restored.random()) == expected
+
+
+@pytest.mark.parametrize("with_rng", [True, False])
+def test_resume_is_deterministic(tmp_path, with_rng):
+    populations, task_tables, servers, fitness = state()
+    path = str(tmp_path / "ckpt")
+    random.seed(1)
+    save_checkpoint(path, populations, task_tables, servers, fitness, generation=2,
+                    rng=np.random.default_rng(1) if with_rng else None)
+    first = resume_checkpoint(path, WEIGHTS, 3, max_workers=1)
+    random.seed(99)   # resuming must not depend on the caller's random state
+    second = resume_checkpoint(path, WEIGHTS, 3, max_workers=2)
+    assert first[1] == second[1]
+    assert first[2] == second[2] == 5
+    for cname in populations:
+        assert all(np.array_equal(a, b) for a, b in zip(first[0][cname], second[0][cname]))
+
+
+def test_resume_chain_and_in_place_save(tmp_path):
+    populations, task_tables, servers, fitness = state()
+    path = str(tmp_path / "ckpt")
+    save_checkpoint(path, populations, task_tables, servers, fitness, rng=np.random.default_rng(0))
+    resume_checkpoint(path, WEIGHTS, 0, max_workers=1, save_to=path)   # rewrite the files it maps
+    loaded = load_checkpoint(path)
+    for cname in populations:
+        assert all(np.array_equal(a, b) for a, b in zip(loaded["populations"][cname], populations[cname]))
+
+    _, fitness_after, generation = resume_checkpoint(path, WEIGHTS, 4, max_workers=1, save_to=path)
+    assert generation == 4
+    reloaded = load_checkpoint(path)
+    assert reloaded["generation"] == 4
+    assert {c: list(f) for c, f in reloaded["fitness"].items()} == fitness_after
+    for cname in fitness_after:
+        assert max(fitness_after[cname]) >= max(fitness[cname])   # elitism
+
+
+def test_checkpoint_without_meta_is_incomplete(tmp_path):
+    populations, task_tables, servers, fitness = state(1)
+    save_checkpoint(str(tmp_path), populations, task_tables, servers, fitness)
+    os.remove(tmp_path / "meta.json")
+    with pytest.raises(FileNotFoundError):
+        load_checkpoint(str(tmp_path))
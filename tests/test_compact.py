@@ -0,0 +1,98 @@
+import random
+
+import numpy as np
+import pytest
+
+from ga_benchmarks import WEIGHTS, make_cluster
+from ga_module import (
+    build_server_table, build_task_table, check_server_health, decode_chromosome, decode_population,
+    encode_chromosome, encode_population, evaluate_population_batch, evolve_population, generate_chromosome,
+    generate_initial_population_compact, mutate_chromosome,
+)
+from iot_device_simulator import generate_iot_devices
+from pipeline_benchmark import make_cloud_clusters
+from task_placement import place_devices
+
+
+def cluster(seed=0, failure_prob=0.3):
+    random.seed(seed)
+    tasks, servers = make_cluster(300, 12, seed)
+    check_server_health(servers, failure_prob)
+    return tasks, servers, build_task_table(tasks), build_server_table(servers)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_round_trip(seed):
+    tasks, servers, task_table, table = cluster(seed)
+    rng = np.random.default_rng(seed)
+    population = [generate_chromosome(task_table, table, use_orig=True, rng=rng)]
+    population += [generate_chromosome(task_table, table, rng=rng) for _ in range(9)]
+    decoded = decode_population(population, task_table, table)
+    for chromosome, genes in zip(population, decoded):
+        assert chromosome.dtype == np.int16
+        assert np.array_equal(encode_chromosome(genes, task_table, table), chromosome)
+        assert [(g["device_id"], g["task"], g["complexity"]) for g in genes] == \
+               [(t["device_id"], t["task"], t["complexity"]) for t in tasks]
+    dict_population = [generate_chromosome(tasks, servers) for _ in range(5)]
+    assert decode_population(encode_population(dict_population, task_table, table), task_table, table) == dict_population
+
+
+def test_unassigned_genes_are_dropped_and_empty_encodes_to_minus_one():
+    _, _, task_table, table = cluster()
+    chromosome = generate_chromosome(task_table, table, rng=np.random.default_rng(0))
+    chromosome[:3] = -1
+    assert len(decode_chromosome(chromosome, task_table, table)) == len(chromosome) - 3
+    assert (encode_chromosome([], task_table, table) == -1).all()
+    with pytest.raises(ValueError):
+        encode_chromosome(decode_chromosome(chromosome, task_table, table), task_table, table)
+
+
+def test_generated_genes_follow_the_dict_rules():
+    tasks, servers, task_table, table = cluster()
+    chromosome = generate_chromosome(task_table, table, rng=np.random.default_rng(0))
+    assert table.active[chromosome].all()
+    fits = table.cpu[chromosome] >= task_table.complexity
+    fits_somewhere = task_table.complexity <= table.cpu[table.active].max()
+    assert (fits | ~fits_somewhere).all()
+    baseline = generate_chromosome(task_table, table, use_orig=True, rng=np.random.default_rng(0))
+    orig = np.asarray([table.index[s] for s in task_table.orig_server])
+    kept = table.active[orig]
+    assert np.array_equal(baseline[kept], orig[kept])
+
+
+def test_compact_evaluation_matches_dict_evaluation():
+    _, servers, task_table, table = cluster()
+    rng = np.random.default_rng(1)
+    population = [generate_chromosome(task_table, table, rng=rng) for _ in range(10)]
+    for generation in range(5):
+        fitness = evaluate_population_batch(population, servers, WEIGHTS, tasks=task_table).tolist()
+        decoded = decode_population(population, task_table, table)
+        assert fitness == evaluate_population_batch(decoded, servers, WEIGHTS).tolist()
+        population = evolve_population(population, fitness, servers, 10, tasks=task_table, rng=rng)
+        assert all(c.dtype == np.int16 and table.active[c].all() for c in population)
+
+
+def test_mutation_moves_only_to_eligible_servers():
+    _, servers, task_table, table = cluster()
+    rng = np.random.default_rng(2)
+    chromosome = generate_chromosome(task_table, table, rng=rng)
+    mutated = mutate_chromosome(chromosome, table, 0.5, tasks=task_table, rng=rng)
+    assert mutated is not chromosome and not np.array_equal(mutated, chromosome)
+    assert table.active[mutated].all()
+
+
+def test_initial_population_compact():
+    random.seed(0)
+    cloud_clusters = make_cloud_clusters(3, 4, 80)
+    place_devices(generate_iot_devices(40), cloud_clusters)
+    status = {srv["server_id"]: "active" for servers in cloud_clusters.values() for srv in servers}
+    status["S1"] = "failed"
+    populations, task_tables = generate_initial_population_compact(
+        cloud_clusters, 6, rng=np.random.default_rng(0), server_status=status
+    )
+    for cname, population in populations.items():
+        n_tasks = sum(len(srv["tasks"]) for srv in cloud_clusters[cname])
+        assert len(population) == 6
+        assert all(c.shape == (n_tasks,) for c in population)
+        assert len(task_tables[cname].complexity) == n_tasks
+    assert all((c != 0).all() for c in populations["Cluster 1"])   # S1 is index 0 of Cluster 1
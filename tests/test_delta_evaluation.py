@@ -0,0 +1,65 @@
+import random
+
+import numpy as np
+import pytest
+
+from ga_benchmarks import WEIGHTS, make_cluster
+from ga_module import (
+    DeltaEvaluator, build_server_table, build_task_table, check_server_health, evaluate_population_batch,
+    evolve_population, generate_chromosome,
+)
+
+
+def setup(seed=0, failure_prob=0.2):
+    random.seed(seed)
+    tasks, servers = make_cluster(400, 15, seed)
+    check_server_health(servers, failure_prob)
+    task_table = build_task_table(tasks)
+    return DeltaEvaluator(servers, WEIGHTS, task_table), servers, task_table
+
+
+def batch(evaluator, genes):
+    return evaluate_population_batch(genes, evaluator.servers, WEIGHTS, tasks=evaluator.tasks)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_children_match_full_evaluation(seed):
+    evaluator, _, task_table = setup(seed)
+    rng = np.random.default_rng(seed)
+    scored = [evaluator.score(generate_chromosome(task_table, evaluator.servers, rng=rng)) for _ in range(6)]
+    assert [s.fitness for s in scored] == batch(evaluator, [s.genes for s in scored]).tolist()
+    children = []
+    for _ in range(200):
+        a, b = rng.choice(len(scored), 2, replace=False)
+        children.append(evaluator.mutate(evaluator.crossover(scored[a], scored[b]), 0.3, rng=rng))
+    assert np.allclose([c.fitness for c in children], batch(evaluator, [c.genes for c in children]),
+                       rtol=1e-9, atol=1e-6)
+    for child in children:
+        full = evaluator.score(child.genes)
+        assert np.allclose(child.used_cpu, full.used_cpu)
+        assert child.failed == full.failed
+
+
+def test_unassigned_genes_and_failed_servers():
+    evaluator, _, task_table = setup(failure_prob=0.5)
+    genes = generate_chromosome(task_table, evaluator.servers, rng=np.random.default_rng(0))
+    genes[::7] = -1
+    failed = np.flatnonzero(evaluator.servers.failed)
+    genes[1::11] = failed[0]
+    parent = evaluator.score(genes)
+    assert parent.fitness == batch(evaluator, [genes])[0]
+    moved = evaluator._rescore(parent, np.arange(0, 70, 7), np.zeros(10, dtype=np.intp))
+    assert np.isclose(moved.fitness, batch(evaluator, [moved.genes])[0])
+
+
+def test_evolve_population_with_evaluator_stays_exact():
+    evaluator, servers, task_table = setup(1)
+    evaluator.verify = True
+    rng = np.random.default_rng(1)
+    population = [evaluator.score(generate_chromosome(task_table, evaluator.servers, rng=rng)) for _ in range(10)]
+    for _ in range(10):
+        population = evolve_population(
+            population, [c.fitness for c in population], servers, 10, tasks=task_table, rng=rng,
+            evaluator=evaluator,
+        )
+    assert evaluator.checked > 0
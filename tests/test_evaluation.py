@@ -0,0 +1,79 @@
+import random
+
+import numpy as np
+import pytest
+
+from ga_benchmarks import WEIGHTS
+from ga_module import FitnessCache, evaluate_chromosome, evaluate_population, evaluate_population_batch
+
+
+def baseline_evaluate_chromosome(chromosome, servers, weights, failure_penalty=-1000):
+    """The original per-chromosome loop (minus its defensive deepcopy)."""
+    failed_assignments = 0
+    tasks_by_srv = {srv["server_id"]: [] for srv in servers}
+    for gene in chromosome:
+        tasks_by_srv[gene["server_id"]].append(gene)
+        server = next((s for s in servers if s["server_id"] == gene["server_id"]), None)
+        if server and server.get('status', 'active') == 'failed':
+            failed_assignments += 1
+
+    best_fs = -float("inf")
+    for srv in servers:
+        if srv.get('status', 'active') == 'failed':
+            continue
+        used_cpu = sum(g["complexity"] for g in tasks_by_srv[srv["server_id"]])
+        CA = max(0, srv["cpu"] - used_cpu)
+        fs = (weights["cpu"] * CA + weights["ram"] * srv["ram"] +
+              weights["bandwidth"] * srv["bandwidth"] + weights["throughput"] * srv["throughput"])
+        best_fs = max(best_fs, fs)
+    if failed_assignments > 0:
+        best_fs += failed_assignments * failure_penalty
+    return best_fs
+
+
+def random_case(rnd):
+    """Servers (int or float CPU, some failed) and a population of dict chromosomes, possibly empty."""
+    n_srv = rnd.randint(1, 12)
+    servers = [
+        {"server_id": f"S{i}", "cpu": rnd.choice([rnd.randint(0, 5000), round(rnd.uniform(0, 5000), 3)]),
+         "ram": rnd.randint(1, 32), "bandwidth": round(rnd.uniform(1, 10), 2), "throughput": rnd.randint(0, 9),
+         "status": rnd.choice(["active", "active", "failed"])}
+        for i in range(n_srv)
+    ]
+    population = [
+        [{"device_id": "Device-1", "task": "toggle",
+          "complexity": rnd.choice([rnd.randint(100, 3000), round(rnd.uniform(1, 3000), 2)]),
+          "server_id": f"S{rnd.randrange(n_srv)}"}
+         for _ in range(rnd.randint(0, 30))]
+        for _ in range(rnd.randint(0, 8))
+    ]
+    return servers, population
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_batch_matches_baseline(seed):
+    servers, population = random_case(random.Random(seed))
+    expected = [baseline_evaluate_chromosome(c, servers, WEIGHTS) for c in population]
+    assert evaluate_population_batch(population, servers, WEIGHTS).tolist() == expected
+    assert [evaluate_chromosome(c, servers, WEIGHTS) for c in population] == expected
+
+
+def test_all_servers_failed_scores_minus_inf():
+    servers = [{"server_id": "S1", "cpu": 100, "ram": 8, "bandwidth": 5, "throughput": 3, "status": "failed"}]
+    chromosome = [{"device_id": "Device-1", "task": "toggle", "complexity": 50, "server_id": "S1"}]
+    assert evaluate_population_batch([chromosome], servers, WEIGHTS)[0] == -np.inf
+    assert baseline_evaluate_chromosome(chromosome, servers, WEIGHTS) == -np.inf
+
+
+def test_evaluate_population_and_cache_agree():
+    rnd = random.Random(7)
+    cases = [random_case(rnd) for _ in range(5)]
+    populations = {f"C{i}": population for i, (_, population) in enumerate(cases)}
+    clusters = {f"C{i}": servers for i, (servers, _) in enumerate(cases)}
+    cache = FitnessCache(100)
+    first = evaluate_population(populations, clusters, WEIGHTS, cache=cache)
+    again = evaluate_population(populations, clusters, WEIGHTS, cache=cache)
+    assert first == again
+    for cname, population in populations.items():
+        assert first[cname] == [baseline_evaluate_chromosome(c, clusters[cname], WEIGHTS) for c in population]
+    assert cache.stats()["hits"] > 0
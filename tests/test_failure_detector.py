@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from failure_detector import (
+    ACTIVE, FAILED, RECOVERED, SUSPECTED, FailureDetector, ServerStatusSync, TimerWheel, detect_cluster_failures,
+    simulate_heartbeats,
+)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_timer_wheel_matches_a_sorted_reference(seed):
+    # small wheel (4 slots x 3 levels = 64 ticks of range) to exercise cascading and parking
+    rnd = random.Random(seed)
+    wheel = TimerWheel(slots=4, levels=3)
+    pending = {}
+    now = 0
+    for _ in range(400):
+        op = rnd.random()
+        key = rnd.randrange(30)
+        if op < 0.5:
+            expires = now + rnd.choice([0, 1, 2, rnd.randint(3, 20), rnd.randint(20, 200)])
+            wheel.schedule(key, expires)
+            pending[key] = max(expires, now + 1)
+        elif op < 0.6:
+            wheel.cancel(key)
+            pending.pop(key, None)
+        else:
+            now += rnd.choice([1, 1, 2, rnd.randint(3, 70)])
+            fired = wheel.advance(now)
+            due = {k for k, t in pending.items() if t <= now}
+            assert sorted(fired) == sorted(due)
+            for k in due:
+                del pending[k]
+        assert len(wheel) == len(pending)
+
+
+def test_timer_wheel_fires_in_tick_order():
+    wheel = TimerWheel(slots=8, levels=2)
+    for key, tick in (("a", 5), ("b", 3), ("c", 40), ("d", 9)):
+        wheel.schedule(key, tick)
+    assert [wheel.advance(t) for t in (2, 3, 8, 9, 39, 40)] == [[], ["b"], ["a"], ["d"], [], ["c"]]
+
+
+def test_detector_transitions():
+    detector = FailureDetector(suspect_after=3.0, fail_after=6.0, tick=0.5)
+    events = []
+    detector.subscribe(events.append)
+    detector.register("S1", 0.0)
+    detector.register("S2", 0.0)
+    for now in (1.0, 2.0, 3.0, 4.0):
+        detector.heartbeat("S2", now)
+        detector.advance(now)
+    assert detector.snapshot() == {"S1": SUSPECTED, "S2": ACTIVE}
+    detector.advance(6.0)
+    assert detector.status["S1"] == FAILED
+    detector.heartbeat("S1", 7.0)
+    assert [(e.node_id, e.old, e.new, e.at) for e in events] == [
+        ("S1", ACTIVE, SUSPECTED, 3.0), ("S1", SUSPECTED, FAILED, 6.0), ("S1", FAILED, RECOVERED, 7.0),
+    ]
+    assert detector.status["S1"] == ACTIVE
+
+
+def test_suspicion_is_cleared_by_a_heartbeat():
+    detector = FailureDetector(suspect_after=1.0, fail_after=5.0, tick=0.25)
+    detector.register("S1", 0.0)
+    detector.advance(1.5)
+    assert detector.status["S1"] == SUSPECTED
+    detector.heartbeat("S1", 2.0)
+    detector.advance(2.75)
+    assert detector.status["S1"] == ACTIVE
+    detector.advance(3.0)                    # suspect_after counts from the new heartbeat
+    assert [e.new for e in detector.events] == [SUSPECTED, ACTIVE, SUSPECTED]
+
+
+def test_simulated_crashes_are_detected_within_bounds():
+    crashes = {3: (5.0, None), 7: (10.0, 20.0)}
+    report = simulate_heartbeats(list(range(20)), 40.0, crashes=crashes, seed=1)
+    assert report["detected"] == 2
+    assert report["false_suspicions"] == 0
+    assert report["status"][3] == FAILED
+    assert report["status"][7] == ACTIVE
+    assert all(s == ACTIVE for n, s in report["status"].items() if n not in crashes)
+    # a crash is declared failed between fail_after - interval and fail_after + one tick after it
+    assert 5.0 - 0.05 <= report["detection_latency"]["max"] <= 6.0 + 0.05
+
+
+def test_detect_cluster_failures_syncs_cluster_dicts():
+    clusters = {"Cluster 1": [{"server_id": f"S{i}", "status": "active"} for i in range(10)]}
+    status, _ = detect_cluster_failures(clusters, crash_prob=0.5, seed=4,
+                                        subscribers=(ServerStatusSync(clusters),))
+    assert {srv["server_id"]: srv["status"] for srv in clusters["Cluster 1"]} == status
+    assert "failed" in status.values() and "active" in status.values()
@@ -0,0 +1,57 @@
+import random
+
+import numpy as np
+
+from global_balancer import GlobalBalancer, cluster_utilisation
+from iot_device_simulator import generate_iot_devices
+from pipeline_benchmark import make_cloud_clusters
+
+
+def clusters_with_tiny_one(seed=0):
+    random.seed(seed)
+    clusters = make_cloud_clusters(4, 5, 400)
+    for srv in clusters["Cluster 1"]:
+        srv["cpu"] = 50
+    return clusters
+
+
+def test_full_cluster_falls_through_to_the_next():
+    clusters = clusters_with_tiny_one()
+    balancer = GlobalBalancer(clusters)
+    balancer.route_devices(generate_iot_devices(200))
+    assert balancer.unplaced == 0
+    assert balancer.routed_tasks == 400
+    assert not any(srv["tasks"] for srv in clusters["Cluster 1"])
+    assert balancer.full[0]
+    placed = sum(len(srv["tasks"]) for servers in clusters.values() for srv in servers)
+    assert placed == 400
+
+
+def test_unplaceable_task_is_counted_once():
+    clusters = clusters_with_tiny_one()
+    balancer = GlobalBalancer(clusters)
+    assert balancer.route_device("Device-1", [("toggle", 10 ** 9), ("dim", 300)]) is not None
+    assert balancer.unplaced == 1
+    assert balancer.route_device("Device-2", [("toggle", 10 ** 9)]) is None
+    assert balancer.unplaced == 2
+
+
+def test_bookkeeping_matches_cluster_dicts_after_migration():
+    random.seed(1)
+    clusters = make_cloud_clusters(6, 5, 600)
+    for srv in clusters["Cluster 1"] + clusters["Cluster 2"]:
+        srv["cpu"] //= 4
+    balancer = GlobalBalancer(clusters)
+    for i, device in enumerate(generate_iot_devices(300)):
+        # uneven start: every device on the two small clusters
+        balancer.engine.place_device(device, "Cluster 1" if i % 2 else "Cluster 2")
+    tasks = lambda: sorted((t["device_id"], t["task"]) for s in clusters.values() for srv in s for t in srv["tasks"])
+    placed = tasks()
+
+    balancer = GlobalBalancer(clusters)
+    before = balancer.imbalance()["cv"]
+    result = balancer.migrate()
+    assert result["moves"] > 0
+    assert balancer.imbalance()["cv"] < before
+    assert np.allclose(balancer.utilisation(), cluster_utilisation(clusters))
+    assert tasks() == placed
@@ -0,0 +1,87 @@
+import asyncio
+import random
+
+import numpy as np
+import pytest
+
+from ingest_server import (
+    HEADER, RECORD_DTYPES, TASK, IngestServer, device_gateway, encode_frame, run_ingest,
+)
+from pipeline_benchmark import make_cloud_clusters
+
+
+def clusters(n_devices=200):
+    random.seed(0)
+    return make_cloud_clusters(4, 5, 2 * n_devices)
+
+
+def test_every_task_is_placed_and_acknowledged():
+    cloud_clusters = clusters()
+    stats = asyncio.run(run_ingest(cloud_clusters, 200, connections=4, batch_size=16, window=2, seed=0))
+    placed = sum(len(srv["tasks"]) for servers in cloud_clusters.values() for srv in servers)
+    assert stats["devices"] == 200
+    assert stats["tasks_placed"] + stats["tasks_unplaced"] == 400
+    assert stats["tasks_placed"] == placed
+    assert stats["messages"] == stats["sent"] == 600
+    assert stats["consumer_errors"] == 0
+
+
+def test_bad_frame_drops_the_connection():
+    async def scenario():
+        server = IngestServer(clusters())
+        host, port = await server.start()
+        reader, writer = await asyncio.open_connection(host, port)
+        records = np.zeros(1, dtype=RECORD_DTYPES[TASK])
+        records["type"] = 200                       # no such device type
+        writer.write(encode_frame(TASK, records))
+        await writer.drain()
+        assert await reader.read() == b""           # closed without an ACK
+        writer.close()
+        await server.close()
+        return server
+
+    server = asyncio.run(scenario())
+    assert server.rejected_connections == 1
+    assert server.frames == 0
+
+
+def test_consumer_survives_a_failing_frame():
+    async def scenario():
+        server = IngestServer(clusters(), seed=0)
+        place, calls = server._place, []
+
+        def flaky(records):
+            calls.append(len(records))
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            place(records)
+
+        server._place = flaky
+        address = await server.start()
+        await device_gateway(address, 0, 50, batch_size=10, seed=0)
+        await server.close()
+        return server, calls
+
+    server, calls = asyncio.run(scenario())
+    assert server.consumer_errors == 1
+    assert len(calls) == 10
+    assert server.placed + server.unplaced == 90
+    assert server._consumer.done()
+
+
+def test_gateway_raises_when_the_server_hangs_up():
+    async def scenario():
+        async def hang_up(reader, writer):
+            await reader.readexactly(HEADER.size)
+            writer.close()
+
+        server = await asyncio.start_server(hang_up, "127.0.0.1", 0)
+        address = server.sockets[0].getsockname()[:2]
+        try:
+            await asyncio.wait_for(device_gateway(address, 0, 50, batch_size=10, window=2, seed=0), 5)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(scenario())
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from profiling import PROFILER, Profiler, current_profiler, latency_summary, profiled, use_profiler
+
+
+@profiled("work")
+def work(n):
+    PROFILER.count("items", n)
+    return n
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with use_profiler(profiler):
+        assert work(3) == 3
+    assert profiler.snapshot() == {"timers": {}, "counters": {}, "series": {}}
+
+
+def test_use_profiler_scopes_recording():
+    default = current_profiler()
+    session = Profiler(enabled=True)
+    with use_profiler(session):
+        assert current_profiler() is session
+        work(2)
+        with session.phase("block"):
+            PROFILER.sample("latency", 0.5)
+    assert current_profiler() is default
+    snapshot = session.snapshot()
+    assert snapshot["timers"]["work"]["calls"] == 1
+    assert snapshot["timers"]["block"]["calls"] == 1
+    assert snapshot["counters"] == {"items": 2}
+    assert snapshot["series"] == {"latency": [0.5]}
+
+
+def test_threads_keep_their_own_profiler():
+    profilers = [Profiler(enabled=True) for _ in range(4)]
+    barrier = threading.Barrier(len(profilers))
+
+    def session(profiler, n):
+        with use_profiler(profiler):
+            barrier.wait()
+            for _ in range(n):
+                work(1)
+
+    threads = [threading.Thread(target=session, args=(p, i + 1)) for i, p in enumerate(profilers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert [p.counters["items"] for p in profilers] == [1, 2, 3, 4]
+    assert "items" not in current_profiler().counters
+
+
+def test_asyncio_tasks_inherit_the_active_profiler():
+    profiler = Profiler(enabled=True)
+
+    async def tick(n):
+        await asyncio.sleep(0)
+        work(n)
+
+    async def main():
+        with use_profiler(profiler):
+            tasks = [asyncio.get_running_loop().create_task(tick(n)) for n in (1, 2, 5)]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert profiler.counters["items"] == 8
+
+
+def test_merge_and_exports():
+    a, b = Profiler(enabled=True), Profiler(enabled=True)
+    a.record("generation", 1.0)
+    b.record("generation", 3.0)
+    b.count("devices_placed", 7)
+    a.merge(b.snapshot())
+    timer = a.snapshot()["timers"]["generation"]
+    assert (timer["calls"], timer["seconds"], timer["max_seconds"]) == (2, 4.0, 3.0)
+    text = a.to_prometheus()
+    assert 'loadbalancer_phase_calls_total{phase="generation"} 2' in text
+    assert 'loadbalancer_events_total{event="devices_placed"} 7' in text
+
+
+def test_latency_summary():
+    assert latency_summary([]) is None
+    summary = latency_summary(np.arange(1, 101, dtype=float))
+    assert summary == {"mean": 50.5, "p50": 51.0, "p95": 96.0, "p99": 100.0, "max": 100.0}
@@ -0,0 +1,142 @@
+import copy
+import random
+
+import numpy as np
+import pytest
+
+from ga_benchmarks import WEIGHTS, make_cluster
+from ga_module import (
+    SEEDING_HEURISTICS, _capacity_table, apply_server_status, best_fit, build_server_table, build_task_table,
+    evolve_adaptive, evolve_clusters_parallel, extract_state, generate_chromosome,
+    generate_initial_population_compact, overloaded_servers, repair_chromosome, repair_table,
+)
+from global_balancer import GlobalBalancer
+from iot_device_simulator import generate_iot_devices
+from pipeline_benchmark import make_cloud_clusters
+from task_placement import place_devices
+
+
+def cluster(n_tasks=1000, n_servers=50, seed=0):
+    """make_cluster at roughly 60% load, so every chromosome can be repaired."""
+    tasks, servers = make_cluster(n_tasks, n_servers, seed)
+    return build_task_table(tasks), build_server_table(servers)
+
+
+def test_misplaced_gene_without_overload():
+    tasks, table = cluster()
+    chromosome = best_fit(tasks, table)
+    assert overloaded_servers([chromosome], table, tasks)[0] == 0
+
+    unassigned = chromosome.copy()
+    unassigned[3] = -1
+    repaired = repair_chromosome(unassigned, table, tasks)
+    assert repaired[3] >= 0 and table.active[repaired[3]]
+    assert np.array_equal(np.delete(repaired, 3), np.delete(chromosome, 3))
+
+    failed = table._replace(active=table.active.copy())
+    failed.active[chromosome[5]] = False
+    repaired = repair_chromosome(chromosome, failed, tasks)
+    assert failed.active[repaired].all()
+
+
+def test_all_servers_inactive():
+    tasks, table = cluster()
+    chromosome = best_fit(tasks, table)
+    inactive = table._replace(active=np.zeros_like(table.active))
+    assert np.array_equal(repair_chromosome(chromosome, inactive, tasks), chromosome)
+
+
+def test_feasible_chromosome_is_returned_unchanged():
+    tasks, table = cluster()
+    chromosome = best_fit(tasks, table)
+    assert repair_chromosome(chromosome, table, tasks) is chromosome
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_no_overloads_after_repair(seed):
+    tasks, table = cluster(seed=seed)
+    rng = np.random.default_rng(seed)
+    chromosomes = [rng.integers(0, 5, len(tasks.task)) for _ in range(5)]
+    chromosomes += [generate_chromosome(tasks, table, rng=rng) for _ in range(5)]
+    assert overloaded_servers(chromosomes, table, tasks).any()
+    repaired = [repair_chromosome(c, table, tasks) for c in chromosomes]
+    assert not overloaded_servers(repaired, table, tasks).any()
+
+
+@pytest.mark.parametrize("name", sorted(SEEDING_HEURISTICS))
+def test_seeds_fit(name):
+    tasks, table = cluster()
+    seed = SEEDING_HEURISTICS[name](tasks, table)
+    assert (seed >= 0).all()
+    assert overloaded_servers([seed], table, tasks)[0] == 0
+
+
+def placed_clusters(seed=0):
+    """Step 2 on three tight clusters (about 10% headroom), plus their ORIGINAL_CLUSTERS copy and statuses."""
+    random.seed(seed)
+    cloud_clusters = make_cloud_clusters(3, 6, 360)
+    for servers in cloud_clusters.values():
+        for srv in servers:
+            srv["cpu"] = int(srv["cpu"] * 0.75)
+    original = copy.deepcopy(cloud_clusters)
+    place_devices(generate_iot_devices(180), cloud_clusters)
+    server_status = {srv["server_id"]: "active" for servers in cloud_clusters.values() for srv in servers}
+    server_status["S2"] = "failed"
+    return cloud_clusters, original, server_status
+
+
+def test_repair_table_matches_seeding_capacity():
+    cloud_clusters, original, server_status = placed_clusters()
+    tasks_map, servers_map = extract_state(cloud_clusters)
+    for cname in cloud_clusters:
+        tasks = build_task_table(tasks_map[cname])
+        seeding = _capacity_table(build_server_table(apply_server_status(servers_map[cname], server_status)), tasks)
+        ga = repair_table(original[cname], server_status)
+        assert np.array_equal(ga.active, seeding.active)
+        assert np.array_equal(ga.cpu[ga.active], seeding.cpu[seeding.active])
+    assert all(srv.get("status") == "active" for servers in original.values() for srv in servers)
+
+
+def test_parallel_driver_repairs_every_generation():
+    cloud_clusters, original, server_status = placed_clusters()
+    populations, task_tables = generate_initial_population_compact(
+        cloud_clusters, 10, rng=np.random.default_rng(0), server_status=server_status,
+        seeding=tuple(SEEDING_HEURISTICS), repair=True,
+    )
+    runs = {}
+    for repair in (False, True):
+        runs[repair] = evolve_clusters_parallel(
+            populations, original, WEIGHTS, 5, 10, max_workers=1, seed=0, task_tables=task_tables,
+            keep_history=True, repair=repair, server_status=server_status,
+        )[2]
+    overloads = lambda repair: sum(
+        overloaded_servers(pop, repair_table(original[c], server_status), task_tables[c]).sum()
+        for c, history in runs[repair].items() for pop, _ in history
+    )
+    assert overloads(False) > 0
+    assert overloads(True) == 0
+
+
+def test_adaptive_driver_repairs():
+    cloud_clusters, original, server_status = placed_clusters()
+    populations, task_tables = generate_initial_population_compact(
+        cloud_clusters, 10, rng=np.random.default_rng(0), server_status=server_status, repair=True,
+    )
+    cname = "Cluster 1"
+    result = evolve_adaptive(
+        populations[cname], original[cname], WEIGHTS, max_generations=5, tasks=task_tables[cname], seed=0,
+        repair=True, server_status=server_status,
+    )
+    capacity = repair_table(original[cname], server_status)
+    assert not overloaded_servers(result["population"], capacity, task_tables[cname]).any()
+
+
+def test_balancer_optimise_with_seeding_and_repair():
+    cloud_clusters, original, _ = placed_clusters()
+    balancer = GlobalBalancer(cloud_clusters)
+    populations, fitness = balancer.optimise(
+        original, WEIGHTS, population_size=6, generations=3, seed=0, seeding=("best_fit",), repair=True,
+    )
+    _, task_tables = generate_initial_population_compact(cloud_clusters, 1, rng=np.random.default_rng(0))
+    for cname, population in populations.items():
+        assert not overloaded_servers(population, repair_table(original[cname]), task_tables[cname]).any()
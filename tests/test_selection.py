@@ -0,0 +1,66 @@
+import random
+from collections import Counter
+
+import pytest
+
+from ga_module import SELECTION_OPERATORS, Selector
+
+
+def draws(selector, k=4000, seed=0):
+    random.seed(seed)
+    return Counter(selector.sample() for _ in range(k))
+
+
+def test_roulette_is_fitness_proportional():
+    counts = draws(Selector([1.0, 3.0], "roulette"))
+    assert 0.70 < counts[1] / 4000 < 0.80
+
+
+def test_roulette_shifts_negative_scores():
+    counts = draws(Selector([-10.0, -10.0, 0.0, 10.0], "roulette"))
+    assert counts[0] == counts[1] == 0
+    assert 0.25 < counts[2] / 4000 < 0.42
+
+
+@pytest.mark.parametrize("bad", [float("-inf"), float("nan")])
+def test_roulette_never_draws_non_finite_scores(bad):
+    counts = draws(Selector([bad, 5.0, bad, 15.0], "roulette"))
+    assert counts[0] == counts[2] == 0
+    assert set(counts) == {1, 3}
+
+
+def test_roulette_all_non_finite_is_uniform():
+    counts = draws(Selector([float("-inf")] * 4, "roulette"))
+    assert set(counts) == {0, 1, 2, 3}
+
+
+def test_roulette_positive_inf_wins():
+    counts = draws(Selector([1.0, float("inf"), 2.0, float("inf")], "roulette"))
+    assert set(counts) == {1, 3}
+
+
+@pytest.mark.parametrize("method", ["roulette", "rank"])
+def test_sample_stays_in_range_when_draw_rounds_up(method, monkeypatch):
+    selector = Selector([1.0, 2.0, 0.0], method)
+    monkeypatch.setattr(random, "random", lambda: 1.0)
+    assert selector.sample() == 2
+
+
+def test_rank_and_tournament_ignore_scale():
+    for method in ("rank", "tournament"):
+        small = draws(Selector([1.0, 2.0, 3.0], method))
+        large = draws(Selector([-1e9, 0.0, 1e9], method))
+        assert small == large
+
+
+@pytest.mark.parametrize("method", SELECTION_OPERATORS)
+def test_parents_differ_when_possible(method):
+    population = [[i] for i in range(20)]
+    selector = Selector([float(i) for i in range(20)], method)
+    random.seed(0)
+    assert all(a != b for a, b in (selector.parents(population) for _ in range(100)))
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        Selector([1.0], "wheel")
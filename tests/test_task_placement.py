@@ -0,0 +1,85 @@
+import copy
+import random
+
+import pytest
+
+from iot_device_simulator import generate_iot_devices
+from task_placement import PlacementEngine
+
+
+def make_servers(n: int, rng: random.Random):
+    return [
+        {"server_id": f"S{i}", "cpu": rng.choice([4000, 6000, 8000]), "tasks": [], "status": "active"}
+        for i in range(n)
+    ]
+
+
+def baseline_place(task, device_id, servers):
+    """The original Step 2 loop: sort active servers by remaining CPU, take the first that fits."""
+    servers_sorted = sorted([s for s in servers if s.get('status', 'active') == 'active'],
+                            key=lambda s: s["cpu"], reverse=True)
+    for server in servers_sorted:
+        if task["complexity"] <= server["cpu"]:
+            server["tasks"].append({"device_id": device_id, "task": task["task"], "complexity": task["complexity"]})
+            server["cpu"] -= task["complexity"]
+            return server
+    return None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_baseline_sort_loop(seed):
+    rng = random.Random(seed)
+    random.seed(seed)
+    devices = generate_iot_devices(300)
+    expected = make_servers(8, rng)
+    servers = copy.deepcopy(expected)
+    engine = PlacementEngine({"c": servers})
+
+    for step, device in enumerate(devices):
+        for task in device["task_queue"]:
+            want = baseline_place(task, device["id"], expected)
+            got = engine.place_task("c", device["id"], task["task"], task["complexity"])
+            assert (got and got["server_id"]) == (want and want["server_id"])
+
+        # outside changes every few devices, applied identically to both sides
+        i = rng.randrange(len(servers))
+        event = step % 5
+        if event == 0:                               # CPU raised outside the engine
+            delta = rng.randint(100, 3000)
+            expected[i]["cpu"] += delta
+            servers[i]["cpu"] += delta
+            engine.refresh("c", i)
+        elif event == 1:                             # CPU lowered outside the engine (caught lazily)
+            delta = min(servers[i]["cpu"], rng.randint(100, 3000))
+            expected[i]["cpu"] -= delta
+            servers[i]["cpu"] -= delta
+        elif event == 2:
+            expected[i]["status"] = "failed"
+            engine.mark_failed("c", servers[i]["server_id"])
+        elif event == 3:
+            expected[i]["status"] = "active"
+            engine.mark_active("c", servers[i]["server_id"])
+        elif servers[i]["tasks"]:
+            task = engine.remove_task("c", i)
+            assert task == expected[i]["tasks"].pop()
+            expected[i]["cpu"] += task["complexity"]
+
+    assert servers == expected
+
+
+def test_heap_stays_bounded():
+    servers = make_servers(5, random.Random(0))
+    engine = PlacementEngine({"c": servers})
+    for _ in range(1000):
+        server = engine.place_task("c", "Device-1", "toggle", 500)
+        engine.remove_task("c", servers.index(server))
+    assert len(engine._heaps["c"]) <= 2 * len(servers)
+
+
+def test_unplaceable_task_returns_none():
+    servers = make_servers(3, random.Random(0))
+    engine = PlacementEngine({"c": servers})
+    assert engine.place_task("c", "Device-1", "toggle", 10 ** 6) is None
+    for srv in servers:
+        engine.mark_failed("c", srv["server_id"])
+    assert engine.place_task("c", "Device-1", "toggle", 1) is None